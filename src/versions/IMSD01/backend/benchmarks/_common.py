@@ -0,0 +1,136 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.api.errors import ConcurrencyError, InsufficientStockError, ValidationError
+from src.api.routes import inventory
+from src.api.schemas.response import ResponseEnvelope
+from src.db.base import Base
+from src.db.session import get_session
+from src.models.product import Product
+
+
+@contextmanager
+def bench_engine(
+    database_url: Optional[str] = None, sqlite_timeout: float = 30
+) -> Iterator[Engine]:
+    """Yield an engine with a fresh schema; a temp SQLite file is used when no URL is given."""
+    path = None
+    if database_url is None:
+        fd, path = tempfile.mkstemp(prefix="inventory_bench_", suffix=".db")
+        os.close(fd)
+        engine = create_engine(
+            f"sqlite+pysqlite:///{path}",
+            connect_args={"check_same_thread": False, "timeout": sqlite_timeout},
+            poolclass=NullPool,
+            future=True,
+        )
+    else:
+        engine = create_engine(database_url, future=True)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+
+def seed_products(engine: Engine, count: int, available_qty: int, threshold: int = 0) -> List[str]:
+    ids = [str(uuid4()) for _ in range(count)]
+    rows = [
+        {
+            "id": product_id,
+            "sku": f"SKU-BENCH-{index}",
+            "available_qty": available_qty,
+            "low_stock_threshold": threshold,
+        }
+        for index, product_id in enumerate(ids)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Product), rows)
+    return ids
+
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg_async",
+}
+
+
+def async_url_for(engine: Engine) -> str:
+    """Return the async-driver URL that points at the same database as ``engine``."""
+    url = engine.url.set(drivername=ASYNC_DRIVERS[engine.dialect.name])
+    return url.render_as_string(hide_password=False)
+
+
+@contextmanager
+def postgres_standin() -> Iterator[Optional[str]]:
+    """Yield a URL for a local Postgres without docker, or None when there is none.
+
+    ``BENCH_POSTGRES_URL`` wins if set; otherwise a throwaway cluster is started with the
+    optional ``testing.postgresql`` package, which needs ``initdb`` on the PATH.
+    """
+    url = os.getenv("BENCH_POSTGRES_URL")
+    if url:
+        yield url
+        return
+    try:
+        import testing.postgresql
+    except ImportError:
+        yield None
+        return
+    try:
+        server = testing.postgresql.Postgresql()
+    except RuntimeError:
+        yield None
+        return
+    try:
+        yield server.url().replace("postgresql://", "postgresql+psycopg://", 1)
+    finally:
+        server.stop()
+
+
+ERROR_STATUS = {InsufficientStockError: 400, ValidationError: 400, ConcurrencyError: 409}
+
+
+def _error_handler(status_code: int):
+    async def _handle(_request, exc: Exception) -> JSONResponse:
+        return JSONResponse(
+            status_code=status_code,
+            content=ResponseEnvelope(status="error", data=None, error=str(exc)).model_dump(),
+        )
+
+    return _handle
+
+
+def inventory_app(engine: Engine) -> FastAPI:
+    """The sync inventory routes on their own app, with sessions bound to ``engine``."""
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    def _session():
+        with SessionLocal() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(inventory.router, prefix="/inventory")
+    app.dependency_overrides[get_session] = _session
+    # Same status codes as src.api.app, without importing it (and its logging setup).
+    for error, status_code in ERROR_STATUS.items():
+        app.add_exception_handler(error, _error_handler(status_code))
+    return app
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
@@ -0,0 +1,107 @@
+"""Requests/sec for the sync (threadpool) and async inventory routes under concurrent clients.
+
+Usage: python -m benchmarks.async_load [--clients 500] [--requests-per-client 4]
+                                       [--products 50] [--database-url URL]
+"""
+import argparse
+import asyncio
+import random
+import time
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks._common import async_url_for, bench_engine, inventory_app, seed_products
+from src.api.routes import inventory_async
+from src.db.async_session import get_async_session
+
+
+def _async_app(async_engine) -> FastAPI:
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def _session():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(inventory_async.router, prefix="/inventory")
+    app.dependency_overrides[get_async_session] = _session
+    return app
+
+
+async def _drive(app: FastAPI, product_ids, clients: int, per_client: int) -> dict:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    ok = 0
+    failed = 0
+
+    async def _client(client: httpx.AsyncClient) -> None:
+        nonlocal ok, failed
+        for _ in range(per_client):
+            index = random.randrange(len(product_ids))
+            resp = await client.post(
+                "/inventory/purchase",
+                json={
+                    "order_id": str(uuid4()),
+                    "product_id": product_ids[index],
+                    "sku": f"SKU-BENCH-{index}",
+                    "quantity": 1,
+                },
+            )
+            if resp.status_code == 200:
+                ok += 1
+            else:
+                failed += 1
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(_client(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+    return {"ok": ok, "failed": failed, "requests_per_sec": (ok + failed) / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests-per-client", type=int, default=4)
+    parser.add_argument("--products", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    total = args.clients * args.requests_per_client
+    for mode in ("sync", "async"):
+        with bench_engine(args.database_url) as engine:
+            product_ids = seed_products(engine, args.products, available_qty=total)
+            if mode == "sync":
+                result = asyncio.run(
+                    _drive(
+                        inventory_app(engine),
+                        product_ids,
+                        args.clients,
+                        args.requests_per_client,
+                    )
+                )
+            else:
+                async_engine = create_async_engine(async_url_for(engine))
+                try:
+                    result = asyncio.run(
+                        _drive(
+                            _async_app(async_engine),
+                            product_ids,
+                            args.clients,
+                            args.requests_per_client,
+                        )
+                    )
+                finally:
+                    asyncio.run(async_engine.dispose())
+        print(
+            f"{mode:>5}: {result['requests_per_sec']:.0f} req/s "
+            f"({result['ok']} ok, {result['failed']} failed, {args.clients} clients)"
+        )
+
+
+if __name__ == "__main__":
+    main()
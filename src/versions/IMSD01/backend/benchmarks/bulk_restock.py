@@ -0,0 +1,63 @@
+"""Throughput of the bulk restock path against one-at-a-time restores.
+
+Seeds N products, applies a feed with one row per product through ``bulk_restock`` and
+restores a sample of the same products one by one through ``inventory_service.restore``.
+
+Usage: python -m benchmarks.bulk_restock [--products N] [--sample N] [--database-url URL]
+"""
+import argparse
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks._common import bench_engine, seed_products
+from src.services import bulk_restock, inventory_service
+
+
+def _run(database_url, products: int, sample: int) -> dict:
+    with bench_engine(database_url) as engine:
+        product_ids = seed_products(engine, products, available_qty=0)
+        SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+        feed = ((f"SKU-BENCH-{index}", 5) for index in range(products))
+
+        start = time.perf_counter()
+        with SessionLocal() as session:
+            bulk_restock.restock(session, feed)
+        bulk_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for index, product_id in enumerate(product_ids[:sample]):
+            with SessionLocal() as session:
+                inventory_service.restore(
+                    session, product_id, f"SKU-BENCH-{index}", 5, "cancelled"
+                )
+        single_elapsed = time.perf_counter() - start
+
+    return {
+        "bulk_rows_per_sec": products / bulk_elapsed,
+        "bulk_seconds": bulk_elapsed,
+        "single_rows_per_sec": sample / single_elapsed,
+        "single_projected_seconds": products * single_elapsed / sample,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200000)
+    parser.add_argument("--sample", type=int, default=2000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    result = _run(args.database_url, args.products, min(args.sample, args.products))
+    print(
+        f"bulk:   {result['bulk_rows_per_sec']:.0f} rows/s "
+        f"({args.products} rows in {result['bulk_seconds']:.1f}s)"
+    )
+    print(
+        f"single: {result['single_rows_per_sec']:.0f} rows/s "
+        f"(projected {result['single_projected_seconds']:.0f}s for {args.products} rows)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cost of the order_id dedup check on the purchase hot path.
+
+Compares purchases without an order_id, first-time orders (key lookup plus key insert),
+and replays answered from the in-process LRU or from the idempotency_keys table.
+
+Usage: python -m benchmarks.idempotency_overhead [--purchases N] [--database-url URL]
+"""
+import argparse
+import time
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks._common import bench_engine, seed_products
+from src.services import inventory_service
+from src.services.idempotency import idempotency_keys
+
+
+def _run(database_url, purchases: int) -> list:
+    with bench_engine(database_url) as engine:
+        (product_id,) = seed_products(engine, 1, available_qty=purchases * 2)
+        SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+        statements = 0
+
+        def _count(*_args):
+            nonlocal statements
+            statements += 1
+
+        event.listen(engine, "before_cursor_execute", _count)
+        order_ids = [str(uuid4()) for _ in range(purchases)]
+
+        def _measure(mode, order_id_for, before_each=None):
+            nonlocal statements
+            statements = 0
+            start = time.perf_counter()
+            for index in range(purchases):
+                if before_each is not None:
+                    before_each()
+                with SessionLocal() as session:
+                    inventory_service.purchase(
+                        session, product_id, "SKU-BENCH-0", 1, order_id_for(index)
+                    )
+            elapsed = time.perf_counter() - start
+            return {
+                "mode": mode,
+                "round_trips_per_purchase": statements / purchases,
+                "purchases_per_sec": purchases / elapsed,
+            }
+
+        idempotency_keys.clear()
+        return [
+            _measure("no order_id", lambda _index: None),
+            _measure("new order", lambda index: order_ids[index]),
+            _measure("replay (lru)", lambda index: order_ids[index]),
+            _measure(
+                "replay (table)", lambda index: order_ids[index], before_each=idempotency_keys.clear
+            ),
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--purchases", type=int, default=2000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    for result in _run(args.database_url, args.purchases):
+        print(
+            f"{result['mode']:>14}: {result['round_trips_per_purchase']:.2f} round-trips/purchase, "
+            f"{result['purchases_per_sec']:.0f} purchases/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
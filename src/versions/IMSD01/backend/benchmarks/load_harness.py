@@ -0,0 +1,270 @@
+"""Reproducible purchase/cancel load test through the ASGI app.
+
+Seeds N products, then C concurrent clients drive ``/inventory/purchase`` and
+``/inventory/cancel`` (cancelling earlier successful purchases) with uniform or Zipf
+SKU popularity until R requests are done. Reports p50/p95/p99 latency per operation,
+throughput, and oversell: units sold beyond a product's stock, plus products whose
+final stock differs from seed - purchased + cancelled. Results are written as JSON with
+the config and git commit, and ``--compare`` diffs two result files.
+
+Runs against a temp SQLite file by default; ``--backend postgres`` uses
+``--database-url``, ``BENCH_POSTGRES_URL`` or a throwaway local cluster via the optional
+``testing.postgresql`` package.
+
+Usage: python -m benchmarks.load_harness [--products 100] [--stock 50] [--clients 32]
+                                         [--requests 5000] [--cancel-ratio 0.2]
+                                         [--skew uniform|zipf] [--zipf-s 1.1] [--seed 0]
+                                         [--backend sqlite|postgres] [--database-url URL]
+                                         [--output PATH]
+       python -m benchmarks.load_harness --compare OLD.json NEW.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks._common import (
+    bench_engine,
+    inventory_app,
+    percentile,
+    postgres_standin,
+    seed_products,
+)
+from src.services.stock_cache import load_stock
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class SkuPicker:
+    """Product indexes with uniform or Zipf(s) popularity; index 0 is the hottest."""
+
+    def __init__(self, products: int, skew: str, zipf_s: float, rng: random.Random):
+        self._rng = rng
+        self._indexes = range(products)
+        self._cum_weights = None
+        if skew == "zipf":
+            self._cum_weights = list(
+                itertools.accumulate(1 / (rank**zipf_s) for rank in range(1, products + 1))
+            )
+
+    def pick(self) -> int:
+        if self._cum_weights is None:
+            return self._rng.randrange(len(self._indexes))
+        return self._rng.choices(self._indexes, cum_weights=self._cum_weights)[0]
+
+
+def _summary(latencies: List[float], statuses: Counter) -> dict:
+    summary = {
+        "count": sum(statuses.values()),
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+    }
+    if latencies:
+        summary.update(
+            p50_ms=percentile(latencies, 0.50) * 1000,
+            p95_ms=percentile(latencies, 0.95) * 1000,
+            p99_ms=percentile(latencies, 0.99) * 1000,
+        )
+    return summary
+
+
+async def _drive(app, product_ids: List[str], args) -> dict:
+    rng = random.Random(args.seed)
+    picker = SkuPicker(len(product_ids), args.skew, args.zipf_s, rng)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    remaining = iter(range(args.requests))
+    purchased: List[tuple] = []
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    sold: Counter = Counter()
+    cancelled: Counter = Counter()
+
+    async def _client(client: httpx.AsyncClient) -> None:
+        for _ in remaining:
+            if purchased and rng.random() < args.cancel_ratio:
+                order_id, index = purchased.pop(rng.randrange(len(purchased)))
+                operation = "cancel"
+                payload = {"order_id": order_id, "reason": "cancelled"}
+            else:
+                order_id, index = str(uuid4()), picker.pick()
+                operation = "purchase"
+                payload = {"order_id": order_id}
+            payload.update(product_id=product_ids[index], sku=f"SKU-BENCH-{index}", quantity=1)
+
+            start = time.perf_counter()
+            resp = await client.post(f"/inventory/{operation}", json=payload)
+            latencies[operation].append(time.perf_counter() - start)
+            statuses[operation][resp.status_code] += 1
+            if resp.status_code != 200:
+                continue
+            if operation == "purchase":
+                sold[index] += 1
+                purchased.append((order_id, index))
+            else:
+                cancelled[index] += 1
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(_client(client) for _ in range(args.clients)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "elapsed_s": elapsed,
+        "throughput_rps": args.requests / elapsed,
+        "operations": {
+            operation: _summary(latencies[operation], statuses[operation])
+            for operation in ("purchase", "cancel")
+        },
+        "sold": sold,
+        "cancelled": cancelled,
+    }
+
+
+def _oversell(engine, product_ids: List[str], stock: int, sold: Counter, cancelled: Counter):
+    SessionLocal = sessionmaker(bind=engine, future=True)
+    with SessionLocal() as session:
+        actual = load_stock(session, product_ids)
+    oversold = 0
+    drifted = 0
+    for index, product_id in enumerate(product_ids):
+        net_sold = sold[index] - cancelled[index]
+        oversold += max(0, net_sold - stock)
+        if actual[product_id].available_qty != stock - net_sold:
+            drifted += 1
+    return oversold, drifted
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run(args, database_url: Optional[str]) -> dict:
+    with bench_engine(database_url, sqlite_timeout=args.sqlite_timeout) as engine:
+        product_ids = seed_products(engine, args.products, available_qty=args.stock)
+        run = asyncio.run(_drive(inventory_app(engine), product_ids, args))
+        oversold, drifted = _oversell(
+            engine, product_ids, args.stock, run.pop("sold"), run.pop("cancelled")
+        )
+        dialect = engine.dialect.name
+
+    config = {
+        key: getattr(args, key)
+        for key in (
+            "products",
+            "stock",
+            "clients",
+            "requests",
+            "cancel_ratio",
+            "skew",
+            "zipf_s",
+            "seed",
+        )
+    }
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "backend": dialect,
+        "config": config,
+        **run,
+        "oversold_units": oversold,
+        "drifted_products": drifted,
+    }
+
+
+def _print(result: dict) -> None:
+    print(
+        f"{result['backend']} @ {result['commit']}: {result['throughput_rps']:.0f} req/s, "
+        f"oversold {result['oversold_units']}, drifted {result['drifted_products']}"
+    )
+    for operation, summary in result["operations"].items():
+        if "p50_ms" not in summary:
+            continue
+        print(
+            f"  {operation:>8}: p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms, "
+            f"p99 {summary['p99_ms']:.1f} ms, status {summary['status']}"
+        )
+
+
+def _compare(old_path: str, new_path: str) -> None:
+    old, new = (json.loads(Path(path).read_text()) for path in (old_path, new_path))
+    print(f"{old['commit']} -> {new['commit']}")
+    if old["config"] != new["config"]:
+        print("  warning: configs differ")
+    rows = [("throughput_rps", old["throughput_rps"], new["throughput_rps"])]
+    for operation in ("purchase", "cancel"):
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            before = old["operations"][operation].get(key)
+            after = new["operations"][operation].get(key)
+            if before is not None and after is not None:
+                rows.append((f"{operation}.{key}", before, after))
+    rows.append(("oversold_units", old["oversold_units"], new["oversold_units"]))
+    for name, before, after in rows:
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"  {name:>18}: {before:10.2f} -> {after:10.2f} ({change})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--stock", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--cancel-ratio", type=float, default=0.2)
+    parser.add_argument("--skew", choices=("uniform", "zipf"), default="uniform")
+    parser.add_argument("--zipf-s", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--sqlite-timeout", type=float, default=30)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        _compare(*args.compare)
+        return
+
+    if args.backend == "postgres" and args.database_url is None:
+        standin = postgres_standin()
+    else:
+        standin = nullcontext(args.database_url)
+    with standin as database_url:
+        if args.backend == "postgres" and database_url is None:
+            sys.exit("no Postgres available: pass --database-url or set BENCH_POSTGRES_URL")
+        result = _run(args, database_url)
+
+    _print(result)
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"load-{result['backend']}-{result['commit'] or 'nocommit'}-"
+        f"{result['timestamp'].replace(':', '')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, sort_keys=True) + "\n")
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Outbox cost on purchases, relay throughput, and end-to-end event lag.
+
+Times purchases with the outbox off and on, then drains the resulting backlog with the
+relay at a few batch sizes (events/s). Finally a writer thread purchases at a steady rate
+while the relay runs in the background, and each event's lag from its commit-time
+``created_at`` to publish is recorded.
+
+Usage: python -m benchmarks.outbox_relay [--purchases N] [--rate PER_S] [--interval S]
+                                         [--database-url URL]
+"""
+import argparse
+import dataclasses
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks._common import bench_engine, percentile, seed_products
+from src.services import inventory_service, outbox
+from src.services.outbox import OutboxRelay, QueueSink
+
+BATCH_SIZES = (100, 500, 2000)
+
+
+class _LagSink(QueueSink):
+    def __init__(self):
+        super().__init__()
+        self.lags = []
+
+    def publish(self, events):
+        now = datetime.now(timezone.utc)
+        self.lags.extend(
+            (now - datetime.fromisoformat(event["created_at"])).total_seconds()
+            for event in events
+        )
+        super().publish(events)
+
+
+def _purchase_loop(SessionLocal, product_ids, purchases: int, rate: float = 0.0) -> float:
+    start = time.perf_counter()
+    with SessionLocal() as session:
+        for index in range(purchases):
+            if rate:
+                delay = start + index / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            product_id = product_ids[index % len(product_ids)]
+            sku = f"SKU-BENCH-{index % len(product_ids)}"
+            inventory_service.purchase(session, product_id, sku, 1)
+            session.commit()
+    return time.perf_counter() - start
+
+
+def _run(database_url, purchases: int, rate: float, interval: float) -> dict:
+    enabled = dataclasses.replace(outbox.settings, outbox_enabled=True)
+    disabled = dataclasses.replace(outbox.settings, outbox_enabled=False)
+    results = {"purchase_ms": {}, "relay_events_per_s": {}}
+
+    with bench_engine(database_url) as engine:
+        product_ids = seed_products(engine, 100, available_qty=purchases * 10)
+        SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+        for mode, mode_settings in (("outbox off", disabled), ("outbox on", enabled)):
+            outbox.settings = mode_settings
+            elapsed = _purchase_loop(SessionLocal, product_ids, purchases)
+            results["purchase_ms"][mode] = elapsed / purchases * 1000
+
+        for batch_size in BATCH_SIZES:
+            _purchase_loop(SessionLocal, product_ids, purchases)
+            relay = OutboxRelay(QueueSink(), batch_size)
+            start = time.perf_counter()
+            with SessionLocal() as session:
+                published = relay.drain(session)
+            results["relay_events_per_s"][batch_size] = published / (time.perf_counter() - start)
+
+        sink = _LagSink()
+        relay = OutboxRelay(sink)
+        relay.start(SessionLocal, interval)
+        writer = threading.Thread(
+            target=_purchase_loop, args=(SessionLocal, product_ids, purchases, rate)
+        )
+        writer.start()
+        writer.join()
+        relay.stop()
+        outbox.settings = disabled
+
+    lags = sink.lags
+    results["lag_ms"] = {
+        "events": len(lags),
+        "p50": percentile(lags, 0.50) * 1000,
+        "p95": percentile(lags, 0.95) * 1000,
+        "p99": percentile(lags, 0.99) * 1000,
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--purchases", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=500.0, help="purchases/s during lag run")
+    parser.add_argument("--interval", type=float, default=0.05, help="relay poll interval")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    results = _run(args.database_url, args.purchases, args.rate, args.interval)
+    for mode, ms in results["purchase_ms"].items():
+        print(f"purchase, {mode:>10}: {ms:.3f} ms")
+    for batch_size, rate in results["relay_events_per_s"].items():
+        print(f"relay batch {batch_size:>5}: {rate:,.0f} events/s")
+    lag = results["lag_ms"]
+    print(
+        f"lag over {lag['events']} events at {args.rate:.0f}/s, {args.interval}s poll: "
+        f"p50 {lag['p50']:.1f} ms, p95 {lag['p95']:.1f} ms, p99 {lag['p99']:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare database round-trips per purchase for the RETURNING and read-back paths.
+
+Usage: python -m benchmarks.purchase_roundtrips [--purchases N] [--database-url URL]
+"""
+import argparse
+import time
+from unittest import mock
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks._common import bench_engine, seed_products
+from src.services import inventory_service
+
+
+def _run(database_url, purchases: int, use_returning: bool) -> dict:
+    with bench_engine(database_url) as engine:
+        if use_returning and not engine.dialect.update_returning:
+            return {
+                "mode": "returning",
+                "skipped": f"{engine.dialect.name} has no UPDATE RETURNING",
+            }
+        (product_id,) = seed_products(engine, 1, available_qty=purchases)
+        SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+        statements = 0
+
+        def _count(*_args):
+            nonlocal statements
+            statements += 1
+
+        event.listen(engine, "before_cursor_execute", _count)
+        with mock.patch.object(
+            inventory_service, "_supports_returning", lambda _session: use_returning
+        ):
+            start = time.perf_counter()
+            for _ in range(purchases):
+                with SessionLocal() as session:
+                    inventory_service.purchase(session, product_id, "SKU-BENCH-0", 1)
+            elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "returning" if use_returning else "readback",
+        "round_trips_per_purchase": statements / purchases,
+        "purchases_per_sec": purchases / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--purchases", type=int, default=2000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    for use_returning in (False, True):
+        result = _run(args.database_url, args.purchases, use_returning)
+        if "skipped" in result:
+            print(f"{result['mode']:>10}: skipped ({result['skipped']})")
+            continue
+        print(
+            f"{result['mode']:>10}: {result['round_trips_per_purchase']:.2f} round-trips/purchase, "
+            f"{result['purchases_per_sec']:.0f} purchases/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""CPU per purchase response: model envelope vs direct serialization, uuid4 vs new_id.
+
+Serves a canned purchase result from two otherwise identical FastAPI routes, one wrapping
+it in ``PurchaseResponse``/``ResponseEnvelope`` as the routes used to and one returning
+``success(result)``, and drives both in-process through the ASGI interface, so the times
+cover validation, encoding and response construction but no sockets or database. Each
+request also makes the two ids a purchase that raises an alert needs. Reports CPU time
+per request (``time.process_time``) for each path and for id generation alone.
+
+Usage: python -m benchmarks.response_path [--requests N]
+"""
+import argparse
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+from fastapi import FastAPI
+
+from src.api.responses import orjson, success
+from src.api.schemas.inventory import PurchaseResponse
+from src.api.schemas.response import ResponseEnvelope
+from src.db.ids import new_id
+
+BODY = json.dumps(
+    {"order_id": "bench", "product_id": "bench", "sku": "SKU-BENCH-0", "quantity": 1}
+).encode()
+
+
+def _result(make_id) -> dict:
+    return {
+        "product_id": make_id(),
+        "sku": "SKU-BENCH-0",
+        "deducted": 1,
+        "remaining": 41,
+        "log_id": "1042",
+        "alert_id": make_id(),
+    }
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/model", response_model=ResponseEnvelope[PurchaseResponse])
+    async def model_path():
+        result = _result(lambda: str(uuid4()))
+        return ResponseEnvelope(status="success", data=PurchaseResponse(**result), error=None)
+
+    @app.post("/direct", response_model=ResponseEnvelope[PurchaseResponse])
+    async def direct_path():
+        return success(_result(new_id))
+
+    return app
+
+
+async def _request(app, path: str) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": BODY, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def _time_path(app, path: str, requests: int) -> float:
+    for _ in range(min(requests, 200)):
+        await _request(app, path)
+    start = time.process_time()
+    for _ in range(requests):
+        await _request(app, path)
+    return (time.process_time() - start) / requests
+
+
+def _time_ids(make_id, count: int) -> float:
+    start = time.process_time()
+    for _ in range(count):
+        make_id()
+    return (time.process_time() - start) / count
+
+
+def _run(requests: int) -> list:
+    app = _app()
+    model_body = json.loads(asyncio.run(_request(app, "/model")))
+    direct_body = json.loads(asyncio.run(_request(app, "/direct")))
+    assert model_body.keys() == direct_body.keys()
+    assert model_body["data"].keys() == direct_body["data"].keys()
+
+    return [
+        ("model envelope + uuid4", asyncio.run(_time_path(app, "/model", requests))),
+        ("direct envelope + new_id", asyncio.run(_time_path(app, "/direct", requests))),
+        ("str(uuid4())", _time_ids(lambda: str(uuid4()), requests * 10)),
+        ("new_id()", _time_ids(new_id, requests * 10)),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}")
+    results = _run(args.requests)
+    for name, seconds in results:
+        print(f"{name:>26}: {seconds * 1e6:7.2f} us CPU")
+    saved = results[0][1] - results[1][1]
+    print(f"{'saved per request':>26}: {saved * 1e6:7.2f} us ({saved / results[0][1]:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Hot-product purchase throughput with and without sharded stock counters.
+
+Scales tests/integration/test_purchase_concurrency.py up to hundreds of concurrent
+workers hammering one product, and checks that no run oversells.
+
+Usage: python -m benchmarks.sharded_concurrency [--workers 200] [--purchases-per-worker 5]
+                                                [--shards 0,4,16] [--database-url URL]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks._common import bench_engine, seed_products
+from src.api.errors import InsufficientStockError
+from src.models.product import Product
+from src.services import sharded_stock
+from src.services.inventory_service import purchase
+
+
+def _run(database_url, workers: int, per_worker: int, shards: int) -> dict:
+    # Stock covers 80% of demand so the run also exercises the sold-out path.
+    stock = int(workers * per_worker * 0.8)
+    with bench_engine(database_url) as engine:
+        (product_id,) = seed_products(engine, 1, available_qty=stock)
+        SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+        if shards:
+            with SessionLocal() as session:
+                sharded_stock.enable_sharding(session, product_id, shards)
+
+        barrier = Barrier(workers)
+
+        def worker():
+            sold = 0
+            barrier.wait()
+            for _ in range(per_worker):
+                try:
+                    with SessionLocal() as session:
+                        purchase(session, product_id, "SKU-BENCH-0", 1)
+                    sold += 1
+                except InsufficientStockError:
+                    pass
+            return sold
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sold = sum(executor.map(lambda _: worker(), range(workers)))
+        elapsed = time.perf_counter() - start
+
+        with SessionLocal() as session:
+            if shards:
+                remaining = sharded_stock.total_available(session, product_id)
+            else:
+                remaining = session.get(Product, product_id).available_qty
+
+    return {
+        "shards": shards,
+        "purchases_per_sec": workers * per_worker / elapsed,
+        "sold": sold,
+        "oversold": max(0, sold - stock) + max(0, -remaining),
+        "consistent": sold + remaining == stock,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=200)
+    parser.add_argument("--purchases-per-worker", type=int, default=5)
+    parser.add_argument("--shards", default="0,4,16")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    for shards in (int(value) for value in args.shards.split(",")):
+        result = _run(args.database_url, args.workers, args.purchases_per_worker, shards)
+        print(
+            f"shards={result['shards']:>3}: {result['purchases_per_sec']:.0f} purchases/s, "
+            f"sold={result['sold']}, oversold={result['oversold']}, "
+            f"consistent={result['consistent']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
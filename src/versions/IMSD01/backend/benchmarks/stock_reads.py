@@ -0,0 +1,65 @@
+"""Latency of stock reads with the TTL cache off and on.
+
+Polls random products one at a time and in batches, the way a storefront does, through
+a ``StockCache`` with a zero TTL (every read hits the database) and with a real TTL.
+
+Usage: python -m benchmarks.stock_reads [--products N] [--reads N] [--batch N] [--ttl S]
+                                        [--database-url URL]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks._common import bench_engine, percentile, seed_products
+from src.services.stock_cache import StockCache
+
+
+def _run(database_url, products: int, reads: int, batch: int, ttl: float) -> list:
+    with bench_engine(database_url) as engine:
+        product_ids = seed_products(engine, products, available_qty=100)
+        SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+        rng = random.Random(0)
+
+        results = []
+        for mode, cache_ttl in (("cache off", 0.0), ("cache on", ttl)):
+            cache = StockCache(ttl=cache_ttl)
+            for size in (1, batch):
+                latencies = []
+                for _ in range(reads):
+                    ids = rng.sample(product_ids, size)
+                    start = time.perf_counter()
+                    with SessionLocal() as session:
+                        cache.get_many(session, ids)
+                    latencies.append(time.perf_counter() - start)
+                results.append(
+                    {
+                        "mode": mode,
+                        "batch": size,
+                        "p50_ms": statistics.median(latencies) * 1000,
+                        "p99_ms": percentile(latencies, 0.99) * 1000,
+                    }
+                )
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--ttl", type=float, default=2.0)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    for result in _run(args.database_url, args.products, args.reads, args.batch, args.ttl):
+        print(
+            f"{result['mode']:>9}, {result['batch']:>3} ids: "
+            f"p50 {result['p50_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
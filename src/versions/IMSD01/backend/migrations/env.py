@@ -1,15 +1,25 @@
+import os
 from logging.config import fileConfig
+
 from sqlalchemy import engine_from_config, pool
 from alembic import context
 
 from src.db.base import Base
 from src.models.alert import Alert
+from src.models.alert_state import AlertState
+from src.models.idempotency_key import IdempotencyKey
 from src.models.inventory_log import InventoryLog
 from src.models.order import Order
 from src.models.product import Product
+from src.models.product_stock_shard import ProductStockShard
+from src.models.stock_event import StockEvent
+from src.models.stock_reservation import StockReservation
+from src.models.stock_snapshot import StockSnapshot
 
 config = context.config
 fileConfig(config.config_file_name)
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,55 @@
+"""Baseline schema matching infrastructure/docker/init.sql before migrations existed.
+
+Databases created from the original init.sql should be stamped with
+``alembic stamp 0001`` instead of running this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "products",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("sku", sa.String(), nullable=False, unique=True),
+        sa.Column("available_qty", sa.Integer(), nullable=False),
+        sa.Column("low_stock_threshold", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "inventory_logs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("product_id", sa.String(), nullable=False),
+        sa.Column("operation", sa.String(), nullable=False),
+        sa.Column("quantity_delta", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("product_id", sa.String(), nullable=False),
+        sa.Column("requested_qty", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "alerts",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("product_id", sa.String(), nullable=False),
+        sa.Column("trigger_type", sa.String(), nullable=False),
+        sa.Column("stock_level", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("alerts")
+    op.drop_table("orders")
+    op.drop_table("inventory_logs")
+    op.drop_table("products")
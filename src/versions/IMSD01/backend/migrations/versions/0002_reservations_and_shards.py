@@ -0,0 +1,40 @@
+"""Reservation journal and sharded stock counters.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_reservations",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("product_id", sa.String(), nullable=False),
+        sa.Column("operation", sa.String(), nullable=False),
+        sa.Column("quantity_delta", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "product_stock_shards",
+        sa.Column("product_id", sa.String(), primary_key=True),
+        sa.Column("shard_no", sa.Integer(), primary_key=True),
+        sa.Column("available_qty", sa.Integer(), nullable=False),
+    )
+    op.add_column(
+        "products",
+        sa.Column("stock_shards", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "stock_shards")
+    op.drop_table("product_stock_shards")
+    op.drop_table("stock_reservations")
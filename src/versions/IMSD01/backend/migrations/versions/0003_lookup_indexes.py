@@ -0,0 +1,38 @@
+"""Indexes for the product_id history, alert and reservation queries.
+
+On Postgres the indexes are built CONCURRENTLY so large log tables stay writable.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_inventory_logs_product_id", "inventory_logs", ["product_id"]),
+    ("ix_alerts_product_id", "alerts", ["product_id"]),
+    ("ix_stock_reservations_product_id", "stock_reservations", ["product_id"]),
+)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(
+                    name, table, columns, postgresql_concurrently=True, if_not_exists=True
+                )
+        return
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,102 @@
+"""Compact, time-partitioned inventory_logs.
+
+Rows shrink from a text UUID and text operation to a BIGINT identity and a SMALLINT
+operation code, and gain ``created_at``. On Postgres the table is rebuilt as a monthly
+RANGE-partitioned table (primary key ``(id, created_at)``, as partition keys must be part
+of it) with partitions for the current and next three months plus a default partition.
+Existing rows keep their order but are stamped with the migration time, since the old
+table never recorded one.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.db.partitions import DEFAULT_PARTITION, ensure_log_partitions
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+OPERATION_TO_CODE = "CASE operation WHEN 'SALE' THEN 1 WHEN 'RESTOCK' THEN 2 ELSE 3 END"
+CODE_TO_OPERATION = "CASE operation WHEN 1 THEN 'SALE' WHEN 2 THEN 'RESTOCK' ELSE 'RETURN' END"
+
+
+def _upgrade_postgresql() -> None:
+    op.rename_table("inventory_logs", "inventory_logs_legacy")
+    op.drop_index("ix_inventory_logs_product_id", table_name="inventory_logs_legacy")
+    op.execute(
+        """
+        CREATE TABLE inventory_logs (
+          id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+          product_id TEXT NOT NULL,
+          operation SMALLINT NOT NULL,
+          quantity_delta INTEGER NOT NULL,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF inventory_logs DEFAULT")
+    ensure_log_partitions(op.get_bind())
+    op.create_index(
+        "ix_inventory_logs_product_id_created_at", "inventory_logs", ["product_id", "created_at"]
+    )
+    op.execute(
+        "INSERT INTO inventory_logs (product_id, operation, quantity_delta) "
+        f"SELECT product_id, {OPERATION_TO_CODE}, quantity_delta FROM inventory_logs_legacy "
+        "ORDER BY ctid"
+    )
+    op.drop_table("inventory_logs_legacy")
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        _upgrade_postgresql()
+        return
+
+    op.create_table(
+        "inventory_logs_new",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True),
+        sa.Column("product_id", sa.String(), nullable=False),
+        sa.Column("operation", sa.SmallInteger(), nullable=False),
+        sa.Column("quantity_delta", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.execute(
+        "INSERT INTO inventory_logs_new (product_id, operation, quantity_delta) "
+        f"SELECT product_id, {OPERATION_TO_CODE}, quantity_delta FROM inventory_logs"
+    )
+    op.drop_index("ix_inventory_logs_product_id", table_name="inventory_logs")
+    op.drop_table("inventory_logs")
+    op.rename_table("inventory_logs_new", "inventory_logs")
+    op.create_index(
+        "ix_inventory_logs_product_id_created_at", "inventory_logs", ["product_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.create_table(
+        "inventory_logs_old",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("product_id", sa.String(), nullable=False),
+        sa.Column("operation", sa.String(), nullable=False),
+        sa.Column("quantity_delta", sa.Integer(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO inventory_logs_old (id, product_id, operation, quantity_delta) "
+        f"SELECT CAST(id AS TEXT), product_id, {CODE_TO_OPERATION}, quantity_delta "
+        "FROM inventory_logs"
+    )
+    op.drop_table("inventory_logs")
+    op.rename_table("inventory_logs_old", "inventory_logs")
+    op.create_index("ix_inventory_logs_product_id", "inventory_logs", ["product_id"])
@@ -0,0 +1,33 @@
+"""Per-product stock snapshots for ledger replay and audits.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_snapshots",
+        sa.Column("product_id", sa.String(), primary_key=True),
+        sa.Column("last_log_id", sa.BigInteger(), nullable=False),
+        sa.Column("available_qty", sa.Integer(), nullable=False),
+        sa.Column(
+            "taken_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stock_snapshots")
@@ -0,0 +1,66 @@
+"""Alert timestamps and per-product alert state.
+
+alert_states starts empty: existing alerts carry no timestamp to pick a latest one by,
+so state fills in as new alerts are raised.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "alerts",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_table(
+        "alert_states",
+        sa.Column("product_id", sa.String(), primary_key=True),
+        sa.Column("last_alert_id", sa.String(), nullable=False),
+        sa.Column("stock_level", sa.Integer(), nullable=False),
+        sa.Column(
+            "alerted_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_alerts_product_id_created_at",
+                "alerts",
+                ["product_id", "created_at"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                "ix_alerts_product_id",
+                table_name="alerts",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        return
+    op.create_index("ix_alerts_product_id_created_at", "alerts", ["product_id", "created_at"])
+    op.drop_index("ix_alerts_product_id", table_name="alerts")
+
+
+def downgrade() -> None:
+    op.create_index("ix_alerts_product_id", "alerts", ["product_id"])
+    op.drop_index("ix_alerts_product_id_created_at", table_name="alerts")
+    op.drop_table("alert_states")
+    op.drop_column("alerts", "created_at")
@@ -0,0 +1,51 @@
+"""Order reservations: sku, expiry and a partial index over open reservations.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+RESERVED = sa.text("status = 'RESERVED'")
+
+
+def upgrade() -> None:
+    op.add_column("orders", sa.Column("sku", sa.String(), nullable=True))
+    op.add_column("orders", sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "orders",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_orders_reserved_expires_at",
+                "orders",
+                ["expires_at"],
+                postgresql_where=RESERVED,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        return
+    op.create_index(
+        "ix_orders_reserved_expires_at", "orders", ["expires_at"], sqlite_where=RESERVED
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_reserved_expires_at", table_name="orders")
+    op.drop_column("orders", "created_at")
+    op.drop_column("orders", "expires_at")
+    op.drop_column("orders", "sku")
@@ -0,0 +1,37 @@
+"""Request hashes on idempotency keys and a created_at index for pruning.
+
+Existing keys keep a NULL hash and are replayed without the request check. On Postgres
+the index is built CONCURRENTLY so the table stays writable.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("idempotency_keys", sa.Column("request_hash", sa.String(), nullable=True))
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_idempotency_keys_created_at",
+                "idempotency_keys",
+                ["created_at"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        return
+    op.create_index("ix_idempotency_keys_created_at", "idempotency_keys", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_idempotency_keys_created_at", table_name="idempotency_keys")
+    op.drop_column("idempotency_keys", "request_hash")
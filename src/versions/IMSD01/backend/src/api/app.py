@@ -1,14 +1,47 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.api.errors import ConcurrencyError, InsufficientStockError, ValidationError
+from src.api.errors import (
+    ConcurrencyError,
+    IdempotencyConflictError,
+    InsufficientStockError,
+    ValidationError,
+)
 from src.api.router import router
 from src.api.schemas.response import ResponseEnvelope
 from src.config.logging import setup_logging
+from src.config.settings import settings
+from src.db.session import SessionLocal
+from src.observability.profiler import profiler
+from src.observability.request_timing import TimingMiddleware
+from src.services.alert_pipeline import alert_pipeline
+from src.services.order_reservations import expiry_sweeper
+from src.services.reservation_cache import reservation_cache
+
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.profiler_enabled:
+        profiler.start()
+    if settings.reservation_cache_enabled:
+        reservation_cache.start(SessionLocal, settings.reservation_flush_interval)
+    if settings.alert_pipeline_enabled:
+        alert_pipeline.start(SessionLocal, settings.alert_flush_interval)
+    if settings.expiry_sweeper_enabled:
+        expiry_sweeper.start(SessionLocal, settings.expiry_sweep_interval)
+    try:
+        yield
+    finally:
+        expiry_sweeper.stop()
+        reservation_cache.stop()
+        alert_pipeline.stop()
+        profiler.stop()
 
-app = FastAPI(title="Inventory Management")
+
+app = FastAPI(title="Inventory Management", lifespan=lifespan)
 setup_logging()
 app.add_middleware(
     CORSMiddleware,
@@ -17,6 +50,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TimingMiddleware)
 
 
 @app.exception_handler(InsufficientStockError)
@@ -43,4 +77,12 @@ async def handle_concurrency_error(_request, exc: ConcurrencyError):
     )
 
 
+@app.exception_handler(IdempotencyConflictError)
+async def handle_idempotency_conflict(_request, exc: IdempotencyConflictError):
+    return JSONResponse(
+        status_code=409,
+        content=ResponseEnvelope(status="error", data=None, error=str(exc)).model_dump(),
+    )
+
+
 app.include_router(router)
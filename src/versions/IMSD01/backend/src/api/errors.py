@@ -13,3 +13,7 @@ class ValidationError(InventoryError):
 
 class ConcurrencyError(InventoryError):
     pass
+
+
+class IdempotencyConflictError(InventoryError):
+    pass
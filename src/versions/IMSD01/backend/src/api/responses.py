@@ -0,0 +1,43 @@
+"""Success envelopes for service output that is already in response shape.
+
+The purchase, cancel and reservation services return plain dicts with exactly the fields
+of their response models, built from validated requests and database rows. Wrapping them in
+``PurchaseResponse`` and ``ResponseEnvelope`` only for FastAPI to validate and encode them
+again costs more CPU than the rest of the route. ``success`` serializes the dict directly
+instead; routes keep their ``response_model`` so the OpenAPI schema is unchanged.
+
+Encoding uses ``orjson`` when it is installed (the ``fast`` extra) and falls back to the
+standard library ``json`` with the same compact output otherwise; both write datetimes
+(a reservation's ``expires_at``) in ISO 8601.
+"""
+import json
+from datetime import datetime
+from typing import Any
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+
+def _encode_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class EnvelopeResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_encode_default
+        ).encode("utf-8")
+
+
+def success(data: Any) -> EnvelopeResponse:
+    return EnvelopeResponse({"status": "success", "data": data, "error": None})
@@ -1,6 +1,17 @@
 from fastapi import APIRouter
 
-from src.api.routes import inventory
+from src.api.routes import alerts, logs, metrics, restock, stock
+from src.config.settings import settings
+
+if settings.async_db:
+    from src.api.routes import inventory_async as inventory
+else:
+    from src.api.routes import inventory
 
 router = APIRouter()
 router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
+router.include_router(alerts.router, prefix="/inventory", tags=["inventory"])
+router.include_router(logs.router, prefix="/inventory", tags=["inventory"])
+router.include_router(restock.router, prefix="/inventory", tags=["inventory"])
+router.include_router(stock.router, prefix="/stock", tags=["stock"])
+router.include_router(metrics.router)
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from src.api.schemas.alerts import AlertStateResponse, AlertStatesResponse
+from src.api.schemas.response import ResponseEnvelope
+from src.db.session import get_read_session
+from src.services.alert_service import alert_states
+
+router = APIRouter()
+
+
+@router.get("/alerts", response_model=ResponseEnvelope[AlertStatesResponse])
+def list_alerts(product_id: Optional[str] = None, session: Session = Depends(get_read_session)):
+    states = alert_states(session, product_id)
+    data = AlertStatesResponse(
+        alerts=[
+            AlertStateResponse(
+                product_id=state.product_id,
+                last_alert_id=state.last_alert_id,
+                stock_level=state.stock_level,
+                alerted_at=state.alerted_at,
+            )
+            for state in states
+        ]
+    )
+    return ResponseEnvelope(status="success", data=data, error=None)
@@ -1,28 +1,81 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
+from src.api.responses import success
 from src.api.schemas.inventory import (
+    BatchPurchaseRequest,
+    BatchPurchaseResponse,
     CancelRequest,
     CancelResponse,
+    ConfirmRequest,
+    ConfirmResponse,
     PurchaseRequest,
     PurchaseResponse,
+    ReserveRequest,
+    ReserveResponse,
 )
 from src.api.schemas.response import ResponseEnvelope
+from src.config.settings import settings
+from src.db.retry import run_with_retries
 from src.db.session import get_session
-from src.services import inventory_service
+from src.services import inventory_service, order_reservations
+from src.services.reservation_cache import reservation_cache
 
 router = APIRouter()
+stock = reservation_cache if settings.reservation_cache_enabled else inventory_service
 
 
 @router.post("/purchase", response_model=ResponseEnvelope[PurchaseResponse])
 def purchase(req: PurchaseRequest, session: Session = Depends(get_session)):
-    result = inventory_service.purchase(session, req.product_id, req.sku, req.quantity)
-    return ResponseEnvelope(status="success", data=PurchaseResponse(**result), error=None)
+    result = run_with_retries(
+        session, "purchase", stock.purchase, req.product_id, req.sku, req.quantity, req.order_id
+    )
+    return success(result)
+
+
+@router.post("/purchase/batch", response_model=ResponseEnvelope[BatchPurchaseResponse])
+def purchase_batch(req: BatchPurchaseRequest, session: Session = Depends(get_session)):
+    results = run_with_retries(
+        session,
+        "purchase_batch",
+        stock.purchase_many,
+        [(line.product_id, line.sku, line.quantity) for line in req.lines],
+        req.order_id,
+    )
+    return success({"order_id": req.order_id, "lines": results})
 
 
 @router.post("/cancel", response_model=ResponseEnvelope[CancelResponse])
 def cancel(req: CancelRequest, session: Session = Depends(get_session)):
-    result = inventory_service.restore(
-        session, req.product_id, req.sku, req.quantity, req.reason
+    result = run_with_retries(
+        session,
+        "cancel",
+        stock.restore,
+        req.product_id,
+        req.sku,
+        req.quantity,
+        req.reason,
+        req.order_id,
     )
-    return ResponseEnvelope(status="success", data=CancelResponse(**result), error=None)
+    return success(result)
+
+
+@router.post("/reserve", response_model=ResponseEnvelope[ReserveResponse])
+def reserve(req: ReserveRequest, session: Session = Depends(get_session)):
+    result = run_with_retries(
+        session,
+        "reserve",
+        order_reservations.reserve,
+        req.order_id,
+        req.product_id,
+        req.sku,
+        req.quantity,
+        req.ttl_seconds,
+    )
+    return success(result)
+
+
+@router.post("/confirm", response_model=ResponseEnvelope[ConfirmResponse])
+def confirm(req: ConfirmRequest, session: Session = Depends(get_session)):
+    result = run_with_retries(session, "confirm", order_reservations.confirm, req.order_id)
+    return success(result)
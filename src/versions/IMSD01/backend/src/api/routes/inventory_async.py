@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.responses import success
+from src.api.schemas.inventory import (
+    BatchPurchaseRequest,
+    BatchPurchaseResponse,
+    CancelRequest,
+    CancelResponse,
+    ConfirmRequest,
+    ConfirmResponse,
+    PurchaseRequest,
+    PurchaseResponse,
+    ReserveRequest,
+    ReserveResponse,
+)
+from src.api.schemas.response import ResponseEnvelope
+from src.db.async_session import get_async_session
+from src.services import async_inventory_service
+
+router = APIRouter()
+
+
+@router.post("/purchase", response_model=ResponseEnvelope[PurchaseResponse])
+async def purchase(req: PurchaseRequest, session: AsyncSession = Depends(get_async_session)):
+    result = await async_inventory_service.purchase(
+        session, req.product_id, req.sku, req.quantity, req.order_id
+    )
+    return success(result)
+
+
+@router.post("/purchase/batch", response_model=ResponseEnvelope[BatchPurchaseResponse])
+async def purchase_batch(
+    req: BatchPurchaseRequest, session: AsyncSession = Depends(get_async_session)
+):
+    results = await async_inventory_service.purchase_many(
+        session,
+        [(line.product_id, line.sku, line.quantity) for line in req.lines],
+        req.order_id,
+    )
+    return success({"order_id": req.order_id, "lines": results})
+
+
+@router.post("/cancel", response_model=ResponseEnvelope[CancelResponse])
+async def cancel(req: CancelRequest, session: AsyncSession = Depends(get_async_session)):
+    result = await async_inventory_service.restore(
+        session, req.product_id, req.sku, req.quantity, req.reason, req.order_id
+    )
+    return success(result)
+
+
+@router.post("/reserve", response_model=ResponseEnvelope[ReserveResponse])
+async def reserve(req: ReserveRequest, session: AsyncSession = Depends(get_async_session)):
+    result = await async_inventory_service.reserve(
+        session, req.order_id, req.product_id, req.sku, req.quantity, req.ttl_seconds
+    )
+    return success(result)
+
+
+@router.post("/confirm", response_model=ResponseEnvelope[ConfirmResponse])
+async def confirm(req: ConfirmRequest, session: AsyncSession = Depends(get_async_session)):
+    result = await async_inventory_service.confirm(session, req.order_id)
+    return success(result)
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from src.api.schemas.logs import InventoryLogResponse, InventoryLogsResponse
+from src.api.schemas.response import ResponseEnvelope
+from src.db.session import get_read_session
+from src.services.log_history import log_history
+
+router = APIRouter()
+
+
+@router.get("/logs", response_model=ResponseEnvelope[InventoryLogsResponse])
+def list_logs(
+    product_id: str,
+    since: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=500),
+    session: Session = Depends(get_read_session),
+):
+    logs = log_history(session, product_id, since, limit)
+    data = InventoryLogsResponse(
+        logs=[
+            InventoryLogResponse(
+                id=str(log.id),
+                product_id=log.product_id,
+                operation=log.operation,
+                quantity_delta=log.quantity_delta,
+                created_at=log.created_at,
+            )
+            for log in logs
+        ]
+    )
+    return ResponseEnvelope(status="success", data=data, error=None)
@@ -0,0 +1,39 @@
+import io
+import tempfile
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from src.api.schemas.response import ResponseEnvelope
+from src.api.schemas.restock import RestockResponse
+from src.db.session import get_session
+from src.services import bulk_restock
+
+router = APIRouter()
+
+
+@router.post("/restock", response_model=ResponseEnvelope[RestockResponse])
+async def restock(
+    request: Request, format: Optional[str] = None, session: Session = Depends(get_session)
+):
+    """Apply a CSV or NDJSON feed sent as the raw request body.
+
+    The format comes from ``?format=`` or the Content-Type. The body is spooled to a temp
+    file as it arrives, so large feeds are never held in memory.
+    """
+    fmt = format or bulk_restock.format_for(request.headers.get("content-type", ""))
+    if fmt not in bulk_restock.FORMATS:
+        fmt = bulk_restock.format_for(fmt)
+    with tempfile.TemporaryFile() as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        lines = io.TextIOWrapper(body, encoding="utf-8", newline="")
+        summary = await run_in_threadpool(
+            bulk_restock.restock, session, bulk_restock.read_feed(lines, fmt)
+        )
+    return ResponseEnvelope(
+        status="success", data=RestockResponse(**summary._asdict()), error=None
+    )
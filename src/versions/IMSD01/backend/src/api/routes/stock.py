@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from src.api.errors import ValidationError
+from src.api.schemas.response import ResponseEnvelope
+from src.api.schemas.stock import StockBatchResponse, StockResponse
+from src.db.session import get_session
+from src.services.stock_cache import stock_cache
+
+router = APIRouter()
+
+MAX_BATCH_IDS = 200
+
+
+# Misses load from the writer: stock_cache is shared by the process, so a level read from a
+# lagging replica just after a commit's invalidation would be served for the whole TTL.
+@router.get("", response_model=ResponseEnvelope[StockBatchResponse])
+def get_stock_batch(ids: str, session: Session = Depends(get_session)):
+    product_ids = list(dict.fromkeys(item.strip() for item in ids.split(",") if item.strip()))
+    if not product_ids:
+        raise ValidationError("At least one product id is required")
+    if len(product_ids) > MAX_BATCH_IDS:
+        raise ValidationError(f"At most {MAX_BATCH_IDS} product ids per request")
+
+    stock = stock_cache.get_many(session, product_ids)
+    data = StockBatchResponse(
+        products=[StockResponse(**stock[pid]._asdict()) for pid in product_ids if pid in stock],
+        missing=[product_id for product_id in product_ids if product_id not in stock],
+    )
+    return ResponseEnvelope(status="success", data=data, error=None)
+
+
+@router.get("/{product_id}", response_model=ResponseEnvelope[StockResponse])
+def get_stock(product_id: str, session: Session = Depends(get_session)):
+    stock = stock_cache.get(session, product_id)
+    if stock is None:
+        raise ValidationError("Product not found")
+    return ResponseEnvelope(status="success", data=StockResponse(**stock._asdict()), error=None)
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+
+class AlertStateResponse(BaseModel):
+    product_id: str
+    last_alert_id: str
+    stock_level: int
+    alerted_at: datetime
+
+
+class AlertStatesResponse(BaseModel):
+    alerts: List[AlertStateResponse]
@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -18,6 +19,22 @@ class PurchaseResponse(BaseModel):
     alert_id: Optional[str]
 
 
+class PurchaseLine(BaseModel):
+    product_id: str
+    sku: str
+    quantity: int = Field(gt=0)
+
+
+class BatchPurchaseRequest(BaseModel):
+    order_id: str
+    lines: List[PurchaseLine] = Field(min_length=1)
+
+
+class BatchPurchaseResponse(BaseModel):
+    order_id: str
+    lines: List[PurchaseResponse]
+
+
 class CancelRequest(BaseModel):
     order_id: str
     product_id: str
@@ -32,3 +49,25 @@ class CancelResponse(BaseModel):
     restored: int
     remaining: int
     log_id: str
+
+
+class ReserveRequest(BaseModel):
+    order_id: str
+    product_id: str
+    sku: str
+    quantity: int = Field(gt=0)
+    ttl_seconds: Optional[float] = Field(default=None, gt=0)
+
+
+class ReserveResponse(PurchaseResponse):
+    order_id: str
+    expires_at: datetime
+
+
+class ConfirmRequest(BaseModel):
+    order_id: str
+
+
+class ConfirmResponse(BaseModel):
+    order_id: str
+    status: str
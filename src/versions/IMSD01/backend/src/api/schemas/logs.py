@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+
+class InventoryLogResponse(BaseModel):
+    id: str
+    product_id: str
+    operation: str
+    quantity_delta: int
+    created_at: datetime
+
+
+class InventoryLogsResponse(BaseModel):
+    logs: List[InventoryLogResponse]
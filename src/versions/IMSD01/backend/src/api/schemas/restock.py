@@ -0,0 +1,11 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class RestockResponse(BaseModel):
+    rows: int
+    products: int
+    units: int
+    unknown: int
+    unknown_skus: List[str]
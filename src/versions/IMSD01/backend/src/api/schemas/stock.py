@@ -0,0 +1,15 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class StockResponse(BaseModel):
+    product_id: str
+    sku: str
+    available_qty: int
+    low_stock_threshold: int
+
+
+class StockBatchResponse(BaseModel):
+    products: List[StockResponse]
+    missing: List[str]
@@ -0,0 +1,50 @@
+"""Partition maintenance and archiving for inventory_logs.
+
+Usage: python -m src.cli.archive_logs ensure [--months-ahead 3]
+       python -m src.cli.archive_logs archive --keep-months 6 --output-dir DIR
+"""
+import argparse
+import logging
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from src.db.partitions import add_months, ensure_log_partitions, month_start
+from src.db.session import engine
+from src.services.log_archive import archive_partitions, archive_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = commands.add_parser("ensure", help="create upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=3)
+
+    archive = commands.add_parser("archive", help="archive logs older than the retention")
+    archive.add_argument("--keep-months", type=int, default=6)
+    archive.add_argument("--output-dir", type=Path, required=True)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    postgres = engine.dialect.name == "postgresql"
+
+    if args.command == "ensure":
+        if not postgres:
+            parser.error("partitions are only used on Postgres")
+        with engine.begin() as conn:
+            for name in ensure_log_partitions(conn, args.months_ahead):
+                print(name)
+        return
+
+    # Keep the current month plus ``keep_months`` full months before it.
+    cutoff = add_months(month_start(date.today()), -args.keep_months)
+    if postgres:
+        for path in archive_partitions(engine, cutoff, args.output_dir):
+            print(path)
+    else:
+        before = datetime(cutoff.year, cutoff.month, 1, tzinfo=timezone.utc)
+        print(archive_rows(engine, before, args.output_dir))
+
+
+if __name__ == "__main__":
+    main()
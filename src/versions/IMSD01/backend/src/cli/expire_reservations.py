@@ -0,0 +1,22 @@
+"""Expire overdue stock reservations once, e.g. from cron instead of the in-app sweeper.
+
+Usage: python -m src.cli.expire_reservations [--batch-size 100]
+"""
+import argparse
+
+from src.config.settings import settings
+from src.db.session import SessionLocal
+from src.services.order_reservations import expire_all
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.expiry_batch_size)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        print(f"expired {expire_all(session, args.batch_size)} reservations")
+
+
+if __name__ == "__main__":
+    main()
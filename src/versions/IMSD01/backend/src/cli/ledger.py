@@ -0,0 +1,49 @@
+"""Snapshot and audit stock against the inventory log ledger.
+
+Usage: python -m src.cli.ledger snapshot [--chunk-size 1000] [--workers 4]
+       python -m src.cli.ledger audit [--chunk-size 1000] [--workers 4]
+
+``audit`` prints one line per drifting product and exits with status 1 if any drift.
+"""
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from src.db.session import SessionLocal
+from src.services import ledger
+
+
+def _run_chunk(command: str, product_ids):
+    with SessionLocal() as session:
+        if command == "snapshot":
+            return ledger.take_snapshots(session, product_ids)
+        return ledger.audit(session, product_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("snapshot", "audit"))
+    parser.add_argument("--chunk-size", type=int, default=ledger.CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        chunks = list(ledger.product_id_chunks(session, args.chunk_size))
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(lambda chunk: _run_chunk(args.command, chunk), chunks))
+
+    if args.command == "snapshot":
+        print(f"snapshotted {sum(results)} products")
+        return
+
+    drift = [item for chunk in results for item in chunk]
+    for item in drift:
+        print(f"{item.product_id}\texpected={item.expected}\tactual={item.actual}")
+    print(f"audited {sum(len(chunk) for chunk in chunks)} products, {len(drift)} drifting")
+    if drift:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
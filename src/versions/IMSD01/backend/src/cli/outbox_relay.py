@@ -0,0 +1,44 @@
+"""Publish stock change events from the outbox as NDJSON until interrupted.
+
+Usage: python -m src.cli.outbox_relay [--output PATH] [--once] [--interval 0.2]
+                                      [--batch-size 500]
+"""
+import argparse
+import signal
+import sys
+import threading
+
+from src.config.settings import settings
+from src.db.session import SessionLocal
+from src.services.outbox import FileSink, OutboxRelay
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="-", help="file to append events to; - for stdout")
+    parser.add_argument("--once", action="store_true", help="drain the outbox and exit")
+    parser.add_argument("--interval", type=float, default=settings.outbox_relay_interval)
+    parser.add_argument("--batch-size", type=int, default=settings.outbox_batch_size)
+    args = parser.parse_args()
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    relay = OutboxRelay(FileSink(stream), args.batch_size)
+    try:
+        if args.once:
+            with SessionLocal() as session:
+                print(f"published {relay.drain(session)} events", file=sys.stderr)
+            return
+
+        stopped = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopped.set())
+        relay.start(SessionLocal, args.interval)
+        stopped.wait()
+        relay.stop()
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
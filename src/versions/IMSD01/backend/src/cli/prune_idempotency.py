@@ -0,0 +1,25 @@
+"""Delete idempotency keys older than the retention period, e.g. nightly from cron.
+
+Usage: python -m src.cli.prune_idempotency [--days 7] [--batch-size 1000]
+"""
+import argparse
+from datetime import timedelta
+
+from src.config.settings import settings
+from src.db.session import SessionLocal
+from src.services.idempotency import PRUNE_BATCH_SIZE, idempotency_keys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=settings.idempotency_retention_days)
+    parser.add_argument("--batch-size", type=int, default=PRUNE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        deleted = idempotency_keys.prune(session, timedelta(days=args.days), args.batch_size)
+        print(f"deleted {deleted} idempotency keys")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Apply a warehouse restock feed (CSV or NDJSON) to product stock in bulk.
+
+Usage: python -m src.cli.restock FEED [--format csv|ndjson] [--chunk-size 10000]
+"""
+import argparse
+import sys
+import time
+
+from src.db.session import SessionLocal
+from src.services import bulk_restock
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("feed", help="path to the feed file")
+    parser.add_argument("--format", choices=bulk_restock.FORMATS, default=None)
+    parser.add_argument("--chunk-size", type=int, default=bulk_restock.CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or bulk_restock.format_for(args.feed)
+    start = time.perf_counter()
+
+    def _progress(stage: str, count: int) -> None:
+        elapsed = time.perf_counter() - start
+        print(f"{stage} {count} after {elapsed:.1f}s", file=sys.stderr)
+
+    with open(args.feed, newline="", encoding="utf-8") as feed, SessionLocal() as session:
+        summary = bulk_restock.restock(
+            session, bulk_restock.read_feed(feed, fmt), _progress, args.chunk_size
+        )
+    elapsed = time.perf_counter() - start
+    print(
+        f"restocked {summary.units} units across {summary.products} products "
+        f"from {summary.rows} rows in {elapsed:.1f}s ({summary.rows / elapsed:.0f} rows/s)"
+    )
+    if summary.unknown:
+        print(
+            f"skipped {summary.unknown} unknown skus: {', '.join(summary.unknown_skus)}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 import os
+from typing import Tuple
 
 
 @dataclass(frozen=True)
@@ -8,7 +9,43 @@ class Settings:
         "DATABASE_URL",
         "postgresql+psycopg://postgres:postgres@db:5432/inventory",
     )
+    # Comma-separated replica URLs for read-only sessions; empty means reads use the writer.
+    database_reader_urls: Tuple[str, ...] = tuple(
+        url.strip() for url in os.getenv("DATABASE_READER_URLS", "").split(",") if url.strip()
+    )
+    replica_health_interval: float = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5.0"))
     env: str = os.getenv("APP_ENV", "local")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    reservation_cache_enabled: bool = os.getenv("RESERVATION_CACHE", "false").lower() == "true"
+    reservation_flush_interval: float = float(os.getenv("RESERVATION_FLUSH_INTERVAL", "1.0"))
+    alert_pipeline_enabled: bool = os.getenv("ALERT_PIPELINE", "false").lower() == "true"
+    alert_dedup_window: float = float(os.getenv("ALERT_DEDUP_WINDOW", "60"))
+    alert_flush_interval: float = float(os.getenv("ALERT_FLUSH_INTERVAL", "0.5"))
+    idempotency_cache_size: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    idempotency_retention_days: float = float(os.getenv("IDEMPOTENCY_RETENTION_DAYS", "7"))
+    db_retry_budget: float = float(os.getenv("DB_RETRY_BUDGET", "2.0"))
+    db_retry_base_delay: float = float(os.getenv("DB_RETRY_BASE_DELAY", "0.01"))
+    db_retry_max_delay: float = float(os.getenv("DB_RETRY_MAX_DELAY", "0.5"))
+    reservation_ttl: float = float(os.getenv("RESERVATION_TTL", "900"))
+    expiry_sweeper_enabled: bool = os.getenv("EXPIRY_SWEEPER", "false").lower() == "true"
+    expiry_sweep_interval: float = float(os.getenv("EXPIRY_SWEEP_INTERVAL", "5.0"))
+    expiry_batch_size: int = int(os.getenv("EXPIRY_BATCH_SIZE", "100"))
+    outbox_enabled: bool = os.getenv("OUTBOX", "false").lower() == "true"
+    outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+    outbox_relay_interval: float = float(os.getenv("OUTBOX_RELAY_INTERVAL", "0.2"))
+    stock_cache_ttl: float = float(os.getenv("STOCK_CACHE_TTL", "2.0"))
+    slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "250"))
+    profiler_enabled: bool = os.getenv("PROFILER", "false").lower() == "true"
+    profiler_interval: float = float(os.getenv("PROFILER_INTERVAL", "0.005"))
+    profiler_output: str = os.getenv("PROFILER_OUTPUT", "profile.folded")
+    async_db: bool = os.getenv("ASYNC_DB", "false").lower() == "true"
+    async_database_url: str = os.getenv(
+        "ASYNC_DATABASE_URL",
+        "postgresql+psycopg_async://postgres:postgres@db:5432/inventory",
+    )
 
 
 settings = Settings()
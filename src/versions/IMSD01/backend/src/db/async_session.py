@@ -0,0 +1,25 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.config.settings import settings
+from src.db.pool_metrics import instrumented_pool_class, register_pool_gauges
+
+
+async_engine = create_async_engine(
+    settings.async_database_url,
+    poolclass=instrumented_pool_class("primary_async", AsyncAdaptedQueuePool),
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    pool_timeout=settings.db_pool_timeout,
+    pool_pre_ping=True,
+)
+register_pool_gauges(async_engine.sync_engine, "primary_async")
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_async_session():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,101 @@
+"""Monthly range partitions of ``inventory_logs`` on Postgres.
+
+Partitions are named ``inventory_logs_YYYY_MM`` and cover ``[first of month, first of
+next month)`` on ``created_at``. A ``inventory_logs_default`` partition catches anything
+outside the pre-created range; ``ensure_log_partitions`` keeps it empty by creating
+upcoming months ahead of time. While it exists Postgres refuses ``DETACH PARTITION ...
+CONCURRENTLY``, so ``detach_partition_sql`` only asks for it when there is none.
+"""
+import re
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy.engine import Connection
+
+PARENT = "inventory_logs"
+DEFAULT_PARTITION = f"{PARENT}_default"
+
+_NAME = re.compile(rf"^{PARENT}_(\d{{4}})_(\d{{2}})$")
+
+
+class LogPartition(NamedTuple):
+    name: str
+    start: date
+    attached: bool
+    detach_pending: bool
+
+    @property
+    def end(self) -> date:
+        return add_months(self.start, 1)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(start: date, months: int) -> date:
+    index = start.year * 12 + start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(start: date) -> str:
+    return f"{PARENT}_{start:%Y_%m}"
+
+
+def parse_partition_name(name: str) -> Optional[date]:
+    match = _NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(start: date) -> str:
+    start = month_start(start)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+    )
+
+
+def ensure_log_partitions(
+    connection: Connection, months_ahead: int = 3, today: Optional[date] = None
+) -> List[str]:
+    """Create the current month's partition and ``months_ahead`` after it."""
+    current = month_start(today or date.today())
+    names = []
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        connection.exec_driver_sql(create_partition_sql(start))
+        names.append(partition_name(start))
+    return names
+
+
+def has_default_partition(connection: Connection) -> bool:
+    return connection.exec_driver_sql(
+        "SELECT partdefid <> 0 FROM pg_partitioned_table "
+        "WHERE partrelid = %(parent)s::regclass",
+        {"parent": PARENT},
+    ).scalar_one()
+
+
+def detach_partition_sql(name: str, concurrently: bool) -> str:
+    suffix = " CONCURRENTLY" if concurrently else ""
+    return f"ALTER TABLE {PARENT} DETACH PARTITION {name}{suffix}"
+
+
+def log_partitions(connection: Connection) -> List[LogPartition]:
+    """Monthly partition tables, including ones already (or partly) detached."""
+    rows = connection.exec_driver_sql(
+        "SELECT c.relname, i.inhrelid IS NOT NULL, COALESCE(i.inhdetachpending, false) "
+        "FROM pg_class c "
+        "LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+        "WHERE c.relkind = 'r' AND c.relname LIKE %(prefix)s "
+        "AND c.relnamespace = 'public'::regnamespace",
+        {"prefix": f"{PARENT}\\_%"},
+    ).all()
+    partitions = []
+    for name, attached, detach_pending in rows:
+        start = parse_partition_name(name)
+        if start is not None:
+            partitions.append(LogPartition(name, start, attached, detach_pending))
+    return sorted(partitions, key=lambda partition: partition.start)
@@ -0,0 +1,54 @@
+import time
+from typing import Type
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+from src.observability.metrics import registry
+
+CHECKOUT_SECONDS = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled connection.",
+    ("pool",),
+)
+CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Connection checkouts that gave up after pool_timeout.",
+    ("pool",),
+)
+IN_USE = registry.gauge("db_pool_in_use", "Connections currently checked out.", ("pool",))
+OVERFLOW = registry.gauge(
+    "db_pool_overflow", "Connections open beyond pool_size.", ("pool",)
+)
+SIZE = registry.gauge("db_pool_size", "Configured pool_size.", ("pool",))
+
+
+def instrumented_pool_class(name: str, base: Type[Pool] = QueuePool) -> Type[Pool]:
+    """Return a ``base`` subclass that records checkout latency under ``pool=name``.
+
+    Pool events only fire once a connection has been handed out, so the wait itself is
+    timed around ``connect()``. ``Pool.recreate()`` reuses ``self.__class__``, which keeps
+    the instrumentation across ``engine.dispose()``.
+    """
+
+    class InstrumentedPool(base):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                CHECKOUT_TIMEOUTS.inc(pool=name)
+                raise
+            finally:
+                CHECKOUT_SECONDS.observe(time.perf_counter() - start, pool=name)
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+def register_pool_gauges(engine: Engine, name: str) -> None:
+    # engine.pool is looked up on every scrape because dispose() swaps in a new pool.
+    IN_USE.set_function(lambda: engine.pool.checkedout(), pool=name)
+    OVERFLOW.set_function(lambda: max(0, engine.pool.overflow()), pool=name)
+    SIZE.set_function(lambda: engine.pool.size(), pool=name)
@@ -0,0 +1,133 @@
+"""Retry stock transactions that lost a lock or serialization race.
+
+Deadlocks, serialization failures and lock timeouts abort the whole transaction but are
+safe to replay from the start, so ``run_with_retries`` re-runs the service call with
+full-jitter exponential backoff until it succeeds or the time budget runs out; only then
+does the caller see a ``ConcurrencyError`` (HTTP 409). Anything else is re-raised as is.
+
+Retries only happen when the call owns its transaction. Inside a caller's transaction
+the failure is left for the caller, since only the outermost transaction can be replayed.
+"""
+import asyncio
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from src.api.errors import ConcurrencyError
+from src.config.settings import settings
+from src.observability.metrics import registry
+
+RETRIES = registry.counter(
+    "db_transaction_retries_total",
+    "Transactions re-run after a retryable database error.",
+    ("endpoint",),
+)
+EXHAUSTED = registry.counter(
+    "db_transaction_retries_exhausted_total",
+    "Transactions that were still failing when the retry budget ran out.",
+    ("endpoint",),
+)
+
+# serialization_failure, deadlock_detected, lock_not_available
+POSTGRES_RETRYABLE = {"40001", "40P01", "55P03"}
+SQLITE_RETRYABLE = ("database is locked", "database table is locked")
+
+
+def is_retryable(exc: BaseException, dialect_name: str) -> bool:
+    if not isinstance(exc, DBAPIError) or exc.orig is None:
+        return False
+    if dialect_name == "postgresql":
+        code = getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)
+        return code in POSTGRES_RETRYABLE
+    if dialect_name == "sqlite":
+        return isinstance(exc.orig, sqlite3.OperationalError) and any(
+            message in str(exc.orig) for message in SQLITE_RETRYABLE
+        )
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    budget: float = settings.db_retry_budget
+    base_delay: float = settings.db_retry_base_delay
+    max_delay: float = settings.db_retry_max_delay
+    clock: Callable[[], float] = field(default=time.monotonic)
+    rng: random.Random = field(default_factory=random.Random)
+
+    def delays(self) -> Iterator[float]:
+        """Jittered sleeps that stop before the next one would overrun the budget."""
+        return self._delays(self.clock() + self.budget)
+
+    def _delays(self, deadline: float) -> Iterator[float]:
+        attempt = 0
+        while True:
+            delay = self.rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+            if self.clock() + delay > deadline:
+                return
+            yield delay
+            attempt += 1
+
+
+default_policy = RetryPolicy()
+
+
+def _exhausted(endpoint: str) -> ConcurrencyError:
+    EXHAUSTED.inc(endpoint=endpoint)
+    return ConcurrencyError("Concurrent update detected, please retry")
+
+
+def run_with_retries(
+    session: Session,
+    endpoint: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    policy: RetryPolicy = default_policy,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Any:
+    if session.in_transaction():
+        return fn(session, *args)
+    dialect_name = session.get_bind().dialect.name
+    delays = policy.delays()
+    while True:
+        try:
+            return fn(session, *args)
+        except DBAPIError as exc:
+            if not is_retryable(exc, dialect_name):
+                raise
+            session.rollback()
+            delay = next(delays, None)
+            if delay is None:
+                raise _exhausted(endpoint) from exc
+            RETRIES.inc(endpoint=endpoint)
+            sleep(delay)
+
+
+async def run_with_retries_async(
+    session,
+    endpoint: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    policy: RetryPolicy = default_policy,
+) -> Any:
+    """``run_with_retries`` for an AsyncSession; backoff sleeps without blocking the loop."""
+    if session.in_transaction():
+        return await session.run_sync(fn, *args)
+    dialect_name = session.bind.dialect.name
+    delays = policy.delays()
+    while True:
+        try:
+            return await session.run_sync(fn, *args)
+        except DBAPIError as exc:
+            if not is_retryable(exc, dialect_name):
+                raise
+            await session.rollback()
+            delay = next(delays, None)
+            if delay is None:
+                raise _exhausted(endpoint) from exc
+            RETRIES.inc(endpoint=endpoint)
+            await asyncio.sleep(delay)
@@ -0,0 +1,106 @@
+"""Route read-only sessions to replica engines.
+
+``RoutingSessionMaker`` hands out writer-bound sessions by default; ``read_only=True``
+binds the session to the next healthy reader in round-robin order instead, and falls back
+to the writer when no reader is configured or every reader is down. A session sticks to
+the engine it was opened on, so one request never mixes two replicas' snapshots.
+
+Readers are health-checked lazily with ``SELECT 1`` at most once per interval, when the
+rotation reaches them, and a disconnect seen on a reader marks it down until its next
+check. Replicas lag the writer, so read-only sessions are only for reads that tolerate
+slightly stale data; anything that must see its own writes or takes row locks stays on
+the writer.
+"""
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+REPLICA_UP = registry.gauge(
+    "db_replica_up", "1 if the reader passed its last health check.", ("reader",)
+)
+READ_FALLBACKS = registry.counter(
+    "db_read_fallbacks_total", "Read-only sessions sent to the writer because no reader was up."
+)
+
+
+class ReaderPool:
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        health_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.engines = list(engines)
+        self.health_interval = health_interval
+        self._clock = clock
+        self._up: List[bool] = [True] * len(self.engines)
+        self._next_check: List[float] = [float("-inf")] * len(self.engines)
+        self._next = 0
+        self._lock = threading.Lock()
+        for index, engine in enumerate(self.engines):
+            event.listen(engine, "handle_error", self._on_error(index))
+
+    def _on_error(self, index: int):
+        def _handle_error(context) -> None:
+            if context.is_disconnect:
+                self._mark(index, False)
+
+        return _handle_error
+
+    def _mark(self, index: int, up: bool) -> None:
+        with self._lock:
+            if self._up[index] and not up:
+                logger.warning("Read replica %s marked down", index)
+            self._up[index] = up
+            self._next_check[index] = self._clock() + self.health_interval
+        REPLICA_UP.set(1 if up else 0, reader=str(index))
+
+    def _healthy(self, index: int) -> bool:
+        with self._lock:
+            if self._clock() < self._next_check[index]:
+                return self._up[index]
+            # Claim the check so concurrent pickers use the previous state meanwhile.
+            self._next_check[index] = self._clock() + self.health_interval
+        try:
+            with self.engines[index].connect() as conn:
+                conn.exec_driver_sql("SELECT 1")
+        except Exception:
+            self._mark(index, False)
+            return False
+        self._mark(index, True)
+        return True
+
+    def pick(self) -> Optional[Engine]:
+        """The next healthy reader, or None when there is none."""
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = self._next % len(self.engines)
+                self._next += 1
+            if self._healthy(index):
+                return self.engines[index]
+        if self.engines:
+            READ_FALLBACKS.inc()
+        return None
+
+
+class RoutingSessionMaker:
+    def __init__(self, writer: Engine, readers: ReaderPool, **session_kw):
+        self.writer = writer
+        self.readers = readers
+        self._factory = sessionmaker(bind=writer, **session_kw)
+
+    def __call__(self, read_only: bool = False) -> Session:
+        if read_only:
+            reader = self.readers.pick()
+            if reader is not None:
+                return self._factory(bind=reader)
+        return self._factory()
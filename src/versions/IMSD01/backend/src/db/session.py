@@ -1,11 +1,36 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 from src.config.settings import settings
+from src.db.pool_metrics import instrumented_pool_class, register_pool_gauges
+from src.db.routing import ReaderPool, RoutingSessionMaker
 
 
-engine = create_engine(settings.database_url, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+def _create_engine(url: str, pool_name: str):
+    created = create_engine(
+        url,
+        future=True,
+        poolclass=instrumented_pool_class(pool_name),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=True,
+    )
+    register_pool_gauges(created, pool_name)
+    return created
+
+
+engine = _create_engine(settings.database_url, "primary")
+readers = ReaderPool(
+    [
+        _create_engine(url, f"reader{index}")
+        for index, url in enumerate(settings.database_reader_urls)
+    ],
+    settings.replica_health_interval,
+)
+SessionLocal = RoutingSessionMaker(
+    engine, readers, autoflush=False, autocommit=False, future=True
+)
 
 
 def get_session():
@@ -14,3 +39,12 @@ def get_session():
         yield db
     finally:
         db.close()
+
+
+def get_read_session():
+    """Session on a read replica (or the writer if none is up) for read-only endpoints."""
+    db = SessionLocal(read_only=True)
+    try:
+        yield db
+    finally:
+        db.close()
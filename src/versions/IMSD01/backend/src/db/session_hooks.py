@@ -0,0 +1,79 @@
+from typing import Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+_CALLBACKS = "after_commit_callbacks"
+_ROLLBACK_CALLBACKS = "after_rollback_callbacks"
+_COMMITTED = "after_commit_committed"
+
+
+def _current(session: Session) -> SessionTransaction:
+    return session.get_nested_transaction() or session.get_transaction()
+
+
+def after_commit(session: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's outermost transaction commits.
+
+    Outside a transaction there is nothing left to wait for, so it runs immediately.
+    Callbacks registered inside a savepoint move to the enclosing transaction when the
+    savepoint is released and are dropped if it rolls back; rolling back a savepoint
+    leaves callbacks registered outside it alone.
+    """
+    if not session.in_transaction():
+        callback()
+        return
+    session.info.setdefault(_CALLBACKS, {}).setdefault(_current(session), []).append(callback)
+
+
+def after_rollback(session: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` if the work done so far in the current transaction is rolled back.
+
+    The mirror of ``after_commit``: a released savepoint hands its callbacks to the
+    enclosing transaction, and they are dropped once the outermost transaction commits.
+    Outside a transaction the work is already committed, so nothing is registered.
+    """
+    if not session.in_transaction():
+        return
+    pending = session.info.setdefault(_ROLLBACK_CALLBACKS, {})
+    pending.setdefault(_current(session), []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session: Session) -> None:
+    # Fires for savepoint releases too, while the committing transaction is still current.
+    session.info.setdefault(_COMMITTED, set()).add(_current(session))
+
+
+def _pop(session: Session, key: str, transaction: SessionTransaction) -> List[Callable]:
+    pending = session.info.get(key)
+    return (pending.pop(transaction, None) if pending else None) or []
+
+
+def _enclosing(transaction: SessionTransaction) -> Optional[SessionTransaction]:
+    parent = transaction.parent
+    while parent is not None and parent.parent is not None and not parent.nested:
+        parent = parent.parent
+    return parent
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _settle_callbacks(session: Session, transaction: SessionTransaction) -> None:
+    committed = transaction in session.info.get(_COMMITTED, ())
+    if committed:
+        session.info[_COMMITTED].discard(transaction)
+    on_commit = _pop(session, _CALLBACKS, transaction)
+    on_rollback = _pop(session, _ROLLBACK_CALLBACKS, transaction)
+    if not committed:
+        for callback in on_rollback:
+            callback()
+        return
+    parent = _enclosing(transaction)
+    if parent is not None:
+        if on_commit:
+            session.info[_CALLBACKS].setdefault(parent, []).extend(on_commit)
+        if on_rollback:
+            session.info[_ROLLBACK_CALLBACKS].setdefault(parent, []).extend(on_rollback)
+        return
+    for callback in on_commit:
+        callback()
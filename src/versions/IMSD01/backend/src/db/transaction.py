@@ -0,0 +1,13 @@
+from contextlib import contextmanager
+
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def transaction(session: Session):
+    if session.in_transaction():
+        with session.begin_nested():
+            yield
+    else:
+        with session.begin():
+            yield
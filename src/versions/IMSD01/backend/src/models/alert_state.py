@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.base import Base
+
+
+class AlertState(Base):
+    """Latest low-stock alert per product, so alert state reads never scan ``alerts``."""
+
+    __tablename__ = "alert_states"
+
+    product_id: Mapped[str] = mapped_column(String, primary_key=True)
+    last_alert_id: Mapped[str] = mapped_column(String, nullable=False)
+    stock_level: Mapped[int] = mapped_column(Integer, nullable=False)
+    alerted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
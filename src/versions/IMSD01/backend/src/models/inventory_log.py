@@ -1,13 +1,51 @@
-from sqlalchemy import Integer, String
+import enum
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, SmallInteger, String, func
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
 
 from src.db.base import Base
 
 
+class LogOperation(enum.IntEnum):
+    SALE = 1
+    RESTOCK = 2
+    RETURN = 3
+    # Stock events only: sharding was turned on or off; the total is unchanged.
+    RESHARD = 4
+
+
+class OperationCode(TypeDecorator):
+    """Stores an operation name as its small-int ``LogOperation`` code."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        return LogOperation[value].value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return LogOperation(value).name
+
+
 class InventoryLog(Base):
     __tablename__ = "inventory_logs"
+    # On Postgres the table is range-partitioned by month on created_at (see migration 0004).
+    __table_args__ = (
+        Index("ix_inventory_logs_product_id_created_at", "product_id", "created_at"),
+    )
 
-    id: Mapped[str] = mapped_column(String, primary_key=True)
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
     product_id: Mapped[str] = mapped_column(String, nullable=False)
-    operation: Mapped[str] = mapped_column(String, nullable=False)
+    operation: Mapped[str] = mapped_column(OperationCode, nullable=False)
     quantity_delta: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
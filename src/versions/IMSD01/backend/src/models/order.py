@@ -1,4 +1,7 @@
-from sqlalchemy import Integer, String
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db.base import Base
@@ -6,8 +9,23 @@ from src.db.base import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    # Only reservations that can still expire are indexed, so the sweeper's range scan
+    # never walks settled orders.
+    __table_args__ = (
+        Index(
+            "ix_orders_reserved_expires_at",
+            "expires_at",
+            postgresql_where=text("status = 'RESERVED'"),
+            sqlite_where=text("status = 'RESERVED'"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     product_id: Mapped[str] = mapped_column(String, nullable=False)
+    sku: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     requested_qty: Mapped[int] = mapped_column(Integer, nullable=False)
     status: Mapped[str] = mapped_column(String, nullable=False)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
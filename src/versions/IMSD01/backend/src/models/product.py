@@ -11,3 +11,7 @@ class Product(Base):
     sku: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     available_qty: Mapped[int] = mapped_column(Integer, nullable=False)
     low_stock_threshold: Mapped[int] = mapped_column(Integer, nullable=False)
+    # 0 means stock lives in available_qty; N > 0 means it is split across N shard rows.
+    stock_shards: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.base import Base
+
+
+class ProductStockShard(Base):
+    __tablename__ = "product_stock_shards"
+
+    product_id: Mapped[str] = mapped_column(String, primary_key=True)
+    shard_no: Mapped[int] = mapped_column(Integer, primary_key=True)
+    available_qty: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.base import Base
+from src.models.inventory_log import OperationCode
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class StockEvent(Base):
+    """Outbox row for a stock change, deleted once the relay has published it."""
+
+    __tablename__ = "stock_events"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    product_id: Mapped[str] = mapped_column(String, nullable=False)
+    sku: Mapped[str] = mapped_column(String, nullable=False)
+    operation: Mapped[str] = mapped_column(OperationCode, nullable=False)
+    quantity_delta: Mapped[int] = mapped_column(Integer, nullable=False)
+    available_qty: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Set by the app rather than the database so relay lag is measured on one clock.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=_now
+    )
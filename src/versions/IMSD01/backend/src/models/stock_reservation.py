@@ -0,0 +1,15 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.base import Base
+
+
+class StockReservation(Base):
+    """A stock movement accepted by the reservation cache but not yet applied to products."""
+
+    __tablename__ = "stock_reservations"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    product_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    operation: Mapped[str] = mapped_column(String, nullable=False)
+    quantity_delta: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.base import Base
+
+
+class StockSnapshot(Base):
+    """Stock of a product as of (and including) inventory log ``last_log_id``."""
+
+    __tablename__ = "stock_snapshots"
+
+    product_id: Mapped[str] = mapped_column(String, primary_key=True)
+    last_log_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    available_qty: Mapped[int] = mapped_column(Integer, nullable=False)
+    taken_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -0,0 +1,92 @@
+"""Opt-in sampling profiler that writes flamegraph-ready collapsed stacks.
+
+Every ``interval`` seconds a background thread reads ``sys._current_frames()`` and counts
+each thread's Python stack, outermost frame first. ``write`` emits one
+``frame;frame;frame count`` line per distinct stack (the format ``flamegraph.pl`` and
+speedscope read). Nothing runs on the request path; the cost is one stack walk per thread
+per sample. Threads parked in a wait (idle pool workers, the event loop's ``select``)
+are skipped unless ``include_idle`` is set, so samples show where requests spend time.
+"""
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+}
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, output: str = "profile.folded"):
+        self.interval = interval
+        self.output = Path(output)
+        self.include_idle = False
+        self._stacks: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+            if leaf in IDLE_LEAVES and not self.include_idle:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_label(frame))
+                frame = frame.f_back
+            stacks.append(";".join(reversed(labels)))
+        with self._lock:
+            self._stacks.update(stacks)
+
+    def collapsed(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._stacks.items())
+        return [f"{stack} {count}" for stack, count in items]
+
+    def write(self, path: Optional[Path] = None) -> Path:
+        path = path or self.output
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text("\n".join(self.collapsed()) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        logger.info("Wrote %s profile samples to %s", sum(self._stacks.values()), self.write())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+profiler = SamplingProfiler(settings.profiler_interval, settings.profiler_output)
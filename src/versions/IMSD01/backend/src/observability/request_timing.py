@@ -0,0 +1,139 @@
+"""Per-request latency and database time.
+
+``TimingMiddleware`` opens a ``RequestStats`` for every HTTP request in a context
+variable. The cursor hooks below add each statement's duration to whatever request is
+current, which also works for sync endpoints because the threadpool they run in copies
+the context (and with it the same stats object). At the end of the request the totals go
+to per-route histograms and a ``Server-Timing`` header, so a slow checkout shows at a
+glance whether the time went to the database or to the app itself.
+
+Statements slower than ``slow_query_ms`` are logged with their route, whether or not
+they ran inside a request.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config.settings import settings
+from src.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ("method", "route", "status"),
+)
+REQUEST_DB_SECONDS = registry.histogram(
+    "http_request_db_seconds",
+    "Time a request spent executing SQL statements.",
+    ("route",),
+)
+REQUEST_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    ("route",),
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 32, 64),
+)
+SLOW_QUERIES = registry.counter(
+    "db_slow_queries_total", "Statements slower than the slow-query threshold.", ("route",)
+)
+
+SLOW_STATEMENT_CHARS = 500
+
+
+@dataclass
+class RequestStats:
+    scope: dict
+    queries: int = 0
+    db_seconds: float = 0.0
+
+    @property
+    def route(self) -> str:
+        """Route template such as ``/stock/{product_id}``; unmatched paths share one label."""
+        template = getattr(self.scope.get("route"), "path", None)
+        if template is None:
+            return "unmatched"
+        # Depending on the FastAPI version the matched route's path may or may not carry
+        # the include_router prefix; take the prefix segments from the concrete path.
+        path = self.scope["path"]
+        keep = path.count("/") - template.count("/") + 1
+        return "/".join(path.split("/")[:keep]) + template
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._timing_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._timing_started
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if elapsed * 1000 >= settings.slow_query_ms:
+        route = stats.route if stats is not None else "-"
+        SLOW_QUERIES.inc(route=route)
+        logger.warning(
+            "Slow query %.1f ms route=%s executemany=%s: %s",
+            elapsed * 1000,
+            route,
+            executemany,
+            statement[:SLOW_STATEMENT_CHARS],
+        )
+
+
+class TimingMiddleware:
+    """ASGI middleware; cheaper than ``BaseHTTPMiddleware`` on the hot path."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                timing = (
+                    f"app;dur={elapsed_ms - stats.db_seconds * 1000:.1f}, "
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+                headers = [*message.get("headers", ()), (b"server-timing", timing.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            current_request.reset(token)
+            route = stats.route
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route,
+                status=str(status),
+            )
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, route=route)
+            REQUEST_QUERIES.observe(stats.queries, route=route)
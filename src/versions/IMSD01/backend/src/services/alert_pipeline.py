@@ -0,0 +1,114 @@
+"""Asynchronous, debounced low-stock alerts.
+
+Purchases hand low-stock levels to ``enqueue_after_commit`` instead of inserting an
+``Alert`` in their own transaction; the event is only queued once that transaction
+commits. A background worker drains the queue, keeps the lowest level seen per product,
+drops products already alerted within the dedup window and bulk-inserts the rest.
+
+Queued events live in process memory, so a crash loses at most the alerts of the last
+flush interval; stock itself is unaffected.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.db.session_hooks import after_commit
+from src.db.transaction import transaction
+from src.services.alert_service import create_low_stock_alerts
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+class AlertPipeline:
+    def __init__(self, window: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self._clock = clock
+        self._events: "queue.SimpleQueue[Tuple[str, int]]" = queue.SimpleQueue()
+        self._last_alerted: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def enqueue(self, product_id: str, stock_level: int) -> None:
+        self._events.put((product_id, stock_level))
+
+    def enqueue_after_commit(self, session: Session, levels: Sequence[Tuple[str, int]]) -> None:
+        def _enqueue():
+            for product_id, stock_level in levels:
+                self.enqueue(product_id, stock_level)
+
+        after_commit(session, _enqueue)
+
+    def _take(self, batch_size: int) -> List[Tuple[str, int]]:
+        events = []
+        while len(events) < batch_size:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def drain(self, session: Session, batch_size: int = BATCH_SIZE) -> List[str]:
+        """Write alerts for queued events; returns the ids of the alerts created."""
+        created = []
+        while True:
+            events = self._take(batch_size)
+            if not events:
+                return created
+
+            lowest: Dict[str, int] = {}
+            for product_id, stock_level in events:
+                lowest[product_id] = min(stock_level, lowest.get(product_id, stock_level))
+            now = self._clock()
+            due = [
+                (product_id, stock_level)
+                for product_id, stock_level in lowest.items()
+                if now - self._last_alerted.get(product_id, float("-inf")) >= self.window
+            ]
+            if due:
+                with transaction(session):
+                    created.extend(create_low_stock_alerts(session, due))
+                for product_id, _ in due:
+                    self._last_alerted[product_id] = now
+
+            self._last_alerted = {
+                product_id: alerted_at
+                for product_id, alerted_at in self._last_alerted.items()
+                if now - alerted_at < self.window
+            }
+
+    def start(self, session_factory: Callable[[], Session], interval: float) -> None:
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run,
+            args=(session_factory, interval),
+            name="alert-pipeline",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._stop.set()
+        self._worker.join()
+        self._worker = None
+
+    def _run(self, session_factory: Callable[[], Session], interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                with session_factory() as session:
+                    self.drain(session)
+            except Exception:
+                logger.exception("Low-stock alert flush failed")
+        with session_factory() as session:
+            self.drain(session)
+
+
+alert_pipeline = AlertPipeline(settings.alert_dedup_window)
@@ -1,16 +1,96 @@
-from uuid import uuid4
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from src.db.ids import new_id
+from src.db.session_hooks import after_commit
 from src.models.alert import Alert
+from src.models.alert_state import AlertState
+
+logger = logging.getLogger(__name__)
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _record_states(session: Session, rows: Sequence[Dict]) -> None:
+    # One state row per product; the last alert in the batch wins.
+    states = {
+        row["product_id"]: {
+            "product_id": row["product_id"],
+            "last_alert_id": row["id"],
+            "stock_level": row["stock_level"],
+        }
+        for row in rows
+    }
+    upsert = _UPSERTS.get(session.get_bind().dialect.name)
+    if upsert is None:
+        session.execute(delete(AlertState).where(AlertState.product_id.in_(list(states))))
+        session.execute(insert(AlertState), list(states.values()))
+        return
+    stmt = upsert(AlertState)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AlertState.product_id],
+        set_={
+            "last_alert_id": stmt.excluded.last_alert_id,
+            "stock_level": stmt.excluded.stock_level,
+            "alerted_at": func.now(),
+        },
+    )
+    session.execute(stmt, list(states.values()))
+
+
+def _record_states_after_commit(session: Session, rows: Sequence[Dict]) -> None:
+    # The state row is one hot row per product; upserting it inside checkout would hold a
+    # second row lock until the sale commits, so it gets its own short transaction after.
+    bind = session.get_bind()
+
+    def _record() -> None:
+        try:
+            with Session(bind=bind) as state_session, state_session.begin():
+                _record_states(state_session, rows)
+        except Exception:
+            logger.exception("Recording low-stock alert state failed")
+
+    after_commit(session, _record)
 
 
 def create_low_stock_alert(session: Session, product_id: str, stock_level: int) -> Alert:
     alert = Alert(
-        id=str(uuid4()),
+        id=new_id(),
         product_id=product_id,
         trigger_type="LOW_STOCK",
         stock_level=stock_level,
     )
     session.add(alert)
+    _record_states_after_commit(
+        session, [{"id": alert.id, "product_id": product_id, "stock_level": stock_level}]
+    )
     return alert
+
+
+def create_low_stock_alerts(
+    session: Session, levels: Sequence[Tuple[str, int]]
+) -> List[str]:
+    rows = [
+        {
+            "id": new_id(),
+            "product_id": product_id,
+            "trigger_type": "LOW_STOCK",
+            "stock_level": stock_level,
+        }
+        for product_id, stock_level in levels
+    ]
+    if rows:
+        session.execute(insert(Alert), rows)
+        _record_states_after_commit(session, rows)
+    return [row["id"] for row in rows]
+
+
+def alert_states(session: Session, product_id: Optional[str] = None) -> List[AlertState]:
+    stmt = select(AlertState).order_by(AlertState.product_id)
+    if product_id is not None:
+        stmt = stmt.where(AlertState.product_id == product_id)
+    return list(session.execute(stmt).scalars())
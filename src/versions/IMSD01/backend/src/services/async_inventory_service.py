@@ -0,0 +1,72 @@
+from typing import Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import settings
+from src.db.retry import run_with_retries_async
+from src.services import inventory_service, order_reservations
+from src.services.inventory_service import PurchaseLine
+from src.services.reservation_cache import reservation_cache
+
+stock = reservation_cache if settings.reservation_cache_enabled else inventory_service
+
+
+# The sync service runs on the AsyncSession's greenlet, so every statement is awaited
+# on the event loop instead of blocking a threadpool worker.
+
+
+async def purchase(
+    session: AsyncSession,
+    product_id: str,
+    sku: str,
+    quantity: int,
+    order_id: Optional[str] = None,
+):
+    return await run_with_retries_async(
+        session, "purchase", stock.purchase, product_id, sku, quantity, order_id
+    )
+
+
+async def purchase_many(
+    session: AsyncSession, lines: Sequence[PurchaseLine], order_id: Optional[str] = None
+):
+    return await run_with_retries_async(
+        session, "purchase_batch", stock.purchase_many, lines, order_id
+    )
+
+
+async def restore(
+    session: AsyncSession,
+    product_id: str,
+    sku: str,
+    quantity: int,
+    reason: str,
+    order_id: Optional[str] = None,
+):
+    return await run_with_retries_async(
+        session, "cancel", stock.restore, product_id, sku, quantity, reason, order_id
+    )
+
+
+async def reserve(
+    session: AsyncSession,
+    order_id: str,
+    product_id: str,
+    sku: str,
+    quantity: int,
+    ttl_seconds: Optional[float] = None,
+):
+    return await run_with_retries_async(
+        session,
+        "reserve",
+        order_reservations.reserve,
+        order_id,
+        product_id,
+        sku,
+        quantity,
+        ttl_seconds,
+    )
+
+
+async def confirm(session: AsyncSession, order_id: str):
+    return await run_with_retries_async(session, "confirm", order_reservations.confirm, order_id)
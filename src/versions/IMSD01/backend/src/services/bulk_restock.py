@@ -0,0 +1,232 @@
+"""Bulk restock from a warehouse feed.
+
+Feed rows (``sku,quantity`` CSV with a header, or NDJSON objects with the same keys) are
+streamed into a temporary staging table on the import's own connection, with
+``COPY ... FROM STDIN`` on Postgres and chunked executemany elsewhere, so the feed is never
+held in memory. The staged quantities are then summed per SKU and applied in the same
+transaction with a few set-based statements: the affected products are locked in id order
+(the order purchases lock them in), their deltas are added with one ``UPDATE ... FROM``,
+and one ``RESTOCK`` log row (and, with the outbox on, one stock event) per product is
+written with ``INSERT ... SELECT``.
+
+A feed is applied all or nothing. SKUs that are not in ``products`` are skipped and
+reported instead of failing the import.
+"""
+import csv
+import json
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from src.api.errors import ValidationError
+from src.config.settings import settings
+from src.db.transaction import transaction
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+from src.models.stock_event import StockEvent
+from src.services import outbox, sharded_stock
+from src.services.reservation_cache import reservation_cache
+from src.services.stock_cache import stock_cache
+
+CHUNK_SIZE = 10000
+UNKNOWN_SAMPLE_SIZE = 100
+FORMATS = ("csv", "ndjson")
+
+Progress = Callable[[str, int], None]
+
+STAGING = Table(
+    "restock_staging",
+    MetaData(),
+    Column("sku", String, nullable=False),
+    Column("quantity", Integer, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
+
+class RestockSummary(NamedTuple):
+    rows: int
+    products: int
+    units: int
+    unknown: int
+    unknown_skus: List[str]
+
+
+def format_for(name: str) -> str:
+    """Feed format for a file name or content type."""
+    name = name.lower()
+    if "csv" in name:
+        return "csv"
+    if "json" in name:
+        return "ndjson"
+    raise ValidationError(f"Unsupported feed format: {name or 'unknown'}")
+
+
+def read_feed(lines: Iterable[str], fmt: str) -> Iterator[Tuple[str, int]]:
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        records = ((reader.line_num, record) for record in reader)
+    elif fmt == "ndjson":
+        records = ((line_no, line) for line_no, line in enumerate(lines, 1) if line.strip())
+    else:
+        raise ValidationError(f"Unsupported feed format: {fmt}")
+
+    for line_no, record in records:
+        try:
+            if fmt == "ndjson":
+                record = json.loads(record)
+            sku = str(record["sku"]).strip()
+            quantity = int(record["quantity"])
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError(f"Line {line_no}: expected a sku and an integer quantity")
+        if not sku:
+            raise ValidationError(f"Line {line_no}: sku is required")
+        if quantity <= 0:
+            raise ValidationError(f"Line {line_no}: quantity must be greater than zero")
+        yield sku, quantity
+
+
+def _stage(
+    conn: Connection, rows: Iterable[Tuple[str, int]], progress: Optional[Progress], chunk_size: int
+) -> int:
+    staged = 0
+    if conn.dialect.name == "postgresql":
+        with conn.connection.driver_connection.cursor() as cursor, cursor.copy(
+            f"COPY {STAGING.name} (sku, quantity) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                copy.write_row(row)
+                staged += 1
+                if progress is not None and staged % chunk_size == 0:
+                    progress("staged", staged)
+        # Temp tables are never auto-analyzed; without stats the planner guesses the join.
+        conn.exec_driver_sql(f"ANALYZE {STAGING.name}")
+    else:
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            conn.execute(
+                insert(STAGING), [{"sku": sku, "quantity": quantity} for sku, quantity in chunk]
+            )
+            staged += len(chunk)
+            if progress is not None and len(chunk) == chunk_size:
+                progress("staged", staged)
+    if progress is not None and staged % chunk_size:
+        progress("staged", staged)
+    return staged
+
+
+def _apply(session: Session, staged: int) -> RestockSummary:
+    products = Product.__table__
+    deltas = (
+        select(STAGING.c.sku, func.sum(STAGING.c.quantity).label("quantity"))
+        .group_by(STAGING.c.sku)
+        .subquery()
+    )
+    matched = session.execute(
+        select(products.c.id, products.c.sku, products.c.stock_shards, deltas.c.quantity)
+        .join(deltas, deltas.c.sku == products.c.sku)
+        .order_by(products.c.id)
+        .with_for_update(of=products)
+    ).all()
+
+    session.execute(
+        update(products)
+        .where(products.c.sku == deltas.c.sku, products.c.stock_shards == 0)
+        .values(available_qty=products.c.available_qty + deltas.c.quantity)
+    )
+    outbox.record_from_select(
+        session,
+        select(
+            products.c.id,
+            products.c.sku,
+            literal("RESTOCK", StockEvent.__table__.c.operation.type),
+            deltas.c.quantity,
+            products.c.available_qty,
+        )
+        .join(deltas, deltas.c.sku == products.c.sku)
+        .where(products.c.stock_shards == 0),
+    )
+    sharded_events = []
+    for row in matched:
+        if row.stock_shards:
+            remaining = sharded_stock.increment(session, row.id, row.quantity, row.stock_shards)
+            sharded_events.append(
+                {
+                    "product_id": row.id,
+                    "sku": row.sku,
+                    "operation": "RESTOCK",
+                    "quantity_delta": row.quantity,
+                    "available_qty": remaining,
+                }
+            )
+    outbox.record(session, sharded_events)
+    session.execute(
+        insert(InventoryLog).from_select(
+            ["product_id", "operation", "quantity_delta"],
+            select(
+                products.c.id,
+                literal("RESTOCK", InventoryLog.__table__.c.operation.type),
+                deltas.c.quantity,
+            ).join(deltas, deltas.c.sku == products.c.sku),
+        )
+    )
+
+    unknown = select(deltas.c.sku).outerjoin(products, products.c.sku == deltas.c.sku).where(
+        products.c.id.is_(None)
+    )
+    unknown_count = session.execute(
+        select(func.count()).select_from(unknown.subquery())
+    ).scalar_one()
+    unknown_skus = list(
+        session.execute(unknown.order_by(deltas.c.sku).limit(UNKNOWN_SAMPLE_SIZE)).scalars()
+    )
+
+    stock_cache.invalidate_after_commit(session, [row.id for row in matched])
+    if settings.reservation_cache_enabled:
+        reservation_cache.restocked(session, [(row.id, row.quantity) for row in matched])
+    return RestockSummary(
+        rows=staged,
+        products=len(matched),
+        units=sum(row.quantity for row in matched),
+        unknown=unknown_count,
+        unknown_skus=unknown_skus,
+    )
+
+
+def restock(
+    session: Session,
+    rows: Iterable[Tuple[str, int]],
+    progress: Optional[Progress] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> RestockSummary:
+    """Add ``(sku, quantity)`` rows to stock in one transaction.
+
+    ``progress`` is called with ``("staged", rows_so_far)`` every ``chunk_size`` rows and
+    with ``("applied", products)`` once the deltas are written.
+    """
+    with transaction(session):
+        conn = session.connection()
+        STAGING.drop(conn, checkfirst=True)
+        STAGING.create(conn)
+        staged = _stage(conn, rows, progress, chunk_size)
+        summary = _apply(session, staged)
+        STAGING.drop(conn)
+    if progress is not None:
+        progress("applied", summary.products)
+    return summary
@@ -0,0 +1,159 @@
+"""Replay protection for stock operations keyed on ``(order_id, operation)``.
+
+The key row is inserted in the same transaction as the stock change, so the primary key
+on ``idempotency_keys`` decides races: a concurrent duplicate blocks on the key until the
+first request commits, fails with an IntegrityError, rolls its stock change back and
+replays the stored result. Replays that arrive later are answered from the key row
+without touching ``products``.
+
+Each key also stores a hash of the request it answered (products, quantities, reason).
+Reusing an order id for a different request raises ``IdempotencyConflictError`` instead
+of replaying a result that does not belong to it.
+
+Recently committed results are kept in a per-process LRU so retries of recent orders
+skip the key lookup entirely; the table stays the source of truth across processes.
+Keys older than the retention period are deleted by ``prune``
+(``python -m src.cli.prune_idempotency``).
+"""
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from src.api.errors import IdempotencyConflictError
+from src.config.settings import settings
+from src.db.session_hooks import after_commit
+from src.models.idempotency_key import IdempotencyKey
+
+PURCHASE = "PURCHASE"
+PURCHASE_BATCH = "PURCHASE_BATCH"
+CANCEL = "CANCEL"
+
+PRUNE_BATCH_SIZE = 1000
+
+
+def request_hash(request: Any) -> str:
+    """Stable hash of a JSON-serializable description of a request."""
+    encoded = json.dumps(request, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class IdempotencyKeys:
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._recent: "OrderedDict[Tuple[str, str], Tuple[Optional[str], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: Tuple[str, str], fingerprint: Optional[str], result: Any) -> None:
+        with self._lock:
+            self._recent[key] = (fingerprint, result)
+            self._recent.move_to_end(key)
+            while len(self._recent) > self.capacity:
+                self._recent.popitem(last=False)
+
+    @staticmethod
+    def _check(key: Tuple[str, str], stored: Optional[str], fingerprint: str) -> None:
+        # Keys written before request hashes were stored have none and are trusted.
+        if stored is not None and stored != fingerprint:
+            order_id, operation = key
+            raise IdempotencyConflictError(
+                f"order_id {order_id} was already used for a different "
+                f"{operation.lower().replace('_', ' ')} request"
+            )
+
+    def replay(
+        self, session: Session, order_id: Optional[str], operation: str, request: Any
+    ) -> Optional[Any]:
+        """Return the stored result for a repeated request, or None for a new one.
+
+        Raises ``IdempotencyConflictError`` if ``order_id`` already answered a different
+        ``request`` for this operation.
+        """
+        if order_id is None:
+            return None
+        key = (order_id, operation)
+        fingerprint = request_hash(request)
+        with self._lock:
+            entry = self._recent.get(key)
+            if entry is not None:
+                self._recent.move_to_end(key)
+        if entry is not None:
+            self._check(key, entry[0], fingerprint)
+            return copy.deepcopy(entry[1])
+        row = session.execute(
+            select(IdempotencyKey.request_hash, IdempotencyKey.result).where(
+                IdempotencyKey.order_id == order_id,
+                IdempotencyKey.operation == operation,
+            )
+        ).one_or_none()
+        if row is not None:
+            self._check(key, row.request_hash, fingerprint)
+            self._remember(key, row.request_hash, row.result)
+            return copy.deepcopy(row.result)
+        return None
+
+    def record(
+        self,
+        session: Session,
+        order_id: Optional[str],
+        operation: str,
+        request: Any,
+        result: Any,
+    ) -> None:
+        """Store ``result`` in the caller's transaction; a duplicate raises IntegrityError."""
+        if order_id is None:
+            return
+        fingerprint = request_hash(request)
+        session.execute(
+            insert(IdempotencyKey),
+            {
+                "order_id": order_id,
+                "operation": operation,
+                "request_hash": fingerprint,
+                "result": result,
+            },
+        )
+        stored = copy.deepcopy(result)
+        after_commit(session, lambda: self._remember((order_id, operation), fingerprint, stored))
+
+    def prune(
+        self,
+        session: Session,
+        older_than: timedelta,
+        batch_size: int = PRUNE_BATCH_SIZE,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Delete keys created before ``now - older_than``; returns how many were deleted.
+
+        Each batch is its own short transaction, so pruning a large backlog never holds
+        locks on many keys at once.
+        """
+        cutoff = (now or datetime.now(timezone.utc)) - older_than
+        key = tuple_(IdempotencyKey.order_id, IdempotencyKey.operation)
+        deleted = 0
+        while True:
+            with session.begin():
+                expired = (
+                    select(IdempotencyKey.order_id, IdempotencyKey.operation)
+                    .where(IdempotencyKey.created_at < cutoff)
+                    .limit(batch_size)
+                )
+                count = session.execute(
+                    delete(IdempotencyKey).where(key.in_(expired))
+                ).rowcount
+            deleted += count
+            if count < batch_size:
+                return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+
+
+idempotency_keys = IdempotencyKeys(settings.idempotency_cache_size)
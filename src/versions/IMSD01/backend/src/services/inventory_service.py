@@ -1,109 +1,347 @@
-from contextlib import contextmanager
-from uuid import uuid4
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-from sqlalchemy import select, update
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from src.api.errors import InsufficientStockError, ValidationError
+from src.config.settings import settings
+from src.db.transaction import transaction
 from src.models.inventory_log import InventoryLog
 from src.models.product import Product
-from src.services.alert_service import create_low_stock_alert
+from src.services import outbox, sharded_stock
+from src.services.alert_pipeline import alert_pipeline
+from src.services.alert_service import create_low_stock_alert, create_low_stock_alerts
+from src.services.idempotency import CANCEL, PURCHASE, PURCHASE_BATCH, idempotency_keys
+from src.services.stock_cache import stock_cache
 
+PurchaseLine = Tuple[str, str, int]
 
-@contextmanager
-def _transaction(session: Session):
-    if session.in_transaction():
-        with session.begin_nested():
-            yield
-    else:
-        with session.begin():
-            yield
+RESTORE_OPERATIONS = {"cancelled": "RESTOCK", "expired": "RETURN"}
 
 
-def purchase(session: Session, product_id: str, sku: str, quantity: int):
-    if quantity <= 0:
-        raise ValidationError("Quantity must be greater than zero")
+class StockLevel(NamedTuple):
+    id: str
+    sku: str
+    available_qty: int
+    low_stock_threshold: int
 
-    with _transaction(session):
-        product = session.execute(
-            select(Product).where(Product.id == product_id, Product.sku == sku)
-        ).scalar_one_or_none()
-        if product is None:
-            raise ValidationError("Product not found")
-
-        result = session.execute(
-            update(Product)
-            .where(
-                Product.id == product_id,
-                Product.sku == sku,
-                Product.available_qty >= quantity,
-            )
-            .values(available_qty=Product.available_qty - quantity)
+
+def _supports_returning(session: Session) -> bool:
+    return session.get_bind().dialect.update_returning
+
+
+def _decrement_returning(session: Session, product_id: str, sku: str, quantity: int):
+    row = session.execute(
+        update(Product)
+        .where(
+            Product.id == product_id,
+            Product.sku == sku,
+            Product.available_qty >= quantity,
+        )
+        .values(available_qty=Product.available_qty - quantity)
+        .returning(
+            Product.id,
+            Product.sku,
+            Product.available_qty,
+            Product.low_stock_threshold,
+        )
+    ).one_or_none()
+    if row is not None:
+        return row
+
+    # Only the failure path pays for a second statement to tell the outcomes apart.
+    product = session.execute(
+        select(
+            Product.available_qty,
+            Product.low_stock_threshold,
+            Product.stock_shards,
+        ).where(Product.id == product_id, Product.sku == sku)
+    ).one_or_none()
+    if product is None:
+        raise ValidationError("Product not found")
+    if product.stock_shards:
+        remaining = sharded_stock.decrement(session, product_id, quantity, product.stock_shards)
+        return StockLevel(product_id, sku, remaining, product.low_stock_threshold)
+    raise InsufficientStockError(quantity, product.available_qty)
+
+
+def _decrement_with_readback(session: Session, product_id: str, sku: str, quantity: int):
+    product = session.execute(
+        select(Product).where(Product.id == product_id, Product.sku == sku)
+    ).scalar_one_or_none()
+    if product is None:
+        raise ValidationError("Product not found")
+    if product.stock_shards:
+        remaining = sharded_stock.decrement(session, product_id, quantity, product.stock_shards)
+        return StockLevel(product.id, product.sku, remaining, product.low_stock_threshold)
+
+    result = session.execute(
+        update(Product)
+        .where(
+            Product.id == product_id,
+            Product.sku == sku,
+            Product.available_qty >= quantity,
         )
-        if result.rowcount != 1:
-            raise InsufficientStockError(quantity, product.available_qty)
-
-        session.flush()
-        product = session.execute(
-            select(Product).where(Product.id == product_id, Product.sku == sku)
-        ).scalar_one()
-
-        log = InventoryLog(
-            id=str(uuid4()),
-            product_id=product.id,
-            operation="SALE",
-            quantity_delta=-quantity,
+        .values(available_qty=Product.available_qty - quantity)
+    )
+    if result.rowcount != 1:
+        raise InsufficientStockError(quantity, product.available_qty)
+
+    session.flush()
+    return session.execute(
+        select(Product).where(Product.id == product_id, Product.sku == sku)
+    ).scalar_one()
+
+
+def _decrement(session: Session, product_id: str, sku: str, quantity: int):
+    if _supports_returning(session):
+        return _decrement_returning(session, product_id, sku, quantity)
+    return _decrement_with_readback(session, product_id, sku, quantity)
+
+
+def _increment(session: Session, product_id: str, quantity: int) -> int:
+    # Relative update: FOR UPDATE is a no-op on SQLite, so writing back a value read
+    # earlier could overwrite a concurrent purchase's decrement.
+    stmt = (
+        update(Product)
+        .where(Product.id == product_id)
+        .values(available_qty=Product.available_qty + quantity)
+    )
+    if _supports_returning(session):
+        return session.execute(stmt.returning(Product.available_qty)).scalar_one()
+    session.execute(stmt)
+    return session.execute(
+        select(Product.available_qty).where(Product.id == product_id)
+    ).scalar_one()
+
+
+def _insert_logs(session: Session, rows: Sequence[Dict]) -> List[int]:
+    if session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        return list(
+            session.scalars(
+                insert(InventoryLog).returning(InventoryLog.id, sort_by_parameter_order=True),
+                rows,
+            )
         )
-        session.add(log)
+    logs = [InventoryLog(**row) for row in rows]
+    session.add_all(logs)
+    session.flush()
+    return [log.id for log in logs]
 
-        alert_id = None
-        if product.available_qty <= product.low_stock_threshold:
-            alert = create_low_stock_alert(session, product.id, product.available_qty)
-            alert_id = alert.id
 
-        return {
-            "product_id": product.id,
-            "sku": product.sku,
-            "deducted": quantity,
-            "remaining": product.available_qty,
-            "log_id": log.id,
-            "alert_id": alert_id,
-        }
+def batch_request(lines: Sequence[PurchaseLine]) -> List[List]:
+    """Idempotency fingerprint of a batch; the same lines in any order match."""
+    return sorted([product_id, sku, quantity] for product_id, sku, quantity in lines)
 
 
-def restore(session: Session, product_id: str, sku: str, quantity: int, reason: str):
+def purchase(
+    session: Session, product_id: str, sku: str, quantity: int, order_id: Optional[str] = None
+):
     if quantity <= 0:
         raise ValidationError("Quantity must be greater than zero")
 
-    if reason not in {"cancelled", "expired"}:
+    request = [product_id, sku, quantity]
+    try:
+        with transaction(session):
+            replayed = idempotency_keys.replay(session, order_id, PURCHASE, request)
+            if replayed is not None:
+                return replayed
+
+            product = _decrement(session, product_id, sku, quantity)
+            stock_cache.invalidate_after_commit(session, [product.id])
+
+            log = InventoryLog(product_id=product.id, operation="SALE", quantity_delta=-quantity)
+            session.add(log)
+            session.flush()
+            outbox.record(
+                session,
+                [
+                    {
+                        "product_id": product.id,
+                        "sku": product.sku,
+                        "operation": "SALE",
+                        "quantity_delta": -quantity,
+                        "available_qty": product.available_qty,
+                    }
+                ],
+            )
+
+            alert_id = None
+            low_stock = product.available_qty <= product.low_stock_threshold
+            if low_stock and not settings.alert_pipeline_enabled:
+                alert = create_low_stock_alert(session, product.id, product.available_qty)
+                alert_id = alert.id
+
+            result = {
+                "product_id": product.id,
+                "sku": product.sku,
+                "deducted": quantity,
+                "remaining": product.available_qty,
+                "log_id": str(log.id),
+                "alert_id": alert_id,
+            }
+            idempotency_keys.record(session, order_id, PURCHASE, request, result)
+    except IntegrityError:
+        replayed = idempotency_keys.replay(session, order_id, PURCHASE, request)
+        if replayed is None:
+            raise
+        return replayed
+
+    # after_commit holds the event until the outermost transaction commits, so a
+    # rolled-back savepoint or caller transaction never alerts.
+    if low_stock and settings.alert_pipeline_enabled:
+        alert_pipeline.enqueue_after_commit(session, [(product.id, product.available_qty)])
+    return result
+
+
+def purchase_many(
+    session: Session, lines: Sequence[PurchaseLine], order_id: Optional[str] = None
+):
+    if not lines:
+        raise ValidationError("At least one line is required")
+    if any(quantity <= 0 for _, _, quantity in lines):
+        raise ValidationError("Quantity must be greater than zero")
+
+    # Rows are always locked in (product_id, sku) order so two multi-line orders
+    # touching the same products cannot deadlock each other.
+    lock_order = sorted(range(len(lines)), key=lambda index: lines[index][:2])
+    request = batch_request(lines)
+    results = [None] * len(lines)
+    log_rows = []
+    event_rows = []
+    low_stock = []
+
+    try:
+        with transaction(session):
+            replayed = idempotency_keys.replay(session, order_id, PURCHASE_BATCH, request)
+            if replayed is not None:
+                return replayed
+
+            for index in lock_order:
+                product_id, sku, quantity = lines[index]
+                product = _decrement(session, product_id, sku, quantity)
+                log_rows.append(
+                    {
+                        "product_id": product.id,
+                        "operation": "SALE",
+                        "quantity_delta": -quantity,
+                    }
+                )
+                event_rows.append(
+                    {
+                        "product_id": product.id,
+                        "sku": product.sku,
+                        "operation": "SALE",
+                        "quantity_delta": -quantity,
+                        "available_qty": product.available_qty,
+                    }
+                )
+                if product.available_qty <= product.low_stock_threshold:
+                    low_stock.append((index, product.id, product.available_qty))
+                results[index] = {
+                    "product_id": product.id,
+                    "sku": product.sku,
+                    "deducted": quantity,
+                    "remaining": product.available_qty,
+                    "log_id": None,
+                    "alert_id": None,
+                }
+
+            stock_cache.invalidate_after_commit(session, [line[0] for line in lines])
+            # Log rows are inserted in lock order; pair the generated ids back up the same way.
+            for index, log_id in zip(lock_order, _insert_logs(session, log_rows)):
+                results[index]["log_id"] = str(log_id)
+            outbox.record(session, event_rows)
+            levels = [(product_id, stock_level) for _, product_id, stock_level in low_stock]
+            if not settings.alert_pipeline_enabled:
+                alert_ids = create_low_stock_alerts(session, levels)
+                for (index, _, _), alert_id in zip(low_stock, alert_ids):
+                    results[index]["alert_id"] = alert_id
+            idempotency_keys.record(session, order_id, PURCHASE_BATCH, request, results)
+    except IntegrityError:
+        replayed = idempotency_keys.replay(session, order_id, PURCHASE_BATCH, request)
+        if replayed is None:
+            raise
+        return replayed
+
+    if levels and settings.alert_pipeline_enabled:
+        alert_pipeline.enqueue_after_commit(session, levels)
+    return results
+
+
+def restore_operation(reason: str) -> str:
+    operation = RESTORE_OPERATIONS.get(reason)
+    if operation is None:
         raise ValidationError("Order not cancellable")
+    return operation
 
-    operation = "RESTOCK" if reason == "cancelled" else "RETURN"
 
-    with _transaction(session):
-        stmt = (
-            select(Product)
-            .where(Product.id == product_id, Product.sku == sku)
-            .with_for_update()
-        )
-        product = session.execute(stmt).scalar_one_or_none()
-        if product is None:
-            raise ValidationError("Product not found")
+def restore(
+    session: Session,
+    product_id: str,
+    sku: str,
+    quantity: int,
+    reason: str,
+    order_id: Optional[str] = None,
+):
+    if quantity <= 0:
+        raise ValidationError("Quantity must be greater than zero")
 
-        product.available_qty += quantity
+    operation = restore_operation(reason)
+    request = [product_id, sku, quantity, reason]
 
-        log = InventoryLog(
-            id=str(uuid4()),
-            product_id=product.id,
-            operation=operation,
-            quantity_delta=quantity,
-        )
-        session.add(log)
-
-        return {
-            "product_id": product.id,
-            "sku": product.sku,
-            "restored": quantity,
-            "remaining": product.available_qty,
-            "log_id": log.id,
-        }
+    try:
+        with transaction(session):
+            replayed = idempotency_keys.replay(session, order_id, CANCEL, request)
+            if replayed is not None:
+                return replayed
+
+            stmt = (
+                select(Product.id, Product.sku, Product.stock_shards)
+                .where(Product.id == product_id, Product.sku == sku)
+                .with_for_update()
+            )
+            product = session.execute(stmt).one_or_none()
+            if product is None:
+                raise ValidationError("Product not found")
+
+            if product.stock_shards:
+                remaining = sharded_stock.increment(
+                    session, product.id, quantity, product.stock_shards
+                )
+            else:
+                remaining = _increment(session, product.id, quantity)
+
+            stock_cache.invalidate_after_commit(session, [product.id])
+
+            log = InventoryLog(product_id=product.id, operation=operation, quantity_delta=quantity)
+            session.add(log)
+            session.flush()
+            outbox.record(
+                session,
+                [
+                    {
+                        "product_id": product.id,
+                        "sku": product.sku,
+                        "operation": operation,
+                        "quantity_delta": quantity,
+                        "available_qty": remaining,
+                    }
+                ],
+            )
+
+            result = {
+                "product_id": product.id,
+                "sku": product.sku,
+                "restored": quantity,
+                "remaining": remaining,
+                "log_id": str(log.id),
+            }
+            idempotency_keys.record(session, order_id, CANCEL, request, result)
+    except IntegrityError:
+        replayed = idempotency_keys.replay(session, order_id, CANCEL, request)
+        if replayed is None:
+            raise
+        return replayed
+    return result
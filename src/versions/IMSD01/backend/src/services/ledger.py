@@ -0,0 +1,141 @@
+"""Stock ledger: snapshots of per-product stock and replay of inventory logs since them.
+
+``products.available_qty`` (plus shard counters) stays the live source of truth; the
+ledger makes it auditable. A snapshot records a product's stock together with the id of
+the last log row already reflected in it, so stock can be rebuilt as the snapshot plus the
+sum of ``quantity_delta`` for later log rows.
+
+Log ids are not committed in id order, so snapshots and audits take FOR SHARE locks on the
+product (and shard) rows first. Every writer that logs a movement holds one of those row
+locks until it commits, so once the locks are granted the product's stock and its log
+rows are consistent with each other. Replays are aggregated in the database with one
+GROUP BY per chunk rather than by streaming log rows to Python.
+"""
+from typing import Dict, Iterator, List, NamedTuple, Sequence
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from src.db.transaction import transaction
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+from src.models.product_stock_shard import ProductStockShard
+from src.models.stock_snapshot import StockSnapshot
+from src.services import sharded_stock
+
+CHUNK_SIZE = 1000
+
+
+class Drift(NamedTuple):
+    product_id: str
+    expected: int
+    actual: int
+
+
+def product_id_chunks(session: Session, chunk_size: int = CHUNK_SIZE) -> Iterator[List[str]]:
+    last_id = None
+    while True:
+        stmt = select(Product.id).order_by(Product.id).limit(chunk_size)
+        if last_id is not None:
+            stmt = stmt.where(Product.id > last_id)
+        chunk = list(session.execute(stmt).scalars())
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def _locked_stock(session: Session, product_ids: Sequence[str]) -> Dict[str, int]:
+    products = session.execute(
+        select(Product.id, Product.available_qty, Product.stock_shards)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update(read=True)
+    ).all()
+    sharded = [row.id for row in products if row.stock_shards]
+    shard_totals = {}
+    if sharded:
+        session.execute(
+            select(ProductStockShard.product_id)
+            .where(ProductStockShard.product_id.in_(sharded))
+            .order_by(ProductStockShard.product_id, ProductStockShard.shard_no)
+            .with_for_update(read=True)
+        ).all()
+        shard_totals = sharded_stock.totals_for(session, sharded)
+    return {row.id: row.available_qty + shard_totals.get(row.id, 0) for row in products}
+
+
+def _last_log_ids(session: Session, product_ids: Sequence[str]) -> Dict[str, int]:
+    rows = session.execute(
+        select(InventoryLog.product_id, func.max(InventoryLog.id))
+        .where(InventoryLog.product_id.in_(product_ids))
+        .group_by(InventoryLog.product_id)
+    ).all()
+    return dict(rows)
+
+
+def _replay(session: Session, product_ids: Sequence[str]) -> Dict[str, int]:
+    """Snapshot stock plus the deltas logged after it, for products that have a snapshot."""
+    deltas = (
+        select(
+            InventoryLog.product_id,
+            func.sum(InventoryLog.quantity_delta).label("delta"),
+        )
+        .join(
+            StockSnapshot,
+            and_(
+                StockSnapshot.product_id == InventoryLog.product_id,
+                InventoryLog.id > StockSnapshot.last_log_id,
+            ),
+        )
+        .where(InventoryLog.product_id.in_(product_ids))
+        .group_by(InventoryLog.product_id)
+        .subquery()
+    )
+    rows = session.execute(
+        select(
+            StockSnapshot.product_id,
+            StockSnapshot.available_qty + func.coalesce(deltas.c.delta, 0),
+        )
+        .outerjoin(deltas, deltas.c.product_id == StockSnapshot.product_id)
+        .where(StockSnapshot.product_id.in_(product_ids))
+    ).all()
+    return dict(rows)
+
+
+def take_snapshots(session: Session, product_ids: Sequence[str]) -> int:
+    with transaction(session):
+        stock = _locked_stock(session, product_ids)
+        if not stock:
+            return 0
+        last_log_ids = _last_log_ids(session, list(stock))
+        session.execute(delete(StockSnapshot).where(StockSnapshot.product_id.in_(list(stock))))
+        session.execute(
+            insert(StockSnapshot),
+            [
+                {
+                    "product_id": product_id,
+                    "last_log_id": last_log_ids.get(product_id, 0),
+                    "available_qty": available_qty,
+                }
+                for product_id, available_qty in stock.items()
+            ],
+        )
+        return len(stock)
+
+
+def rebuild_stock(session: Session, product_ids: Sequence[str]) -> Dict[str, int]:
+    with transaction(session):
+        return _replay(session, product_ids)
+
+
+def audit(session: Session, product_ids: Sequence[str]) -> List[Drift]:
+    """Compare live stock with the ledger; products without a snapshot are skipped."""
+    with transaction(session):
+        actual = _locked_stock(session, product_ids)
+        expected = _replay(session, list(actual))
+    return [
+        Drift(product_id, expected[product_id], actual[product_id])
+        for product_id in sorted(expected)
+        if expected[product_id] != actual[product_id]
+    ]
@@ -0,0 +1,135 @@
+"""Move old ``inventory_logs`` rows out of the database into gzip CSV files.
+
+On Postgres whole monthly partitions are archived: each one is detached, streamed out
+with ``COPY`` and dropped. Postgres refuses ``DETACH PARTITION ... CONCURRENTLY`` while
+the table has a default partition, which migration 0004 always creates, so the plain
+form is used then: it briefly takes an ACCESS EXCLUSIVE lock on the parent, and
+``DETACH_LOCK_TIMEOUT`` makes it give up instead of stalling inserts behind a long
+lock wait. Without a default partition the concurrent form is used. Every step is
+idempotent, so an interrupted or timed-out run is finished by running it again.
+
+Other databases have no partitions; rows older than the cutoff are exported and deleted
+in small id-ordered chunks, each in its own short transaction. A crash between writing a
+chunk and committing its delete can repeat those rows in the file; ``id`` is unique, so
+readers can drop the duplicates.
+
+Both paths write ``id,product_id,operation,quantity_delta,created_at`` with the numeric
+operation code, so archives from either source read the same way.
+"""
+import csv
+import gzip
+import logging
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Connection, Engine
+
+from src.db.partitions import (
+    PARENT,
+    LogPartition,
+    detach_partition_sql,
+    has_default_partition,
+    log_partitions,
+)
+from src.models.inventory_log import InventoryLog, LogOperation
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("id", "product_id", "operation", "quantity_delta", "created_at")
+CHUNK_SIZE = 5000
+DETACH_LOCK_TIMEOUT = "5s"
+
+
+def _publish(tmp_path: Path, path: Path) -> None:
+    with open(tmp_path, "rb") as handle:
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def _archive_partition(
+    conn: Connection, partition: LogPartition, output_dir: Path, concurrently: bool
+) -> Path:
+    if partition.detach_pending:
+        conn.exec_driver_sql(f"ALTER TABLE {PARENT} DETACH PARTITION {partition.name} FINALIZE")
+    elif partition.attached:
+        conn.exec_driver_sql(detach_partition_sql(partition.name, concurrently))
+
+    path = output_dir / f"{partition.name}.csv.gz"
+    tmp_path = path.with_suffix(".gz.tmp")
+    columns = ", ".join(COLUMNS)
+    cursor = conn.connection.driver_connection.cursor()
+    with gzip.open(tmp_path, "wb") as out, cursor.copy(
+        f"COPY (SELECT {columns} FROM {partition.name} ORDER BY id) "
+        "TO STDOUT WITH (FORMAT csv, HEADER)"
+    ) as copy:
+        for block in copy:
+            out.write(block)
+    _publish(tmp_path, path)
+
+    conn.exec_driver_sql(f"DROP TABLE {partition.name}")
+    logger.info("Archived partition %s to %s", partition.name, path)
+    return path
+
+
+def archive_partitions(engine: Engine, before: date, output_dir: Path) -> List[Path]:
+    """Archive every monthly partition that ends on or before ``before``."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    archived = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        concurrently = not has_default_partition(conn)
+        if not concurrently:
+            conn.exec_driver_sql(f"SET lock_timeout = '{DETACH_LOCK_TIMEOUT}'")
+        try:
+            for partition in log_partitions(conn):
+                if partition.end <= before:
+                    archived.append(_archive_partition(conn, partition, output_dir, concurrently))
+        finally:
+            if not concurrently:
+                conn.exec_driver_sql("RESET lock_timeout")
+    return archived
+
+
+def archive_rows(
+    engine: Engine, before: datetime, output_dir: Path, chunk_size: int = CHUNK_SIZE
+) -> int:
+    """Export and delete rows created before ``before``; returns the number archived."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{PARENT}_before_{before:%Y_%m_%d}.csv.gz"
+    table = InventoryLog.__table__
+    total = 0
+    new_file = not path.exists()
+    # Appending adds a gzip member per run, which gzip readers treat as one stream.
+    with gzip.open(path, "at", newline="") as out:
+        writer = csv.writer(out)
+        if new_file:
+            writer.writerow(COLUMNS)
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(
+                    select(table)
+                    .where(table.c.created_at < before)
+                    .order_by(table.c.id)
+                    .limit(chunk_size)
+                ).all()
+                if not rows:
+                    break
+                for row in rows:
+                    writer.writerow(
+                        (
+                            row.id,
+                            row.product_id,
+                            LogOperation[row.operation].value,
+                            row.quantity_delta,
+                            row.created_at.isoformat(),
+                        )
+                    )
+                # The chunk must be on disk before its rows are deleted.
+                out.flush()
+                os.fsync(out.fileno())
+                conn.execute(delete(table).where(table.c.id.in_([row.id for row in rows])))
+            total += len(rows)
+    logger.info("Archived %s log rows to %s", total, path)
+    return total
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.models.inventory_log import InventoryLog
+
+
+def log_history(
+    session: Session, product_id: str, since: Optional[datetime] = None, limit: int = 100
+) -> List[InventoryLog]:
+    """A product's newest log rows first, optionally only those created at or after ``since``."""
+    stmt = (
+        select(InventoryLog)
+        .where(InventoryLog.product_id == product_id)
+        .order_by(InventoryLog.created_at.desc(), InventoryLog.id.desc())
+        .limit(limit)
+    )
+    if since is not None:
+        stmt = stmt.where(InventoryLog.created_at >= since)
+    return list(session.execute(stmt).scalars())
@@ -0,0 +1,172 @@
+"""Time-limited stock reservations backed by the ``orders`` table.
+
+``reserve`` takes stock with the regular purchase path and records a ``RESERVED`` order
+with an ``expires_at``; ``confirm`` settles it as ``ACTIVE`` once payment succeeds. The
+sweeper claims due reservations through the partial ``ix_orders_reserved_expires_at``
+index in bounded batches with ``FOR UPDATE SKIP LOCKED``, so several sweepers (or app
+instances) split the backlog instead of queueing behind each other, and gives the stock
+back through ``restore(reason="expired")``. Restores are keyed on the order id, so an
+order that was also cancelled through the API is never restored twice.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.api.errors import IdempotencyConflictError, ValidationError
+from src.config.settings import settings
+from src.db.transaction import transaction
+from src.models.order import Order
+from src.services import inventory_service
+from src.services.reservation_cache import reservation_cache
+
+logger = logging.getLogger(__name__)
+
+RESERVED = "RESERVED"
+ACTIVE = "ACTIVE"
+EXPIRED = "EXPIRED"
+
+stock = reservation_cache if settings.reservation_cache_enabled else inventory_service
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def reserve(
+    session: Session,
+    order_id: str,
+    product_id: str,
+    sku: str,
+    quantity: int,
+    ttl_seconds: Optional[float] = None,
+):
+    ttl = settings.reservation_ttl if ttl_seconds is None else ttl_seconds
+    expires_at = _now() + timedelta(seconds=ttl)
+    with transaction(session):
+        existing = session.get(Order, order_id)
+        if existing is not None:
+            if (existing.product_id, existing.sku, existing.requested_qty) != (
+                product_id,
+                sku,
+                quantity,
+            ):
+                raise IdempotencyConflictError(
+                    f"order_id {order_id} was already reserved for a different request"
+                )
+            if existing.status != RESERVED:
+                raise ValidationError(f"Order already {existing.status.lower()}")
+            expires_at = existing.expires_at
+        else:
+            # The order row is written first so the stock change below joins a transaction
+            # that is already open on every driver.
+            session.add(
+                Order(
+                    id=order_id,
+                    product_id=product_id,
+                    sku=sku,
+                    requested_qty=quantity,
+                    status=RESERVED,
+                    expires_at=expires_at,
+                )
+            )
+            session.flush()
+        result = stock.purchase(session, product_id, sku, quantity, order_id)
+    return {**result, "order_id": order_id, "expires_at": expires_at}
+
+
+def confirm(session: Session, order_id: str):
+    with transaction(session):
+        order = session.execute(
+            select(Order).where(Order.id == order_id).with_for_update()
+        ).scalar_one_or_none()
+        if order is None:
+            raise ValidationError("Order not found")
+        if order.status == RESERVED:
+            order.status = ACTIVE
+            order.expires_at = None
+        elif order.status != ACTIVE:
+            raise ValidationError(f"Order already {order.status.lower()}")
+        return {"order_id": order.id, "status": order.status}
+
+
+def expire_batch(session: Session, batch_size: int, now: Optional[datetime] = None) -> int:
+    """Expire up to ``batch_size`` due reservations; returns how many were expired."""
+    with transaction(session):
+        orders = (
+            session.execute(
+                select(Order)
+                .where(Order.status == RESERVED, Order.expires_at <= (now or _now()))
+                .order_by(Order.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            .scalars()
+            .all()
+        )
+        for order in orders:
+            try:
+                stock.restore(
+                    session,
+                    order.product_id,
+                    order.sku,
+                    order.requested_qty,
+                    "expired",
+                    order.id,
+                )
+            except IdempotencyConflictError:
+                # Already restored under another reason (e.g. cancelled through the API).
+                logger.info("Stock for expired order %s was already restored", order.id)
+            except ValidationError:
+                logger.exception("Could not restore stock for expired order %s", order.id)
+            order.status = EXPIRED
+        return len(orders)
+
+
+def expire_all(session: Session, batch_size: int, now: Optional[datetime] = None) -> int:
+    total = 0
+    while True:
+        expired = expire_batch(session, batch_size, now)
+        total += expired
+        if expired < batch_size:
+            return total
+
+
+class ExpirySweeper:
+    def __init__(self, batch_size: int = 100):
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, session_factory: Callable[[], Session], interval: float) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(session_factory, interval),
+            name="reservation-expiry",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, session_factory: Callable[[], Session], interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                with session_factory() as session:
+                    expired = expire_all(session, self.batch_size)
+                if expired:
+                    logger.info("Expired %s stock reservations", expired)
+            except Exception:
+                logger.exception("Reservation expiry sweep failed")
+
+
+expiry_sweeper = ExpirySweeper(settings.expiry_batch_size)
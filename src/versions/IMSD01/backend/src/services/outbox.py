@@ -0,0 +1,191 @@
+"""Transactional outbox for stock changes.
+
+With ``OUTBOX=true``, every stock change (purchases, cancels, bulk restocks and turning
+sharding on or off) ``record``s one ``stock_events`` row per product it changes, in the
+same transaction as the change itself, so downstream systems (search, storefront caches,
+analytics) hear about exactly the changes that committed instead of polling ``products``.
+With the reservation cache, the event is written with the journal row at sale time; the
+later flush into ``products`` only persists that change and emits nothing new.
+``OutboxRelay`` tails the table in id order, hands each batch to a sink and deletes the
+published rows in one statement.
+
+Delivery is at least once: a relay that dies between publishing and committing the
+delete publishes that batch again, so consumers dedupe on the event ``id``. Rows are
+claimed with ``FOR UPDATE SKIP LOCKED``, so a second relay on Postgres takes other rows
+rather than blocking, but only a single relay keeps per-product events in order.
+"""
+import json
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Protocol, Sequence, TextIO
+
+from sqlalchemy import Select, delete, insert, select
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.db.transaction import transaction
+from src.models.stock_event import StockEvent
+from src.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED = registry.counter("outbox_events_published_total", "Stock events published.")
+LAG = registry.histogram(
+    "outbox_event_lag_seconds", "Time from a stock change committing to its event publishing."
+)
+
+BATCH_SIZE = 500
+
+_COLUMNS = (
+    StockEvent.id,
+    StockEvent.product_id,
+    StockEvent.sku,
+    StockEvent.operation,
+    StockEvent.quantity_delta,
+    StockEvent.available_qty,
+    StockEvent.created_at,
+)
+
+
+EVENT_FIELDS = ("product_id", "sku", "operation", "quantity_delta", "available_qty")
+
+
+def record(session: Session, rows: Sequence[Dict]) -> None:
+    """Queue events for the caller's transaction; a no-op unless the outbox is enabled.
+
+    Each row carries ``product_id``, ``sku``, ``operation``, ``quantity_delta`` and the
+    ``available_qty`` after the change.
+    """
+    if settings.outbox_enabled and rows:
+        session.execute(insert(StockEvent), list(rows))
+
+
+def record_from_select(session: Session, rows: Select) -> None:
+    """``record`` for events selected in the database, written with INSERT ... SELECT.
+
+    ``rows`` selects the ``EVENT_FIELDS`` columns in order.
+    """
+    if settings.outbox_enabled:
+        session.execute(insert(StockEvent).from_select(EVENT_FIELDS, rows))
+
+
+class Sink(Protocol):
+    def publish(self, events: List[Dict]) -> None:
+        ...
+
+
+class QueueSink:
+    """Collects events in process memory; for tests and benchmarks."""
+
+    def __init__(self):
+        self.events: "queue.SimpleQueue[Dict]" = queue.SimpleQueue()
+
+    def publish(self, events: List[Dict]) -> None:
+        for event in events:
+            self.events.put(event)
+
+    def drain(self) -> List[Dict]:
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class FileSink:
+    """Writes events as NDJSON lines to a text stream and flushes after every batch."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def publish(self, events: List[Dict]) -> None:
+        self.stream.write("".join(json.dumps(event) + "\n" for event in events))
+        self.stream.flush()
+
+
+def _created_at(row) -> datetime:
+    # SQLite hands timestamps back without their zone; they were written in UTC.
+    created_at = row.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        sink: Sink,
+        batch_size: int = BATCH_SIZE,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self._clock = clock
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def relay_once(self, session: Session) -> int:
+        """Publish and delete the oldest batch of events; returns how many there were."""
+        with transaction(session):
+            rows = session.execute(
+                select(*_COLUMNS)
+                .order_by(StockEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                return 0
+            created = [_created_at(row) for row in rows]
+            events = [
+                {**row._asdict(), "created_at": created_at.isoformat()}
+                for row, created_at in zip(rows, created)
+            ]
+            self.sink.publish(events)
+            session.execute(
+                delete(StockEvent).where(StockEvent.id.in_([row.id for row in rows]))
+            )
+
+        now = self._clock()
+        for created_at in created:
+            LAG.observe((now - created_at).total_seconds())
+        PUBLISHED.inc(len(rows))
+        return len(rows)
+
+    def drain(self, session: Session) -> int:
+        """Relay batches until the outbox is empty; returns the number of events published."""
+        published = 0
+        while True:
+            count = self.relay_once(session)
+            published += count
+            if count < self.batch_size:
+                return published
+
+    def start(self, session_factory: Callable[[], Session], interval: float) -> None:
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run,
+            args=(session_factory, interval),
+            name="outbox-relay",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._stop.set()
+        self._worker.join()
+        self._worker = None
+
+    def _run(self, session_factory: Callable[[], Session], interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                with session_factory() as session:
+                    self.drain(session)
+            except Exception:
+                logger.exception("Outbox relay failed")
+        with session_factory() as session:
+            self.drain(session)
@@ -0,0 +1,388 @@
+"""Hot-SKU reservation layer with write-behind to ``products``.
+
+Purchases decrement a per-product counter instead of locking the ``products`` row and
+append a ``StockReservation`` journal row in the caller's transaction. A flusher applies
+the journal to ``products`` and ``inventory_logs`` in batches, so a hot SKU takes one row
+lock per flush instead of one per sale. Because every accepted reservation is journaled
+before it is acknowledged, ``reconcile`` can rebuild exact counters after a restart.
+Responses carry the journal entry id as ``log_id``; the ``inventory_logs`` row itself only
+gets its id when the flusher writes it.
+
+The in-memory store is only safe for a single process; multiple workers need a shared
+store with the same GET/SETNX/INCRBY semantics (e.g. Redis).
+"""
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Protocol, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.api.errors import InsufficientStockError, ValidationError
+from src.db.ids import new_id
+from src.db.session_hooks import after_commit, after_rollback
+from src.db.transaction import transaction
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+from src.models.stock_reservation import StockReservation
+from src.services import outbox
+from src.services.alert_service import create_low_stock_alerts
+from src.services.idempotency import CANCEL, PURCHASE, PURCHASE_BATCH, idempotency_keys
+from src.services.inventory_service import PurchaseLine, batch_request, restore_operation
+from src.services.stock_cache import stock_cache
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 1000
+
+
+class CounterStore(Protocol):
+    def get(self, key: str) -> Optional[int]: ...
+
+    def setnx(self, key: str, value: int) -> bool: ...
+
+    def incrby(self, key: str, amount: int) -> int: ...
+
+    def clear(self) -> None: ...
+
+
+class InMemoryCounterStore:
+    """Process-local stand-in for Redis integer counters."""
+
+    def __init__(self) -> None:
+        self._values: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[int]:
+        return self._values.get(key)
+
+    def setnx(self, key: str, value: int) -> bool:
+        with self._lock:
+            if key in self._values:
+                return False
+            self._values[key] = value
+            return True
+
+    def incrby(self, key: str, amount: int) -> int:
+        with self._lock:
+            value = self._values[key] + amount
+            self._values[key] = value
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class ReservationCache:
+    def __init__(self, store: Optional[CounterStore] = None) -> None:
+        self.store = store or InMemoryCounterStore()
+        self._skus: Dict[str, str] = {}
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _load(self, session: Session, product_id: str, sku: str) -> None:
+        cached_sku = self._skus.get(product_id)
+        if cached_sku is not None and self.store.get(product_id) is not None:
+            if cached_sku != sku:
+                raise ValidationError("Product not found")
+            return
+
+        available = session.execute(
+            select(Product.available_qty).where(Product.id == product_id, Product.sku == sku)
+        ).scalar_one_or_none()
+        if available is None:
+            raise ValidationError("Product not found")
+        pending = session.execute(
+            select(func.coalesce(func.sum(StockReservation.quantity_delta), 0)).where(
+                StockReservation.product_id == product_id
+            )
+        ).scalar_one()
+        self._skus[product_id] = sku
+        self.store.setnx(product_id, available + pending)
+
+    def purchase(
+        self,
+        session: Session,
+        product_id: str,
+        sku: str,
+        quantity: int,
+        order_id: Optional[str] = None,
+    ):
+        return self._reserve(session, [(product_id, sku, quantity)], order_id, PURCHASE)
+
+    def purchase_many(
+        self, session: Session, lines: Sequence[PurchaseLine], order_id: Optional[str] = None
+    ):
+        return self._reserve(session, lines, order_id, PURCHASE_BATCH)
+
+    def _reserve(
+        self,
+        session: Session,
+        lines: Sequence[PurchaseLine],
+        order_id: Optional[str],
+        operation: str,
+    ):
+        if not lines:
+            raise ValidationError("At least one line is required")
+        if any(quantity <= 0 for _, _, quantity in lines):
+            raise ValidationError("Quantity must be greater than zero")
+
+        results = [None] * len(lines)
+        taken = []
+        journal = []
+        request = list(lines[0]) if operation == PURCHASE else batch_request(lines)
+        try:
+            with transaction(session):
+                replayed = idempotency_keys.replay(session, order_id, operation, request)
+                if replayed is not None:
+                    return replayed
+
+                for index in sorted(range(len(lines)), key=lambda i: lines[i][:2]):
+                    product_id, sku, quantity = lines[index]
+                    self._load(session, product_id, sku)
+                    remaining = self.store.incrby(product_id, -quantity)
+                    if remaining < 0:
+                        self.store.incrby(product_id, quantity)
+                        raise InsufficientStockError(quantity, remaining + quantity)
+                    taken.append((product_id, quantity))
+
+                    entry_id = new_id()
+                    journal.append(
+                        {
+                            "id": entry_id,
+                            "product_id": product_id,
+                            "operation": "SALE",
+                            "quantity_delta": -quantity,
+                        }
+                    )
+                    results[index] = {
+                        "product_id": product_id,
+                        "sku": sku,
+                        "deducted": quantity,
+                        "remaining": remaining,
+                        "log_id": entry_id,
+                        "alert_id": None,
+                    }
+                session.execute(insert(StockReservation), journal)
+                outbox.record(
+                    session,
+                    [
+                        {
+                            "product_id": result["product_id"],
+                            "sku": result["sku"],
+                            "operation": "SALE",
+                            "quantity_delta": -result["deducted"],
+                            "available_qty": result["remaining"],
+                        }
+                        for result in results
+                    ],
+                )
+                outcome = results[0] if operation == PURCHASE else results
+                idempotency_keys.record(session, order_id, operation, request, outcome)
+                stock_cache.invalidate_after_commit(session, [entry[0] for entry in taken])
+        except Exception as exc:
+            # Give back every counter decremented before the failure; the journal rows
+            # were rolled back with the transaction.
+            self._give_back(taken)
+            if isinstance(exc, IntegrityError):
+                replayed = idempotency_keys.replay(session, order_id, operation, request)
+                if replayed is not None:
+                    return replayed
+            raise
+        # A caller-owned transaction can still roll back, e.g. when a later step fails or
+        # its commit does and it is retried; the journal rows go with it, so must the
+        # counters.
+        after_rollback(session, lambda: self._give_back(taken))
+        return outcome
+
+    def _give_back(self, taken: Sequence[Tuple[str, int]]) -> None:
+        for product_id, quantity in taken:
+            self.store.incrby(product_id, quantity)
+
+    def restore(
+        self,
+        session: Session,
+        product_id: str,
+        sku: str,
+        quantity: int,
+        reason: str,
+        order_id: Optional[str] = None,
+    ):
+        if quantity <= 0:
+            raise ValidationError("Quantity must be greater than zero")
+        operation = restore_operation(reason)
+
+        request = [product_id, sku, quantity, reason]
+        entry_id = new_id()
+        try:
+            with transaction(session):
+                replayed = idempotency_keys.replay(session, order_id, CANCEL, request)
+                if replayed is not None:
+                    return replayed
+
+                self._load(session, product_id, sku)
+                session.add(
+                    StockReservation(
+                        id=entry_id,
+                        product_id=product_id,
+                        operation=operation,
+                        quantity_delta=quantity,
+                    )
+                )
+                # The counter is only bumped after commit, so replays report the level
+                # projected here rather than the one returned below.
+                result = {
+                    "product_id": product_id,
+                    "sku": sku,
+                    "restored": quantity,
+                    "remaining": self.store.get(product_id) + quantity,
+                    "log_id": entry_id,
+                }
+                outbox.record(
+                    session,
+                    [
+                        {
+                            "product_id": product_id,
+                            "sku": sku,
+                            "operation": operation,
+                            "quantity_delta": quantity,
+                            "available_qty": result["remaining"],
+                        }
+                    ],
+                )
+                idempotency_keys.record(session, order_id, CANCEL, request, result)
+                stock_cache.invalidate_after_commit(session, [product_id])
+        except IntegrityError:
+            replayed = idempotency_keys.replay(session, order_id, CANCEL, request)
+            if replayed is None:
+                raise
+            return replayed
+        # Released stock only becomes sellable once its journal row is committed, which
+        # for a caller-owned transaction (e.g. the expiry sweeper) is later than here.
+        def _release():
+            result["remaining"] = self.store.incrby(product_id, quantity)
+
+        after_commit(session, _release)
+        return result
+
+    def restocked(self, session: Session, deltas: Sequence[Tuple[str, int]]) -> None:
+        """Add stock written straight to ``products`` to the counters already loaded."""
+
+        def _add():
+            for product_id, quantity in deltas:
+                if self.store.get(product_id) is not None:
+                    self.store.incrby(product_id, quantity)
+
+        after_commit(session, _add)
+
+    def flush(self, session: Session, batch_size: int = FLUSH_BATCH_SIZE) -> int:
+        """Apply one batch of journaled reservations to products and inventory_logs."""
+        with transaction(session):
+            rows = session.execute(
+                select(
+                    StockReservation.id,
+                    StockReservation.product_id,
+                    StockReservation.operation,
+                    StockReservation.quantity_delta,
+                )
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                return 0
+
+            deltas: Dict[str, int] = defaultdict(int)
+            for row in rows:
+                deltas[row.product_id] += row.quantity_delta
+
+            products = Product.__table__
+            session.execute(
+                update(products)
+                .where(products.c.id == bindparam("b_product_id"))
+                .values(available_qty=products.c.available_qty + bindparam("b_delta")),
+                [
+                    {"b_product_id": product_id, "b_delta": delta}
+                    for product_id, delta in sorted(deltas.items())
+                ],
+            )
+            stock_cache.invalidate_after_commit(session, list(deltas))
+            session.execute(
+                insert(InventoryLog),
+                [
+                    {
+                        "product_id": row.product_id,
+                        "operation": row.operation,
+                        "quantity_delta": row.quantity_delta,
+                    }
+                    for row in rows
+                ],
+            )
+            session.execute(
+                delete(StockReservation).where(StockReservation.id.in_([row.id for row in rows]))
+            )
+
+            sold = [product_id for product_id, delta in deltas.items() if delta < 0]
+            if sold:
+                low_stock = session.execute(
+                    select(Product.id, Product.available_qty).where(
+                        Product.id.in_(sold),
+                        Product.available_qty <= Product.low_stock_threshold,
+                    )
+                ).all()
+                create_low_stock_alerts(session, [tuple(row) for row in low_stock])
+            return len(rows)
+
+    def flush_all(self, session: Session, batch_size: int = FLUSH_BATCH_SIZE) -> int:
+        total = 0
+        while True:
+            flushed = self.flush(session, batch_size)
+            total += flushed
+            if flushed < batch_size:
+                return total
+
+    def reconcile(self, session: Session) -> int:
+        """Apply every journaled reservation and drop counters so they reload from products.
+
+        Meant for startup, before traffic is accepted.
+        """
+        applied = self.flush_all(session)
+        self.store.clear()
+        self._skus.clear()
+        return applied
+
+    def start(self, session_factory: Callable[[], Session], interval: float) -> None:
+        with session_factory() as session:
+            applied = self.reconcile(session)
+        if applied:
+            logger.info("Reconciled %s pending stock reservations", applied)
+        self._stop.clear()
+        self._flusher = threading.Thread(
+            target=self._run,
+            args=(session_factory, interval),
+            name="reservation-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def stop(self) -> None:
+        if self._flusher is None:
+            return
+        self._stop.set()
+        self._flusher.join()
+        self._flusher = None
+
+    def _run(self, session_factory: Callable[[], Session], interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                with session_factory() as session:
+                    self.flush_all(session)
+            except Exception:
+                logger.exception("Reservation flush failed")
+        with session_factory() as session:
+            self.flush_all(session)
+
+
+reservation_cache = ReservationCache()
@@ -0,0 +1,158 @@
+"""Opt-in sharded stock for hot products.
+
+A sharded product keeps ``products.available_qty`` at 0 and spreads its stock over
+``stock_shards`` rows in ``product_stock_shards``. Concurrent purchases then mostly lock
+different rows; the total is always the sum of the shards. Sharding targets the direct
+purchase path and is not meant to be combined with the reservation cache, which keeps
+its own counter per product.
+"""
+import random
+from typing import Dict, Iterable
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from src.api.errors import InsufficientStockError, ValidationError
+from src.db.transaction import transaction
+from src.models.product import Product
+from src.models.product_stock_shard import ProductStockShard
+from src.services import outbox
+
+
+def _reshard_event(product: Product, total: int) -> dict:
+    # Moving stock between products.available_qty and the shards leaves the total alone,
+    # but consumers that read products directly would see it change.
+    return {
+        "product_id": product.id,
+        "sku": product.sku,
+        "operation": "RESHARD",
+        "quantity_delta": 0,
+        "available_qty": total,
+    }
+
+
+def enable_sharding(session: Session, product_id: str, shards: int) -> None:
+    if shards <= 0:
+        raise ValidationError("Shard count must be greater than zero")
+
+    with transaction(session):
+        product = session.execute(
+            select(Product).where(Product.id == product_id).with_for_update()
+        ).scalar_one_or_none()
+        if product is None:
+            raise ValidationError("Product not found")
+        if product.stock_shards:
+            raise ValidationError("Product is already sharded")
+
+        base, extra = divmod(product.available_qty, shards)
+        session.execute(
+            insert(ProductStockShard),
+            [
+                {
+                    "product_id": product_id,
+                    "shard_no": shard_no,
+                    "available_qty": base + (1 if shard_no < extra else 0),
+                }
+                for shard_no in range(shards)
+            ],
+        )
+        outbox.record(session, [_reshard_event(product, product.available_qty)])
+        product.available_qty = 0
+        product.stock_shards = shards
+
+
+def disable_sharding(session: Session, product_id: str) -> None:
+    with transaction(session):
+        product = session.execute(
+            select(Product).where(Product.id == product_id).with_for_update()
+        ).scalar_one_or_none()
+        if product is None:
+            raise ValidationError("Product not found")
+        if not product.stock_shards:
+            return
+
+        product.available_qty += total_available(session, product_id)
+        product.stock_shards = 0
+        outbox.record(session, [_reshard_event(product, product.available_qty)])
+        session.execute(
+            delete(ProductStockShard).where(ProductStockShard.product_id == product_id)
+        )
+
+
+def total_available(session: Session, product_id: str) -> int:
+    return session.execute(
+        select(func.coalesce(func.sum(ProductStockShard.available_qty), 0)).where(
+            ProductStockShard.product_id == product_id
+        )
+    ).scalar_one()
+
+
+def totals_for(session: Session, product_ids: Iterable[str]) -> Dict[str, int]:
+    rows = session.execute(
+        select(ProductStockShard.product_id, func.sum(ProductStockShard.available_qty))
+        .where(ProductStockShard.product_id.in_(list(product_ids)))
+        .group_by(ProductStockShard.product_id)
+    ).all()
+    return {product_id: total for product_id, total in rows}
+
+
+def decrement(session: Session, product_id: str, quantity: int, shards: int) -> int:
+    """Take ``quantity`` from the shards of ``product_id`` and return the new total."""
+    start = random.randrange(shards)
+    result = session.execute(
+        update(ProductStockShard)
+        .where(
+            ProductStockShard.product_id == product_id,
+            ProductStockShard.shard_no == start,
+            ProductStockShard.available_qty >= quantity,
+        )
+        .values(available_qty=ProductStockShard.available_qty - quantity)
+    )
+    if result.rowcount != 1:
+        _decrement_across_shards(session, product_id, quantity)
+    return total_available(session, product_id)
+
+
+def _decrement_across_shards(session: Session, product_id: str, quantity: int) -> None:
+    # The random shard ran dry: lock the non-empty shards in shard order and drain them.
+    rows = session.execute(
+        select(ProductStockShard.shard_no, ProductStockShard.available_qty)
+        .where(ProductStockShard.product_id == product_id, ProductStockShard.available_qty > 0)
+        .order_by(ProductStockShard.shard_no)
+        .with_for_update()
+    ).all()
+    available = sum(row.available_qty for row in rows)
+    if available < quantity:
+        raise InsufficientStockError(quantity, available)
+
+    takes = []
+    needed = quantity
+    for row in rows:
+        take = min(needed, row.available_qty)
+        takes.append({"b_shard_no": row.shard_no, "b_take": take})
+        needed -= take
+        if needed == 0:
+            break
+
+    shards = ProductStockShard.__table__
+    session.execute(
+        update(shards)
+        .where(
+            shards.c.product_id == product_id,
+            shards.c.shard_no == bindparam("b_shard_no"),
+        )
+        .values(available_qty=shards.c.available_qty - bindparam("b_take")),
+        takes,
+    )
+
+
+def increment(session: Session, product_id: str, quantity: int, shards: int) -> int:
+    session.execute(
+        update(ProductStockShard)
+        .where(
+            ProductStockShard.product_id == product_id,
+            ProductStockShard.shard_no == random.randrange(shards),
+        )
+        .values(available_qty=ProductStockShard.available_qty + quantity)
+    )
+    return total_available(session, product_id)
@@ -0,0 +1,130 @@
+"""Read-through TTL cache for product stock levels.
+
+Storefront polling reads stock through ``get_many``: cached levels younger than the TTL
+are served from process memory and all misses are loaded with one ``IN`` query. Shard
+counters are included, and so are reservation-cache journal rows not yet flushed to
+``products``, so a sale shows as soon as it commits rather than at the next flush.
+Writers in this process call ``invalidate_after_commit`` so a change is visible to the
+next read once it commits; other processes' writes show up within the TTL.
+
+A read that started before an invalidation never stores its result, so a load racing a
+commit cannot put the pre-commit level back into the cache.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.db.session_hooks import after_commit
+from src.models.product import Product
+from src.models.product_stock_shard import ProductStockShard
+from src.models.stock_reservation import StockReservation
+from src.observability.metrics import registry
+
+HITS = registry.counter("stock_cache_hits_total", "Stock lookups answered from the cache.")
+MISSES = registry.counter("stock_cache_misses_total", "Stock lookups that queried the database.")
+
+
+class ProductStock(NamedTuple):
+    product_id: str
+    sku: str
+    available_qty: int
+    low_stock_threshold: int
+
+
+def load_stock(session: Session, product_ids: Sequence[str]) -> Dict[str, ProductStock]:
+    shards = (
+        select(
+            ProductStockShard.product_id,
+            func.sum(ProductStockShard.available_qty).label("available_qty"),
+        )
+        .where(ProductStockShard.product_id.in_(product_ids))
+        .group_by(ProductStockShard.product_id)
+        .subquery()
+    )
+    pending = (
+        select(
+            StockReservation.product_id,
+            func.sum(StockReservation.quantity_delta).label("quantity_delta"),
+        )
+        .where(StockReservation.product_id.in_(product_ids))
+        .group_by(StockReservation.product_id)
+        .subquery()
+    )
+    rows = session.execute(
+        select(
+            Product.id,
+            Product.sku,
+            Product.available_qty
+            + func.coalesce(shards.c.available_qty, 0)
+            + func.coalesce(pending.c.quantity_delta, 0),
+            Product.low_stock_threshold,
+        )
+        .outerjoin(shards, shards.c.product_id == Product.id)
+        .outerjoin(pending, pending.c.product_id == Product.id)
+        .where(Product.id.in_(product_ids))
+    ).all()
+    return {row[0]: ProductStock(*row) for row in rows}
+
+
+class StockCache:
+    def __init__(self, ttl: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, ProductStock]] = {}
+        self._invalidated: Dict[str, int] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, session: Session, product_ids: Iterable[str]) -> Dict[str, ProductStock]:
+        """Stock for the given products; unknown ids are left out."""
+        wanted = list(dict.fromkeys(product_ids))
+        found: Dict[str, ProductStock] = {}
+        missing = []
+        now = self._clock()
+        with self._lock:
+            for product_id in wanted:
+                entry = self._entries.get(product_id)
+                if entry is not None and entry[0] > now:
+                    found[product_id] = entry[1]
+                else:
+                    missing.append(product_id)
+            started = self._generation
+        if found:
+            HITS.inc(len(found))
+        if not missing:
+            return found
+
+        MISSES.inc(len(missing))
+        loaded = load_stock(session, missing)
+        found.update(loaded)
+        if self.ttl > 0:
+            expires_at = self._clock() + self.ttl
+            with self._lock:
+                for product_id, stock in loaded.items():
+                    if self._invalidated.get(product_id, 0) <= started:
+                        self._entries[product_id] = (expires_at, stock)
+        return found
+
+    def get(self, session: Session, product_id: str):
+        return self.get_many(session, [product_id]).get(product_id)
+
+    def invalidate(self, product_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for product_id in product_ids:
+                self._entries.pop(product_id, None)
+                self._invalidated[product_id] = self._generation
+
+    def invalidate_after_commit(self, session: Session, product_ids: Sequence[str]) -> None:
+        after_commit(session, lambda: self.invalidate(product_ids))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+stock_cache = StockCache(settings.stock_cache_ttl)
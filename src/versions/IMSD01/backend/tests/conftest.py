@@ -6,7 +6,7 @@ from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -16,18 +16,31 @@ if str(BACKEND_ROOT) not in sys.path:
 
 from src.api.app import app
 from src.db.base import Base
-from src.db.session import get_session
+from src.db.session import get_read_session, get_session
 
 
 def _make_engine(tmp_path: str):
     url = f"sqlite+pysqlite:///{tmp_path}"
-    return create_engine(
+    engine = create_engine(
         url,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
         future=True,
     )
 
+    # pysqlite only emits BEGIN before DML, so a SAVEPOINT opened first runs outside any
+    # transaction and commits on release. Let SQLAlchemy issue BEGIN itself so savepoints
+    # nest inside the caller's transaction the way they do on Postgres.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, _record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.connection.driver_connection.execute("BEGIN")
+
+    return engine
+
 
 @pytest.fixture()
 def db_session() -> Generator[Session, None, None]:
@@ -55,6 +68,7 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
             pass
 
     app.dependency_overrides[get_session] = _get_session_override
+    app.dependency_overrides[get_read_session] = _get_session_override
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
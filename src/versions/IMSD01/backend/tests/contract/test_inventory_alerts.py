@@ -0,0 +1,28 @@
+from uuid import uuid4
+
+from src.models.product import Product
+
+
+def test_alerts_contract_returns_latest_state_per_product(client, db_session):
+    product_id = str(uuid4())
+    db_session.add(Product(id=product_id, sku="SKU-AL", available_qty=6, low_stock_threshold=5))
+    db_session.commit()
+
+    for _ in range(2):
+        payload = {
+            "order_id": str(uuid4()),
+            "product_id": product_id,
+            "sku": "SKU-AL",
+            "quantity": 1,
+        }
+        resp = client.post("/inventory/purchase", json=payload)
+        assert resp.status_code == 200
+    last_alert_id = resp.json()["data"]["alert_id"]
+
+    resp = client.get("/inventory/alerts", params={"product_id": product_id})
+
+    assert resp.status_code == 200
+    alerts = resp.json()["data"]["alerts"]
+    assert len(alerts) == 1
+    assert alerts[0]["last_alert_id"] == last_alert_id
+    assert alerts[0]["stock_level"] == 4
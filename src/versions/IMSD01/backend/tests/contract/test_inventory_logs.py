@@ -0,0 +1,21 @@
+from uuid import uuid4
+
+from src.models.product import Product
+
+
+def test_logs_contract_lists_product_history(client, db_session):
+    product_id = str(uuid4())
+    db_session.add(Product(id=product_id, sku="SKU-LG", available_qty=5, low_stock_threshold=0))
+    db_session.commit()
+    payload = {"product_id": product_id, "sku": "SKU-LG", "quantity": 2}
+    requests = (("/inventory/purchase", {}), ("/inventory/cancel", {"reason": "cancelled"}))
+    for path, extra in requests:
+        body = {**payload, **extra, "order_id": str(uuid4())}
+        assert client.post(path, json=body).status_code == 200
+
+    resp = client.get("/inventory/logs", params={"product_id": product_id, "limit": 10})
+
+    assert resp.status_code == 200
+    logs = resp.json()["data"]["logs"]
+    assert sorted(log["operation"] for log in logs) == ["RESTOCK", "SALE"]
+    assert sum(log["quantity_delta"] for log in logs) == 0
@@ -0,0 +1,33 @@
+from uuid import uuid4
+
+from src.models.product import Product
+
+
+def test_purchase_batch_contract_success(client, db_session):
+    first_id, second_id = str(uuid4()), str(uuid4())
+    db_session.add_all(
+        [
+            Product(id=first_id, sku="SKU-B1", available_qty=10, low_stock_threshold=1),
+            Product(id=second_id, sku="SKU-B2", available_qty=6, low_stock_threshold=5),
+        ]
+    )
+    db_session.commit()
+
+    payload = {
+        "order_id": str(uuid4()),
+        "lines": [
+            {"product_id": second_id, "sku": "SKU-B2", "quantity": 2},
+            {"product_id": first_id, "sku": "SKU-B1", "quantity": 3},
+        ],
+    }
+    resp = client.post("/inventory/purchase/batch", json=payload)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "success"
+    assert body["data"]["order_id"] == payload["order_id"]
+    lines = body["data"]["lines"]
+    assert [line["sku"] for line in lines] == ["SKU-B2", "SKU-B1"]
+    assert [line["remaining"] for line in lines] == [4, 7]
+    assert lines[0]["alert_id"] is not None
+    assert lines[1]["alert_id"] is None
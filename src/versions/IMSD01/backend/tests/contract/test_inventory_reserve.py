@@ -0,0 +1,34 @@
+from datetime import datetime
+from uuid import uuid4
+
+from src.api.schemas.inventory import ReserveResponse
+from src.models.product import Product
+
+
+def test_reserve_and_confirm_contract(client, db_session):
+    product_id = str(uuid4())
+    db_session.add(Product(id=product_id, sku="SKU-RV", available_qty=5, low_stock_threshold=0))
+    db_session.commit()
+    order_id = str(uuid4())
+
+    resp = client.post(
+        "/inventory/reserve",
+        json={"order_id": order_id, "product_id": product_id, "sku": "SKU-RV", "quantity": 2},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data["order_id"] == order_id
+    assert data["remaining"] == 3
+    assert set(data) == set(ReserveResponse.model_fields)
+    assert datetime.fromisoformat(data["expires_at"])
+
+    resp = client.post("/inventory/confirm", json={"order_id": order_id})
+
+    assert resp.status_code == 200
+    assert resp.json()["data"] == {"order_id": order_id, "status": "ACTIVE"}
+
+    resp = client.post("/inventory/confirm", json={"order_id": str(uuid4())})
+
+    assert resp.status_code == 400
+    assert resp.json()["error"] == "Order not found"
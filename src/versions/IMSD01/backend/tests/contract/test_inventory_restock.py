@@ -0,0 +1,27 @@
+from uuid import uuid4
+
+from src.models.product import Product
+
+
+def test_restock_contract_applies_ndjson_body(client, db_session):
+    product_id = str(uuid4())
+    db_session.add(Product(id=product_id, sku="SKU-RS", available_qty=1, low_stock_threshold=0))
+    db_session.commit()
+
+    resp = client.post(
+        "/inventory/restock",
+        content='{"sku": "SKU-RS", "quantity": 7}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data == {"rows": 1, "products": 1, "units": 7, "unknown": 0, "unknown_skus": []}
+    db_session.expire_all()
+    assert db_session.get(Product, product_id).available_qty == 8
+
+
+def test_restock_contract_rejects_unknown_format(client):
+    resp = client.post("/inventory/restock", content="x", headers={"Content-Type": "text/plain"})
+
+    assert resp.status_code == 400
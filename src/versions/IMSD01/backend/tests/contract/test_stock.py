@@ -0,0 +1,29 @@
+from uuid import uuid4
+
+from src.models.product import Product
+
+
+def test_stock_contract_single_and_batch(client, db_session):
+    ids = [str(uuid4()) for _ in range(2)]
+    for index, product_id in enumerate(ids):
+        db_session.add(
+            Product(id=product_id, sku=f"SKU-ST{index}", available_qty=3, low_stock_threshold=1)
+        )
+    db_session.commit()
+
+    resp = client.get(f"/stock/{ids[0]}")
+    assert resp.status_code == 200
+    assert resp.json()["data"] == {
+        "product_id": ids[0],
+        "sku": "SKU-ST0",
+        "available_qty": 3,
+        "low_stock_threshold": 1,
+    }
+
+    resp = client.get("/stock", params={"ids": f"{ids[1]},nope,{ids[0]}"})
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert [item["product_id"] for item in data["products"]] == [ids[1], ids[0]]
+    assert data["missing"] == ["nope"]
+
+    assert client.get("/stock/nope").status_code == 400
@@ -0,0 +1,75 @@
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.config.settings import settings
+from src.models.alert import Alert
+from src.models.product import Product
+from src.services import alert_service, inventory_service
+from src.services.alert_pipeline import AlertPipeline
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def pipeline(monkeypatch):
+    clock = _Clock()
+    pipeline = AlertPipeline(window=60.0, clock=clock)
+    enabled = replace(settings, alert_pipeline_enabled=True)
+    monkeypatch.setattr(inventory_service, "settings", enabled)
+    monkeypatch.setattr(inventory_service, "alert_pipeline", pipeline)
+    return pipeline, clock
+
+
+def _seed(session) -> str:
+    product_id = str(uuid4())
+    session.add(Product(id=product_id, sku="SKU-HOT", available_qty=10, low_stock_threshold=8))
+    session.commit()
+    return product_id
+
+
+def test_alerts_are_deduplicated_per_product_within_window(db_session, pipeline):
+    pipeline, clock = pipeline
+    product_id = _seed(db_session)
+
+    results = [inventory_service.purchase(db_session, product_id, "SKU-HOT", 1) for _ in range(3)]
+
+    assert [result["alert_id"] for result in results] == [None, None, None]
+    assert db_session.execute(select(Alert)).scalars().all() == []
+    db_session.commit()
+
+    first = pipeline.drain(db_session)
+    inventory_service.purchase(db_session, product_id, "SKU-HOT", 1)
+    assert pipeline.drain(db_session) == []
+
+    clock.now = 61.0
+    inventory_service.purchase(db_session, product_id, "SKU-HOT", 1)
+    second = pipeline.drain(db_session)
+
+    assert len(first) == 1 and len(second) == 1
+    alerts = db_session.execute(select(Alert).order_by(Alert.stock_level.desc())).scalars().all()
+    assert [alert.stock_level for alert in alerts] == [7, 5]
+    (state,) = alert_service.alert_states(db_session, product_id)
+    assert (state.last_alert_id, state.stock_level) == (second[0], 5)
+
+
+def test_events_are_queued_only_when_the_transaction_commits(db_session, pipeline):
+    pipeline, _ = pipeline
+    product_id = _seed(db_session)
+
+    with db_session.begin():
+        pipeline.enqueue_after_commit(db_session, [(product_id, 2)])
+    db_session.begin()
+    pipeline.enqueue_after_commit(db_session, [(product_id, 1)])
+    db_session.rollback()
+
+    (alert_id,) = pipeline.drain(db_session)
+    assert db_session.get(Alert, alert_id).stock_level == 2
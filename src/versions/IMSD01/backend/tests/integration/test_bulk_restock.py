@@ -0,0 +1,57 @@
+import io
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.api.errors import ValidationError
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+from src.services import bulk_restock, ledger, sharded_stock
+
+
+def _seed(session, sku: str, available_qty: int) -> str:
+    product_id = str(uuid4())
+    session.add(Product(id=product_id, sku=sku, available_qty=available_qty, low_stock_threshold=0))
+    session.commit()
+    return product_id
+
+
+def test_feed_is_summed_per_sku_and_logged_in_bulk(db_session):
+    plain = _seed(db_session, "SKU-R1", 5)
+    sharded = _seed(db_session, "SKU-R2", 6)
+    sharded_stock.enable_sharding(db_session, sharded, 3)
+    ledger.take_snapshots(db_session, [plain, sharded])
+    feed = io.StringIO("sku,quantity\nSKU-R1,4\nSKU-R2,10\nSKU-R1,1\nSKU-NOPE,3\n")
+    progress = []
+
+    summary = bulk_restock.restock(
+        db_session,
+        bulk_restock.read_feed(feed, "csv"),
+        lambda stage, count: progress.append((stage, count)),
+        chunk_size=2,
+    )
+
+    assert summary == bulk_restock.RestockSummary(
+        rows=4, products=2, units=15, unknown=1, unknown_skus=["SKU-NOPE"]
+    )
+    assert progress == [("staged", 2), ("staged", 4), ("applied", 2)]
+    assert db_session.get(Product, plain).available_qty == 10
+    assert sharded_stock.total_available(db_session, sharded) == 16
+    logs = db_session.execute(
+        select(InventoryLog.product_id, InventoryLog.operation, InventoryLog.quantity_delta)
+    ).all()
+    assert sorted(logs) == sorted([(plain, "RESTOCK", 5), (sharded, "RESTOCK", 10)])
+    assert ledger.audit(db_session, [plain, sharded]) == []
+
+
+def test_invalid_line_rejects_the_whole_feed(db_session):
+    product_id = _seed(db_session, "SKU-R3", 5)
+    feed = io.StringIO('{"sku": "SKU-R3", "quantity": 2}\n{"sku": "SKU-R3", "quantity": 0}\n')
+
+    with pytest.raises(ValidationError, match="Line 2"):
+        bulk_restock.restock(db_session, bulk_restock.read_feed(feed, "ndjson"))
+
+    db_session.expire_all()
+    assert db_session.get(Product, product_id).available_qty == 5
+    assert db_session.execute(select(InventoryLog)).first() is None
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, func, insert, select
+
+from src.models.idempotency_key import IdempotencyKey
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+from src.services import inventory_service
+from src.api.errors import IdempotencyConflictError
+from src.services.idempotency import PURCHASE, idempotency_keys, request_hash
+
+
+@pytest.fixture(autouse=True)
+def _empty_lru():
+    idempotency_keys.clear()
+    yield
+    idempotency_keys.clear()
+
+
+def _seed(session, available_qty: int = 10, sku: str = "SKU-IDEM") -> str:
+    product_id = str(uuid4())
+    session.add(
+        Product(id=product_id, sku=sku, available_qty=available_qty, low_stock_threshold=0)
+    )
+    session.commit()
+    return product_id
+
+
+def _stock(session, product_id: str) -> int:
+    session.expire_all()
+    return session.get(Product, product_id).available_qty
+
+
+def test_replayed_orders_return_the_original_result_without_touching_stock(db_session):
+    product_id = _seed(db_session)
+    order_id = str(uuid4())
+
+    first = inventory_service.purchase(db_session, product_id, "SKU-IDEM", 3, order_id)
+    from_lru = inventory_service.purchase(db_session, product_id, "SKU-IDEM", 3, order_id)
+    idempotency_keys.clear()
+    statements = []
+    event.listen(
+        db_session.get_bind(),
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement.split()[0]),
+    )
+    from_table = inventory_service.purchase(db_session, product_id, "SKU-IDEM", 3, order_id)
+
+    assert first == from_lru == from_table
+    assert statements == ["SELECT"]
+    assert _stock(db_session, product_id) == 7
+    assert db_session.execute(select(func.count(InventoryLog.id))).scalar_one() == 1
+
+    cancel_id = str(uuid4())
+    restored = [
+        inventory_service.restore(db_session, product_id, "SKU-IDEM", 2, "cancelled", cancel_id)
+        for _ in range(2)
+    ]
+    assert restored[0] == restored[1]
+    assert _stock(db_session, product_id) == 9
+
+
+def test_concurrent_duplicate_rolls_back_and_replays_the_winner(db_session, monkeypatch):
+    product_id = _seed(db_session)
+    order_id = str(uuid4())
+    winner = {
+        "product_id": product_id,
+        "sku": "SKU-IDEM",
+        "deducted": 3,
+        "remaining": 7,
+        "log_id": "1",
+        "alert_id": None,
+    }
+    db_session.execute(
+        insert(IdempotencyKey),
+        {
+            "order_id": order_id,
+            "operation": PURCHASE,
+            "request_hash": request_hash([product_id, "SKU-IDEM", 3]),
+            "result": winner,
+        },
+    )
+    db_session.commit()
+
+    # The duplicate passes the up-front check just before the winner commits.
+    real_replay = idempotency_keys.replay
+    calls = []
+
+    def _racing_replay(session, key, operation, request):
+        calls.append(key)
+        return None if len(calls) == 1 else real_replay(session, key, operation, request)
+
+    monkeypatch.setattr(idempotency_keys, "replay", _racing_replay)
+
+    result = inventory_service.purchase(db_session, product_id, "SKU-IDEM", 3, order_id)
+
+    assert result == winner
+    assert len(calls) == 2
+    assert _stock(db_session, product_id) == 10
+    assert db_session.execute(select(func.count(InventoryLog.id))).scalar_one() == 0
+
+
+def test_aborted_caller_transaction_does_not_leave_a_replayable_result(db_session):
+    product_id = _seed(db_session)
+
+    db_session.begin()
+    aborted = inventory_service.restore(db_session, product_id, "SKU-IDEM", 5, "cancelled", "ord-1")
+    db_session.rollback()
+    assert aborted["remaining"] == 15
+    assert _stock(db_session, product_id) == 10
+
+    retried = inventory_service.restore(db_session, product_id, "SKU-IDEM", 5, "cancelled", "ord-1")
+    assert retried["remaining"] == 15
+    assert _stock(db_session, product_id) == 15
+
+
+def test_reusing_an_order_id_for_a_different_request_conflicts(db_session):
+    first = _seed(db_session)
+    second = _seed(db_session, sku="SKU-IDEM-2")
+    inventory_service.purchase(db_session, first, "SKU-IDEM", 2, "order-1")
+
+    for lru in (True, False):
+        if not lru:
+            idempotency_keys.clear()
+        with pytest.raises(IdempotencyConflictError):
+            inventory_service.purchase(db_session, second, "SKU-IDEM-2", 3, "order-1")
+    assert _stock(db_session, second) == 10
+
+    lines = [(first, "SKU-IDEM", 1), (second, "SKU-IDEM-2", 1)]
+    inventory_service.purchase_many(db_session, lines, "order-2")
+    assert inventory_service.purchase_many(db_session, lines[::-1], "order-2")
+    with pytest.raises(IdempotencyConflictError):
+        inventory_service.purchase_many(db_session, lines[:1], "order-2")
+
+    inventory_service.restore(db_session, first, "SKU-IDEM", 1, "cancelled", "order-1")
+    with pytest.raises(IdempotencyConflictError):
+        inventory_service.restore(db_session, first, "SKU-IDEM", 1, "expired", "order-1")
+    assert _stock(db_session, first) == 8
+
+
+def test_conflicting_request_returns_409(client, db_session):
+    product_id = _seed(db_session)
+    payload = {"order_id": "order-1", "product_id": product_id, "sku": "SKU-IDEM", "quantity": 1}
+
+    assert client.post("/inventory/purchase", json=payload).status_code == 200
+    resp = client.post("/inventory/purchase", json={**payload, "quantity": 2})
+
+    assert resp.status_code == 409
+    assert "order-1" in resp.json()["error"]
+
+
+def test_prune_deletes_keys_past_retention_in_batches(db_session):
+    product_id = _seed(db_session)
+    for index in range(5):
+        inventory_service.purchase(db_session, product_id, "SKU-IDEM", 1, f"order-{index}")
+    now = datetime.now(timezone.utc)
+
+    assert idempotency_keys.prune(db_session, timedelta(days=1), now=now) == 0
+    deleted = idempotency_keys.prune(
+        db_session, timedelta(days=1), batch_size=2, now=now + timedelta(days=2)
+    )
+
+    assert deleted == 5
+    assert db_session.execute(select(func.count()).select_from(IdempotencyKey)).scalar_one() == 0
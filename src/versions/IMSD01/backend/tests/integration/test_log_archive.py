@@ -0,0 +1,39 @@
+import csv
+import gzip
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from src.models.inventory_log import InventoryLog, LogOperation
+from src.services.log_archive import archive_rows
+
+
+def test_archive_rows_exports_and_deletes_only_old_logs(db_session, tmp_path):
+    old = datetime(2026, 1, 15, tzinfo=timezone.utc)
+    new = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    db_session.add_all(
+        [
+            InventoryLog(product_id="p-1", operation="SALE", quantity_delta=-2, created_at=old),
+            InventoryLog(product_id="p-1", operation="RETURN", quantity_delta=1, created_at=old),
+            InventoryLog(product_id="p-2", operation="RESTOCK", quantity_delta=5, created_at=old),
+            InventoryLog(product_id="p-1", operation="SALE", quantity_delta=-1, created_at=new),
+        ]
+    )
+    db_session.commit()
+
+    cutoff = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    archived = archive_rows(db_session.get_bind(), cutoff, tmp_path, chunk_size=2)
+
+    assert archived == 3
+    with gzip.open(tmp_path / "inventory_logs_before_2026_06_01.csv.gz", "rt") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [int(row["operation"]) for row in rows] == [
+        LogOperation.SALE,
+        LogOperation.RETURN,
+        LogOperation.RESTOCK,
+    ]
+    assert [row["product_id"] for row in rows] == ["p-1", "p-1", "p-2"]
+
+    db_session.expire_all()
+    remaining = db_session.execute(select(InventoryLog)).scalars().all()
+    assert [(log.operation, log.quantity_delta) for log in remaining] == [("SALE", -1)]
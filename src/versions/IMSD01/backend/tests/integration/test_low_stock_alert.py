@@ -3,7 +3,9 @@ from uuid import uuid4
 from sqlalchemy import select
 
 from src.models.alert import Alert
+from src.models.alert_state import AlertState
 from src.models.product import Product
+from src.services import inventory_service
 
 
 def test_low_stock_alert_created_on_purchase(client, db_session):
@@ -30,3 +32,17 @@ def test_low_stock_alert_created_on_purchase(client, db_session):
     alerts = db_session.execute(select(Alert)).scalars().all()
     assert len(alerts) == 1
     assert alerts[0].stock_level == 4
+
+
+def test_alert_state_is_written_after_the_purchase_commits(db_session):
+    product_id = str(uuid4())
+    db_session.add(Product(id=product_id, sku="SKU-003", available_qty=6, low_stock_threshold=5))
+    db_session.commit()
+
+    db_session.begin()
+    result = inventory_service.purchase(db_session, product_id, "SKU-003", 2)
+    assert db_session.execute(select(AlertState)).scalars().all() == []
+    db_session.commit()
+
+    (state,) = db_session.execute(select(AlertState)).scalars().all()
+    assert (state.last_alert_id, state.stock_level) == (result["alert_id"], 4)
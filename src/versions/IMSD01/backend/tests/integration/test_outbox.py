@@ -0,0 +1,122 @@
+import io
+import json
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from src.api.errors import InsufficientStockError
+from src.config.settings import settings
+from src.models.product import Product
+from src.models.stock_event import StockEvent
+from src.services import bulk_restock, inventory_service, outbox, sharded_stock
+from src.services.outbox import PUBLISHED, FileSink, OutboxRelay, QueueSink
+from src.services.reservation_cache import ReservationCache
+
+
+@pytest.fixture()
+def enabled(monkeypatch):
+    monkeypatch.setattr(outbox, "settings", replace(settings, outbox_enabled=True))
+
+
+def _seed(session, available_qty: int = 5, sku: str = "SKU-OB") -> str:
+    product_id = str(uuid4())
+    session.add(
+        Product(id=product_id, sku=sku, available_qty=available_qty, low_stock_threshold=0)
+    )
+    session.commit()
+    return product_id
+
+
+def _pending(session) -> int:
+    return session.execute(select(func.count()).select_from(StockEvent)).scalar_one()
+
+
+def test_stock_changes_are_relayed_in_order_and_deleted(db_session, enabled):
+    product_id = _seed(db_session)
+    inventory_service.purchase(db_session, product_id, "SKU-OB", 2)
+    inventory_service.purchase_many(db_session, [(product_id, "SKU-OB", 1)])
+    inventory_service.restore(db_session, product_id, "SKU-OB", 1, "expired")
+    db_session.commit()
+    sink = QueueSink()
+    before = PUBLISHED.value()
+
+    assert OutboxRelay(sink, batch_size=2).drain(db_session) == 3
+
+    events = sink.drain()
+    assert [(e["operation"], e["quantity_delta"], e["available_qty"]) for e in events] == [
+        ("SALE", -2, 3),
+        ("SALE", -1, 2),
+        ("RETURN", 1, 3),
+    ]
+    assert [e["id"] for e in events] == sorted(e["id"] for e in events)
+    assert {e["product_id"] for e in events} == {product_id}
+    assert _pending(db_session) == 0
+    assert PUBLISHED.value() == before + 3
+
+
+def test_rolled_back_changes_and_disabled_outbox_write_no_events(db_session, enabled, monkeypatch):
+    product_id = _seed(db_session, available_qty=1)
+    with pytest.raises(InsufficientStockError):
+        inventory_service.purchase(db_session, product_id, "SKU-OB", 2)
+    monkeypatch.setattr(outbox, "settings", settings)
+    inventory_service.purchase(db_session, product_id, "SKU-OB", 1)
+    db_session.commit()
+
+    assert _pending(db_session) == 0
+
+
+def test_failed_publish_keeps_events_for_the_next_attempt(db_session, enabled):
+    product_id = _seed(db_session)
+    inventory_service.purchase(db_session, product_id, "SKU-OB", 1)
+    db_session.commit()
+
+    class _Down:
+        def publish(self, events):
+            raise ConnectionError("sink down")
+
+    with pytest.raises(ConnectionError):
+        OutboxRelay(_Down()).relay_once(db_session)
+    assert _pending(db_session) == 1
+
+    stream = io.StringIO()
+    assert OutboxRelay(FileSink(stream)).relay_once(db_session) == 1
+    (line,) = stream.getvalue().splitlines()
+    assert json.loads(line)["sku"] == "SKU-OB"
+    assert _pending(db_session) == 0
+
+
+def _events(session) -> list:
+    sink = QueueSink()
+    OutboxRelay(sink).drain(session)
+    return [
+        (e["sku"], e["operation"], e["quantity_delta"], e["available_qty"]) for e in sink.drain()
+    ]
+
+
+def test_restocks_and_resharding_write_events(db_session, enabled):
+    plain = _seed(db_session)
+    sharded = _seed(db_session, available_qty=6, sku="SKU-OB-SHARD")
+    sharded_stock.enable_sharding(db_session, sharded, 3)
+
+    bulk_restock.restock(
+        db_session, [("SKU-OB", 4), ("SKU-OB-SHARD", 2), ("SKU-OB", 1), ("SKU-NONE", 9)]
+    )
+    sharded_stock.disable_sharding(db_session, sharded)
+
+    assert sorted(_events(db_session)) == [
+        ("SKU-OB", "RESTOCK", 5, 10),
+        ("SKU-OB-SHARD", "RESHARD", 0, 6),
+        ("SKU-OB-SHARD", "RESHARD", 0, 8),
+        ("SKU-OB-SHARD", "RESTOCK", 2, 8),
+    ]
+
+
+def test_reservation_cache_emits_one_event_per_sale_across_the_flush(db_session, enabled):
+    product_id = _seed(db_session)
+    cache = ReservationCache()
+    cache.purchase(db_session, product_id, "SKU-OB", 2)
+    cache.flush_all(db_session)
+
+    assert _events(db_session) == [("SKU-OB", "SALE", -2, 3)]
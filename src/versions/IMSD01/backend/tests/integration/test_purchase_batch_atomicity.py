@@ -0,0 +1,42 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.api.errors import InsufficientStockError
+from src.models.alert import Alert
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+from src.services.inventory_service import purchase_many
+
+
+def test_purchase_many_rolls_back_every_line_on_failure(db_session):
+    first_id, second_id = str(uuid4()), str(uuid4())
+    db_session.add_all(
+        [
+            Product(id=first_id, sku="SKU-A1", available_qty=5, low_stock_threshold=5),
+            Product(id=second_id, sku="SKU-A2", available_qty=1, low_stock_threshold=0),
+        ]
+    )
+    db_session.commit()
+
+    with pytest.raises(InsufficientStockError):
+        purchase_many(db_session, [(first_id, "SKU-A1", 2), (second_id, "SKU-A2", 2)])
+
+    stock = dict(db_session.execute(select(Product.sku, Product.available_qty)).all())
+    assert stock == {"SKU-A1": 5, "SKU-A2": 1}
+    assert db_session.execute(select(InventoryLog)).scalars().all() == []
+    assert db_session.execute(select(Alert)).scalars().all() == []
+
+
+def test_purchase_many_writes_one_log_per_line(db_session):
+    product_id = str(uuid4())
+    db_session.add(Product(id=product_id, sku="SKU-A3", available_qty=5, low_stock_threshold=0))
+    db_session.commit()
+
+    results = purchase_many(db_session, [(product_id, "SKU-A3", 1), (product_id, "SKU-A3", 2)])
+
+    assert [result["remaining"] for result in results] == [4, 2]
+    logs = db_session.execute(select(InventoryLog)).scalars().all()
+    assert sorted(log.quantity_delta for log in logs) == [-2, -1]
+    assert {str(log.id) for log in logs} == {result["log_id"] for result in results}
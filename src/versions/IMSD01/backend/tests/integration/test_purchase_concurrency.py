@@ -4,12 +4,12 @@ from concurrent.futures import ThreadPoolExecutor
 from threading import Barrier
 from uuid import uuid4
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, event, select
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 from src.models.product import Product
-from src.services.inventory_service import purchase
+from src.services.inventory_service import purchase, restore
 from src.db.base import Base
 from src.api.errors import InsufficientStockError
 
@@ -62,3 +62,35 @@ def test_concurrent_purchases_only_one_succeeds():
     engine.dispose()
     if os.path.exists(db_path):
         os.remove(db_path)
+
+
+def test_restore_does_not_overwrite_a_concurrent_purchase():
+    fd, db_path = tempfile.mkstemp(prefix="concurrency_test_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", poolclass=NullPool, future=True)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    product_id = str(uuid4())
+    with SessionLocal() as session:
+        session.add(Product(id=product_id, sku="SKU-RACE", available_qty=5, low_stock_threshold=0))
+        session.commit()
+
+    interleaved = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _purchase_between_read_and_write(conn, cursor, statement, *args):
+        # Lands after restore has looked the product up but before it writes stock.
+        if not interleaved and statement.startswith("UPDATE products"):
+            interleaved.append(True)
+            with SessionLocal() as other:
+                purchase(other, product_id, "SKU-RACE", 2)
+
+    with SessionLocal() as session:
+        restore(session, product_id, "SKU-RACE", 1, "cancelled")
+
+    with SessionLocal() as session:
+        assert session.get(Product, product_id).available_qty == 4
+    assert interleaved
+
+    engine.dispose()
+    os.remove(db_path)
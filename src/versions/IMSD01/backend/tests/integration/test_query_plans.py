@@ -0,0 +1,96 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, text, update
+
+from src.db.base import Base
+from src.models.alert import Alert
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+
+PRODUCTS = 20_000
+LOGS_PER_PRODUCT = 5
+
+
+@pytest.fixture(scope="module")
+def seeded_engine():
+    fd, path = tempfile.mkstemp(prefix="query_plan_test_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite+pysqlite:///{path}", future=True)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Product),
+            [
+                {
+                    "id": f"p-{index}",
+                    "sku": f"SKU-{index}",
+                    "available_qty": 100,
+                    "low_stock_threshold": 5,
+                }
+                for index in range(PRODUCTS)
+            ],
+        )
+        conn.execute(
+            insert(InventoryLog),
+            [
+                {
+                    "product_id": f"p-{index}",
+                    "operation": "SALE",
+                    "quantity_delta": -1,
+                }
+                for index in range(PRODUCTS)
+                for n in range(LOGS_PER_PRODUCT)
+            ],
+        )
+        conn.execute(
+            insert(Alert),
+            [
+                {
+                    "id": f"a-{index}",
+                    "product_id": f"p-{index}",
+                    "trigger_type": "LOW_STOCK",
+                    "stock_level": 4,
+                }
+                for index in range(0, PRODUCTS, 4)
+            ],
+        )
+        conn.execute(text("ANALYZE"))
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def _plan(engine, statement) -> list:
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+LOOKUPS = {
+    "purchase_decrement": update(Product)
+    .where(Product.id == "p-42", Product.sku == "SKU-42", Product.available_qty >= 1)
+    .values(available_qty=Product.available_qty - 1),
+    "product_by_id_and_sku": select(Product).where(
+        Product.id == "p-42", Product.sku == "SKU-42"
+    ),
+    "stock_history": select(InventoryLog).where(InventoryLog.product_id == "p-42"),
+    "stock_history_total": select(func.sum(InventoryLog.quantity_delta)).where(
+        InventoryLog.product_id == "p-42"
+    ),
+    "stock_history_since": select(InventoryLog)
+    .where(InventoryLog.product_id == "p-42", InventoryLog.created_at >= "2026-01-01")
+    .order_by(InventoryLog.created_at),
+    "alerts_for_product": select(Alert).where(Alert.product_id == "p-40"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(LOOKUPS))
+def test_lookup_does_not_fall_back_to_full_scan(seeded_engine, name):
+    plan = _plan(seeded_engine, LOOKUPS[name])
+
+    assert plan, f"no plan returned for {name}"
+    assert not [step for step in plan if step.startswith("SCAN")], plan
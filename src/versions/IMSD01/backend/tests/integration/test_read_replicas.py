@@ -0,0 +1,74 @@
+import os
+import tempfile
+from contextlib import ExitStack, contextmanager
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+
+from src.db.base import Base
+from src.db.routing import READ_FALLBACKS, ReaderPool, RoutingSessionMaker
+from src.models.product import Product
+from src.services import inventory_service
+from src.services.stock_cache import load_stock
+
+
+@contextmanager
+def _sqlite_engine():
+    fd, path = tempfile.mkstemp(prefix="inventory_replica_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite+pysqlite:///{path}", future=True)
+    Base.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def _seed(engine, product_id: str, available_qty: int) -> None:
+    with RoutingSessionMaker(engine, ReaderPool([]))() as session:
+        session.add(
+            Product(id=product_id, sku="SKU-RR", available_qty=available_qty, low_stock_threshold=0)
+        )
+        session.commit()
+
+
+def test_reads_go_round_robin_to_readers_and_writes_to_the_writer():
+    with ExitStack() as stack:
+        writer, first, second = (stack.enter_context(_sqlite_engine()) for _ in range(3))
+        product_id = str(uuid4())
+        for engine, available_qty in ((writer, 10), (first, 7), (second, 8)):
+            _seed(engine, product_id, available_qty)
+        SessionLocal = RoutingSessionMaker(writer, ReaderPool([first, second]))
+
+        with SessionLocal() as session:
+            inventory_service.purchase(session, product_id, "SKU-RR", 4)
+
+        seen = []
+        for _ in range(4):
+            with SessionLocal(read_only=True) as session:
+                seen.append(load_stock(session, [product_id])[product_id].available_qty)
+        with SessionLocal() as session:
+            assert load_stock(session, [product_id])[product_id].available_qty == 6
+
+    assert seen == [7, 8, 7, 8]
+
+
+def test_reader_that_fails_its_health_check_is_skipped_until_rechecked():
+    with _sqlite_engine() as writer, _sqlite_engine() as reader:
+        broken = create_engine("sqlite+pysqlite:////nonexistent/dir/replica.db", future=True)
+        now = [0.0]
+        readers = ReaderPool([broken, reader], health_interval=5.0, clock=lambda: now[0])
+        SessionLocal = RoutingSessionMaker(writer, readers)
+
+        assert [readers.pick() for _ in range(3)] == [reader, reader, reader]
+
+        reader.dispose()
+        readers._mark(1, False)
+        fallbacks = READ_FALLBACKS.value()
+        with SessionLocal(read_only=True) as session:
+            assert session.get_bind() is writer
+        assert READ_FALLBACKS.value() - fallbacks == 1
+
+        now[0] = 5.0
+        assert readers.pick() is reader
@@ -0,0 +1,142 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.api.errors import InsufficientStockError
+from src.db.base import Base
+from src.models.alert import Alert
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+from src.models.stock_reservation import StockReservation
+from src.services.reservation_cache import ReservationCache
+
+
+def _seed(db_session, available_qty: int, threshold: int = 0) -> str:
+    product_id = str(uuid4())
+    db_session.add(
+        Product(
+            id=product_id,
+            sku="SKU-HOT",
+            available_qty=available_qty,
+            low_stock_threshold=threshold,
+        )
+    )
+    db_session.commit()
+    return product_id
+
+
+def test_purchases_are_written_behind_on_flush(db_session):
+    product_id = _seed(db_session, 10, threshold=7)
+    cache = ReservationCache()
+
+    first = cache.purchase(db_session, product_id, "SKU-HOT", 2)
+    second = cache.purchase(db_session, product_id, "SKU-HOT", 1)
+
+    assert (first["remaining"], second["remaining"]) == (8, 7)
+    assert db_session.execute(select(Product.available_qty)).scalar_one() == 10
+
+    assert cache.flush_all(db_session) == 2
+
+    assert db_session.execute(select(Product.available_qty)).scalar_one() == 7
+    logs = db_session.execute(select(InventoryLog)).scalars().all()
+    assert sorted(log.quantity_delta for log in logs) == [-2, -1]
+    assert {log.operation for log in logs} == {"SALE"}
+    assert db_session.execute(select(StockReservation)).scalars().all() == []
+    alert = db_session.execute(select(Alert)).scalar_one()
+    assert alert.stock_level == 7
+
+
+def test_restart_reconciles_pending_journal_without_overselling(db_session):
+    product_id = _seed(db_session, 3)
+    cache = ReservationCache()
+    cache.purchase(db_session, product_id, "SKU-HOT", 2)
+    with pytest.raises(InsufficientStockError):
+        cache.purchase(db_session, product_id, "SKU-HOT", 2)
+
+    restarted = ReservationCache()
+    assert restarted.reconcile(db_session) == 1
+    assert db_session.execute(select(Product.available_qty)).scalar_one() == 1
+    db_session.commit()
+
+    with pytest.raises(InsufficientStockError):
+        restarted.purchase(db_session, product_id, "SKU-HOT", 2)
+    restarted.restore(db_session, product_id, "SKU-HOT", 1, "cancelled")
+    assert restarted.purchase(db_session, product_id, "SKU-HOT", 2)["remaining"] == 0
+
+
+def test_replayed_order_is_not_reserved_twice(db_session):
+    product_id = _seed(db_session, 10)
+    cache = ReservationCache()
+    order_id = str(uuid4())
+
+    first = cache.purchase(db_session, product_id, "SKU-HOT", 4, order_id)
+    replay = cache.purchase(db_session, product_id, "SKU-HOT", 4, order_id)
+
+    assert replay == first
+    assert cache.store.get(product_id) == 6
+    assert len(db_session.execute(select(StockReservation)).scalars().all()) == 1
+
+
+
+def test_caller_rollback_gives_back_reserved_counters(db_session):
+    product_id = _seed(db_session, 10)
+    cache = ReservationCache()
+
+    db_session.begin()
+    cache.purchase(db_session, product_id, "SKU-HOT", 4)
+    assert cache.store.get(product_id) == 6
+    db_session.rollback()
+
+    assert cache.store.get(product_id) == 10
+
+    with db_session.begin():
+        cache.purchase(db_session, product_id, "SKU-HOT", 4)
+    db_session.rollback()
+    assert cache.store.get(product_id) == 6
+    assert len(db_session.execute(select(StockReservation)).scalars().all()) == 1
+
+def test_concurrent_reservations_never_oversell():
+    fd, db_path = tempfile.mkstemp(prefix="reservation_test_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite+pysqlite:///{db_path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=NullPool,
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    with SessionLocal() as session:
+        product_id = _seed(session, 5)
+
+    cache = ReservationCache()
+    workers = 20
+    barrier = Barrier(workers)
+
+    def worker():
+        barrier.wait()
+        try:
+            with SessionLocal() as session:
+                cache.purchase(session, product_id, "SKU-HOT", 1)
+            return True
+        except InsufficientStockError:
+            return False
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda _: worker(), range(workers)))
+
+        assert results.count(True) == 5
+        with SessionLocal() as session:
+            cache.flush_all(session)
+            assert session.execute(select(Product.available_qty)).scalar_one() == 0
+    finally:
+        engine.dispose()
+        os.remove(db_path)
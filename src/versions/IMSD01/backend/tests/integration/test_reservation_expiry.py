@@ -0,0 +1,143 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from src.api.errors import IdempotencyConflictError
+from src.db.retry import RetryPolicy, run_with_retries
+from src.models.inventory_log import InventoryLog
+from src.models.order import Order
+from src.models.product import Product
+from src.services import inventory_service, order_reservations
+from src.services.idempotency import idempotency_keys
+from src.services.reservation_cache import ReservationCache
+
+LATER = datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+def _seed(session, available_qty: int = 10) -> str:
+    product_id = str(uuid4())
+    session.add(
+        Product(id=product_id, sku="SKU-RES", available_qty=available_qty, low_stock_threshold=0)
+    )
+    session.commit()
+    return product_id
+
+
+def _stock(session, product_id: str) -> int:
+    session.expire_all()
+    return session.get(Product, product_id).available_qty
+
+
+def test_sweeper_expires_only_unconfirmed_reservations_in_batches(db_session):
+    product_id = _seed(db_session)
+    order_ids = [str(uuid4()) for _ in range(4)]
+    for order_id in order_ids:
+        order_reservations.reserve(db_session, order_id, product_id, "SKU-RES", 2, ttl_seconds=60)
+    order_reservations.confirm(db_session, order_ids[0])
+    assert _stock(db_session, product_id) == 2
+
+    assert order_reservations.expire_batch(db_session, 2) == 0
+    assert order_reservations.expire_batch(db_session, 2, now=LATER) == 2
+    assert order_reservations.expire_all(db_session, 2, now=LATER) == 1
+
+    statuses = dict(db_session.execute(select(Order.id, Order.status)).all())
+    assert statuses == {
+        order_ids[0]: "ACTIVE",
+        order_ids[1]: "EXPIRED",
+        order_ids[2]: "EXPIRED",
+        order_ids[3]: "EXPIRED",
+    }
+    assert _stock(db_session, product_id) == 8
+    returns = db_session.execute(
+        select(InventoryLog.quantity_delta).where(InventoryLog.operation == "RETURN")
+    ).scalars()
+    assert list(returns) == [2, 2, 2]
+
+
+def test_cancelled_reservation_is_not_restored_again_on_expiry(db_session):
+    product_id = _seed(db_session)
+    order_id = str(uuid4())
+    order_reservations.reserve(db_session, order_id, product_id, "SKU-RES", 3, ttl_seconds=60)
+    inventory_service.restore(db_session, product_id, "SKU-RES", 3, "cancelled", order_id)
+
+    assert order_reservations.expire_all(db_session, 10, now=LATER) == 1
+    assert _stock(db_session, product_id) == 10
+
+
+@pytest.fixture()
+def cached_stock(monkeypatch):
+    cache = ReservationCache()
+    monkeypatch.setattr(order_reservations, "stock", cache)
+    idempotency_keys.clear()
+    yield cache
+    idempotency_keys.clear()
+
+
+def _due_order(session, product_id: str, sku: str, quantity: int) -> str:
+    order_id = str(uuid4())
+    session.add(
+        Order(
+            id=order_id,
+            product_id=product_id,
+            sku=sku,
+            requested_qty=quantity,
+            status="RESERVED",
+            expires_at=datetime.now(timezone.utc),
+        )
+    )
+    session.commit()
+    return order_id
+
+
+def test_failed_order_in_a_sweep_keeps_the_others_stock_release(db_session, cached_stock):
+    product_id = _seed(db_session)
+    order_reservations.reserve(db_session, "o1", product_id, "SKU-RES", 3, ttl_seconds=0)
+    _due_order(db_session, product_id, "SKU-GONE", 2)
+    assert cached_stock.store.get(product_id) == 7
+
+    assert order_reservations.expire_batch(db_session, 10, now=LATER) == 2
+
+    assert cached_stock.store.get(product_id) == 10
+    cached_stock.flush_all(db_session)
+    assert _stock(db_session, product_id) == 10
+
+
+def test_rolled_back_sweep_restores_stock_when_retried(db_session, cached_stock):
+    product_id = _seed(db_session)
+    order_reservations.reserve(db_session, "o1", product_id, "SKU-RES", 3, ttl_seconds=0)
+    attempts = []
+
+    def _sweep_then_deadlock(session):
+        attempts.append(1)
+        session.begin()
+        expired = order_reservations.expire_batch(session, 10, now=LATER)
+        if len(attempts) == 1:
+            raise OperationalError("UPDATE", {}, sqlite3.OperationalError("database is locked"))
+        session.commit()
+        return expired
+
+    policy = RetryPolicy(budget=1, base_delay=0, max_delay=0)
+    assert run_with_retries(db_session, "sweep", _sweep_then_deadlock, policy=policy) == 1
+
+    assert len(attempts) == 2
+    assert cached_stock.store.get(product_id) == 10
+    cached_stock.flush_all(db_session)
+    assert _stock(db_session, product_id) == 10
+    status = db_session.execute(select(Order.status).where(Order.id == "o1")).scalar_one()
+    assert status == "EXPIRED"
+
+
+def test_reserving_an_existing_order_for_a_different_request_conflicts(db_session):
+    product_id = _seed(db_session)
+    order_reservations.reserve(db_session, "o1", product_id, "SKU-RES", 3, ttl_seconds=60)
+
+    with pytest.raises(IdempotencyConflictError):
+        order_reservations.reserve(db_session, "o1", product_id, "SKU-RES", 5, ttl_seconds=60)
+    replay = order_reservations.reserve(db_session, "o1", product_id, "SKU-RES", 3)
+
+    assert replay["remaining"] == 7
+    assert _stock(db_session, product_id) == 7
@@ -0,0 +1,94 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.api.errors import InsufficientStockError
+from src.db.base import Base
+from src.models.product import Product
+from src.models.product_stock_shard import ProductStockShard
+from src.services import sharded_stock
+from src.services.inventory_service import purchase, restore
+
+
+def _seed_sharded(session, available_qty: int, shards: int) -> str:
+    product_id = str(uuid4())
+    session.add(
+        Product(
+            id=product_id,
+            sku="SKU-SHARD",
+            available_qty=available_qty,
+            low_stock_threshold=2,
+        )
+    )
+    session.commit()
+    sharded_stock.enable_sharding(session, product_id, shards)
+    return product_id
+
+
+def test_sharded_purchase_and_restore_aggregate_shards(db_session):
+    product_id = _seed_sharded(db_session, 10, shards=4)
+    shard_levels = db_session.execute(
+        select(ProductStockShard.available_qty).order_by(ProductStockShard.shard_no)
+    ).scalars().all()
+    assert shard_levels == [3, 3, 2, 2]
+
+    assert purchase(db_session, product_id, "SKU-SHARD", 1)["remaining"] == 9
+    # Larger than any single shard, so it has to drain several.
+    result = purchase(db_session, product_id, "SKU-SHARD", 7)
+    assert result["remaining"] == 2
+    assert result["alert_id"] is not None
+    with pytest.raises(InsufficientStockError, match="available 2"):
+        purchase(db_session, product_id, "SKU-SHARD", 3)
+
+    assert restore(db_session, product_id, "SKU-SHARD", 3, "cancelled")["remaining"] == 5
+
+    sharded_stock.disable_sharding(db_session, product_id)
+    db_session.commit()
+    product = db_session.execute(select(Product)).scalar_one()
+    assert (product.available_qty, product.stock_shards) == (5, 0)
+    assert db_session.execute(select(ProductStockShard)).scalars().all() == []
+
+
+def test_concurrent_sharded_purchases_never_oversell():
+    fd, db_path = tempfile.mkstemp(prefix="sharded_test_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite+pysqlite:///{db_path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=NullPool,
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    with SessionLocal() as session:
+        product_id = _seed_sharded(session, 10, shards=4)
+
+    workers = 30
+    barrier = Barrier(workers)
+
+    def worker():
+        barrier.wait()
+        try:
+            with SessionLocal() as session:
+                purchase(session, product_id, "SKU-SHARD", 1)
+            return True
+        except InsufficientStockError:
+            return False
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda _: worker(), range(workers)))
+
+        assert results.count(True) == 10
+        with SessionLocal() as session:
+            assert sharded_stock.total_available(session, product_id) == 0
+    finally:
+        engine.dispose()
+        os.remove(db_path)
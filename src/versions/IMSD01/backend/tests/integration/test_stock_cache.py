@@ -0,0 +1,81 @@
+from uuid import uuid4
+
+from src.models.product import Product
+from src.services import inventory_service, sharded_stock
+from src.services import stock_cache as stock_cache_module
+from src.services.reservation_cache import ReservationCache
+from src.services.stock_cache import HITS, MISSES, StockCache, stock_cache
+
+
+def _seed(session, available_qty: int) -> str:
+    product_id = str(uuid4())
+    session.add(
+        Product(
+            id=product_id,
+            sku=f"SKU-{product_id[:8]}",
+            available_qty=available_qty,
+            low_stock_threshold=2,
+        )
+    )
+    session.commit()
+    return product_id
+
+
+def test_batch_lookup_caches_until_a_committed_purchase(db_session):
+    plain = _seed(db_session, 10)
+    sharded = _seed(db_session, 9)
+    sharded_stock.enable_sharding(db_session, sharded, 3)
+    hits, misses = HITS.value(), MISSES.value()
+
+    first = stock_cache.get_many(db_session, [plain, sharded, "missing"])
+    again = stock_cache.get_many(db_session, [plain, sharded])
+
+    assert {pid: stock.available_qty for pid, stock in first.items()} == {plain: 10, sharded: 9}
+    assert again == first
+    assert (HITS.value() - hits, MISSES.value() - misses) == (2, 3)
+
+    # The lookups above opened a transaction, so the purchase runs in a savepoint and
+    # the cache is only invalidated once the outer transaction commits.
+    inventory_service.purchase(db_session, plain, f"SKU-{plain[:8]}", 4)
+    assert stock_cache.get(db_session, plain).available_qty == 10
+    db_session.commit()
+
+    assert stock_cache.get(db_session, plain).available_qty == 6
+    assert stock_cache.get(db_session, sharded).available_qty == 9
+
+
+def test_load_that_raced_an_invalidation_is_not_cached(db_session, monkeypatch):
+    product_id = _seed(db_session, 5)
+    cache = StockCache(ttl=60)
+    load_stock = stock_cache_module.load_stock
+
+    def _load_then_commit_elsewhere(session, product_ids):
+        rows = load_stock(session, product_ids)
+        cache.invalidate(product_ids)
+        return rows
+
+    monkeypatch.setattr(stock_cache_module, "load_stock", _load_then_commit_elsewhere)
+    assert cache.get(db_session, product_id).available_qty == 5
+    monkeypatch.undo()
+
+    misses = MISSES.value()
+    cache.get(db_session, product_id)
+    assert MISSES.value() - misses == 1
+
+
+def test_unflushed_reservations_count_against_stock(db_session):
+    product_id = _seed(db_session, 10)
+    sku = f"SKU-{product_id[:8]}"
+    cache = ReservationCache()
+    assert stock_cache.get(db_session, product_id).available_qty == 10
+    db_session.commit()
+
+    cache.purchase(db_session, product_id, sku, 4)
+    assert stock_cache.get(db_session, product_id).available_qty == 6
+    db_session.commit()
+    cache.restore(db_session, product_id, sku, 1, "cancelled")
+    assert stock_cache.get(db_session, product_id).available_qty == 7
+
+    db_session.commit()
+    assert cache.flush_all(db_session) == 2
+    assert stock_cache.get(db_session, product_id).available_qty == 7
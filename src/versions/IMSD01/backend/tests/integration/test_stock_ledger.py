@@ -0,0 +1,52 @@
+from uuid import uuid4
+
+from sqlalchemy import update
+
+from src.models.product import Product
+from src.services import ledger, sharded_stock
+from src.services.inventory_service import purchase, purchase_many, restore
+
+
+def _seed(session, available_qty: int) -> str:
+    product_id = str(uuid4())
+    session.add(
+        Product(
+            id=product_id,
+            sku=f"SKU-{product_id[:8]}",
+            available_qty=available_qty,
+            low_stock_threshold=0,
+        )
+    )
+    session.commit()
+    return product_id
+
+
+def test_stock_is_rebuilt_from_snapshot_plus_later_logs(db_session):
+    plain = _seed(db_session, 20)
+    sharded = _seed(db_session, 12)
+    purchase(db_session, plain, f"SKU-{plain[:8]}", 3)
+    sharded_stock.enable_sharding(db_session, sharded, 3)
+
+    assert ledger.take_snapshots(db_session, [plain, sharded]) == 2
+
+    purchase_many(db_session, [(plain, f"SKU-{plain[:8]}", 2), (sharded, f"SKU-{sharded[:8]}", 5)])
+    restore(db_session, plain, f"SKU-{plain[:8]}", 1, "cancelled")
+
+    assert ledger.rebuild_stock(db_session, [plain, sharded]) == {plain: 16, sharded: 7}
+    assert ledger.audit(db_session, [plain, sharded]) == []
+
+
+def test_audit_reports_drift_in_chunks(db_session):
+    product_ids = sorted(_seed(db_session, 10) for _ in range(5))
+    for chunk in ledger.product_id_chunks(db_session, chunk_size=2):
+        ledger.take_snapshots(db_session, chunk)
+    db_session.execute(update(Product).where(Product.id == product_ids[3]).values(available_qty=4))
+    db_session.commit()
+
+    drift = [
+        item
+        for chunk in ledger.product_id_chunks(db_session, chunk_size=2)
+        for item in ledger.audit(db_session, chunk)
+    ]
+
+    assert drift == [ledger.Drift(product_ids[3], expected=10, actual=4)]
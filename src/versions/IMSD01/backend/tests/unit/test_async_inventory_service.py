@@ -0,0 +1,102 @@
+import asyncio
+import os
+import tempfile
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api.routes import inventory_async
+from src.db.async_session import get_async_session
+from src.db.base import Base
+from src.models.inventory_log import InventoryLog
+from src.models.product import Product
+from src.services import async_inventory_service
+
+
+@pytest.fixture()
+def async_session_factory():
+    fd, path = tempfile.mkstemp(prefix="inventory_async_test_", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def _create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(_create_schema())
+    try:
+        yield async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    finally:
+        asyncio.run(engine.dispose())
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _seed(factory, available_qty: int) -> str:
+    product_id = str(uuid4())
+
+    async def _insert():
+        async with factory() as session:
+            session.add(
+                Product(
+                    id=product_id,
+                    sku="SKU-ASYNC",
+                    available_qty=available_qty,
+                    low_stock_threshold=1,
+                )
+            )
+            await session.commit()
+
+    asyncio.run(_insert())
+    return product_id
+
+
+def test_async_purchase_and_restore(async_session_factory):
+    product_id = _seed(async_session_factory, 10)
+
+    async def _flow():
+        async with async_session_factory() as session:
+            bought = await async_inventory_service.purchase(session, product_id, "SKU-ASYNC", 4)
+            restored = await async_inventory_service.restore(
+                session, product_id, "SKU-ASYNC", 1, "cancelled"
+            )
+            logs = (await session.execute(select(InventoryLog))).scalars().all()
+            return bought, restored, logs
+
+    bought, restored, logs = asyncio.run(_flow())
+
+    assert bought["remaining"] == 6
+    assert restored["remaining"] == 7
+    assert sorted(log.operation for log in logs) == ["RESTOCK", "SALE"]
+
+
+def test_async_purchase_route(async_session_factory):
+    product_id = _seed(async_session_factory, 5)
+    app = FastAPI()
+    app.include_router(inventory_async.router, prefix="/inventory")
+
+    async def _get_session_override():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = _get_session_override
+    with TestClient(app) as client:
+        resp = client.post(
+            "/inventory/purchase",
+            json={
+                "order_id": str(uuid4()),
+                "product_id": product_id,
+                "sku": "SKU-ASYNC",
+                "quantity": 2,
+            },
+        )
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["remaining"] == 3
@@ -0,0 +1,18 @@
+import time
+from uuid import UUID
+
+from src.db.ids import new_id
+
+
+def test_new_id_is_a_uuid7_that_sorts_by_creation_time():
+    first = new_id()
+    time.sleep(0.002)
+    second = new_id()
+
+    parsed = UUID(first)
+    assert parsed.version == 7
+    assert parsed.variant == "specified in RFC 4122"
+    assert str(parsed) == first
+    assert abs((parsed.int >> 80) - time.time_ns() // 1_000_000) < 5_000
+    assert first < second
+    assert len({new_id() for _ in range(1000)}) == 1000
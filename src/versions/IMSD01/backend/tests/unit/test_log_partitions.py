@@ -0,0 +1,88 @@
+from datetime import date
+
+from src.services import log_archive
+
+from src.db.partitions import (
+    add_months,
+    LogPartition,
+    create_partition_sql,
+    detach_partition_sql,
+    parse_partition_name,
+    partition_name,
+)
+
+
+def test_monthly_partition_bounds_roll_over_the_year():
+    start = date(2026, 12, 1)
+
+    assert add_months(start, 1) == date(2027, 1, 1)
+    assert add_months(start, -12) == date(2025, 12, 1)
+    assert partition_name(start) == "inventory_logs_2026_12"
+    assert parse_partition_name("inventory_logs_2026_12") == start
+    assert parse_partition_name("inventory_logs_default") is None
+    assert create_partition_sql(date(2026, 12, 17)) == (
+        "CREATE TABLE IF NOT EXISTS inventory_logs_2026_12 PARTITION OF inventory_logs "
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execution_options(self, **options):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def exec_driver_sql(self, sql, *args):
+        self.statements.append(sql)
+
+
+class _FakeEngine:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def connect(self):
+        return self.conn
+
+
+def test_detach_is_only_concurrent_without_a_default_partition(monkeypatch, tmp_path):
+    # Postgres rejects DETACH ... CONCURRENTLY while a default partition exists.
+    assert detach_partition_sql("inventory_logs_2026_01", concurrently=False) == (
+        "ALTER TABLE inventory_logs DETACH PARTITION inventory_logs_2026_01"
+    )
+    assert detach_partition_sql("inventory_logs_2026_01", concurrently=True).endswith(
+        " CONCURRENTLY"
+    )
+
+    old = LogPartition("inventory_logs_2026_01", date(2026, 1, 1), True, False)
+    current = LogPartition("inventory_logs_2026_09", date(2026, 9, 1), True, False)
+    monkeypatch.setattr(log_archive, "log_partitions", lambda conn: [old, current])
+    detached = []
+    monkeypatch.setattr(
+        log_archive,
+        "_archive_partition",
+        lambda conn, partition, output_dir, concurrently: detached.append(
+            (partition.name, concurrently)
+        ),
+    )
+
+    for has_default in (True, False):
+        conn = _FakeConnection()
+        monkeypatch.setattr(log_archive, "has_default_partition", lambda conn: has_default)
+        log_archive.archive_partitions(_FakeEngine(conn), date(2026, 6, 1), tmp_path)
+        if has_default:
+            assert conn.statements == [
+                f"SET lock_timeout = '{log_archive.DETACH_LOCK_TIMEOUT}'",
+                "RESET lock_timeout",
+            ]
+        else:
+            assert conn.statements == []
+
+    assert detached == [("inventory_logs_2026_01", False), ("inventory_logs_2026_01", True)]
@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+from sqlalchemy import create_engine, text
+
+from src.db.pool_metrics import (
+    CHECKOUT_SECONDS,
+    IN_USE,
+    OVERFLOW,
+    instrumented_pool_class,
+    register_pool_gauges,
+)
+
+
+def test_pool_checkout_latency_and_usage_are_recorded():
+    fd, path = tempfile.mkstemp(prefix="pool_metrics_test_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite+pysqlite:///{path}",
+        poolclass=instrumented_pool_class("test"),
+        pool_size=1,
+        max_overflow=1,
+    )
+    register_pool_gauges(engine, "test")
+    before = CHECKOUT_SECONDS.count(pool="test")
+    try:
+        with engine.connect() as first, engine.connect() as second:
+            first.execute(text("SELECT 1"))
+            second.execute(text("SELECT 1"))
+            assert IN_USE.value(pool="test") == 2
+            assert OVERFLOW.value(pool="test") == 1
+        assert IN_USE.value(pool="test") == 0
+        assert CHECKOUT_SECONDS.count(pool="test") == before + 2
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def test_metrics_endpoint_exposes_pool_metrics(client):
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert "# TYPE db_pool_checkout_seconds histogram" in resp.text
+    assert 'db_pool_in_use{pool="primary"}' in resp.text
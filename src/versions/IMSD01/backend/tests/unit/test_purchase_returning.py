@@ -0,0 +1,64 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from src.api.errors import InsufficientStockError, ValidationError
+from src.models.product import Product
+from src.services import inventory_service
+from src.services.inventory_service import purchase
+
+
+def _seed(db_session, available_qty: int = 10) -> str:
+    product_id = str(uuid4())
+    db_session.add(
+        Product(
+            id=product_id,
+            sku="SKU-RET",
+            available_qty=available_qty,
+            low_stock_threshold=1,
+        )
+    )
+    db_session.commit()
+    return product_id
+
+
+def _capture_statements(db_session) -> list:
+    statements = []
+    engine = db_session.get_bind()
+
+    def _before(_conn, _cursor, statement, _params, _context, _executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", _before)
+    return statements
+
+
+def test_purchase_decrements_and_reads_back_in_one_statement(db_session):
+    product_id = _seed(db_session)
+    statements = _capture_statements(db_session)
+
+    result = purchase(db_session, product_id, "SKU-RET", 3)
+
+    assert result["remaining"] == 7
+    assert statements == ["UPDATE", "INSERT"]
+
+
+def test_purchase_falls_back_without_returning(db_session, monkeypatch):
+    product_id = _seed(db_session)
+    monkeypatch.setattr(inventory_service, "_supports_returning", lambda _session: False)
+    statements = _capture_statements(db_session)
+
+    result = purchase(db_session, product_id, "SKU-RET", 3)
+
+    assert result["remaining"] == 7
+    assert statements == ["SELECT", "UPDATE", "SELECT", "INSERT"]
+
+
+def test_returning_path_reports_missing_and_insufficient(db_session):
+    product_id = _seed(db_session, available_qty=2)
+
+    with pytest.raises(InsufficientStockError, match="available 2"):
+        purchase(db_session, product_id, "SKU-RET", 3)
+    with pytest.raises(ValidationError, match="Product not found"):
+        purchase(db_session, product_id, "SKU-OTHER", 1)
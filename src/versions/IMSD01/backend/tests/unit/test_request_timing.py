@@ -0,0 +1,55 @@
+import dataclasses
+import logging
+import threading
+from uuid import uuid4
+
+from src.models.product import Product
+from src.observability import request_timing
+from src.observability.profiler import SamplingProfiler
+from src.observability.request_timing import REQUEST_QUERIES, REQUEST_SECONDS
+
+
+def test_requests_report_route_latency_and_query_time(client, db_session, monkeypatch, caplog):
+    product_id = str(uuid4())
+    db_session.add(Product(id=product_id, sku="SKU-TM", available_qty=5, low_stock_threshold=0))
+    db_session.commit()
+    monkeypatch.setattr(
+        request_timing, "settings", dataclasses.replace(request_timing.settings, slow_query_ms=0)
+    )
+    route = "/inventory/purchase"
+    payload = {"order_id": str(uuid4()), "product_id": product_id, "sku": "SKU-TM", "quantity": 1}
+    before = REQUEST_SECONDS.count(method="POST", route=route, status="200")
+
+    with caplog.at_level(logging.WARNING, logger=request_timing.__name__):
+        resp = client.post(route, json=payload)
+
+    assert resp.status_code == 200
+    assert 'desc="' in resp.headers["server-timing"]
+    assert "queries" in resp.headers["server-timing"]
+    assert REQUEST_SECONDS.count(method="POST", route=route, status="200") == before + 1
+    assert REQUEST_QUERIES.count(route=route) >= 1
+    assert any(f"route={route}" in record.getMessage() for record in caplog.records)
+
+
+def test_profiler_collapses_sampled_stacks():
+    stop = threading.Event()
+
+    def _busy_checkout():
+        while not stop.is_set():
+            pass
+
+    worker = threading.Thread(target=_busy_checkout)
+    worker.start()
+    profiler = SamplingProfiler()
+    try:
+        for _ in range(5):
+            profiler.sample()
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = [line for line in profiler.collapsed() if "_busy_checkout" in line]
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.startswith("threading.py:_bootstrap;")
+    assert int(count) >= 1
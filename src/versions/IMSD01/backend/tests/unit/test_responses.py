@@ -0,0 +1,40 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from src.api import responses
+from src.models.product import Product
+
+
+def test_purchase_response_keeps_the_envelope_shape(client, db_session):
+    product_id = str(uuid4())
+    db_session.add(Product(id=product_id, sku="SKU-RS", available_qty=3, low_stock_threshold=5))
+    db_session.commit()
+
+    resp = client.post(
+        "/inventory/purchase",
+        json={"order_id": str(uuid4()), "product_id": product_id, "sku": "SKU-RS", "quantity": 1},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    body = resp.json()
+    assert body["status"] == "success"
+    assert body["error"] is None
+    assert set(body["data"]) == {"product_id", "sku", "deducted", "remaining", "log_id", "alert_id"}
+    assert body["data"]["remaining"] == 2
+    assert body["data"]["alert_id"] is not None
+
+
+def test_success_falls_back_to_stdlib_json(monkeypatch):
+    expires_at = datetime(2026, 10, 18, 12, 30, 5, 250000, tzinfo=timezone.utc)
+    data = {"product_id": "p-1", "sku": "SKU-ü", "alert_id": None, "expires_at": expires_at}
+    with_orjson = responses.success(data).body
+    monkeypatch.setattr(responses, "orjson", None)
+
+    assert responses.success(data).body == with_orjson
+    assert json.loads(with_orjson) == {
+        "status": "success",
+        "data": {**data, "expires_at": "2026-10-18T12:30:05.250000+00:00"},
+        "error": None,
+    }
@@ -0,0 +1,62 @@
+from sqlalchemy import text
+
+from src.db.session_hooks import after_commit, after_rollback
+
+
+def test_callbacks_wait_for_the_outermost_commit(db_session):
+    ran = []
+    with db_session.begin():
+        after_commit(db_session, lambda: ran.append("outer"))
+        with db_session.begin_nested():
+            after_commit(db_session, lambda: ran.append("released"))
+        assert ran == []
+    assert ran == ["outer", "released"]
+
+
+def test_savepoint_rollback_drops_only_its_own_callbacks(db_session):
+    ran = []
+    with db_session.begin():
+        after_commit(db_session, lambda: ran.append("outer"))
+        try:
+            with db_session.begin_nested():
+                after_commit(db_session, lambda: ran.append("rolled back"))
+                db_session.execute(text("SELECT 1"))
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        with db_session.begin_nested():
+            after_commit(db_session, lambda: ran.append("released"))
+    assert ran == ["outer", "released"]
+
+
+def test_outer_rollback_drops_released_savepoint_callbacks(db_session):
+    ran = []
+    db_session.begin()
+    with db_session.begin_nested():
+        after_commit(db_session, lambda: ran.append("released"))
+    db_session.rollback()
+    after_commit(db_session, lambda: ran.append("no transaction"))
+    assert ran == ["no transaction"]
+
+
+def test_rollback_callbacks_follow_released_savepoints_until_the_outer_commit(db_session):
+    ran = []
+    db_session.begin()
+    with db_session.begin_nested():
+        after_rollback(db_session, lambda: ran.append("released"))
+    try:
+        with db_session.begin_nested():
+            after_rollback(db_session, lambda: ran.append("rolled back"))
+            db_session.execute(text("SELECT 1"))
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert ran == ["rolled back"]
+    db_session.rollback()
+    assert ran == ["rolled back", "released"]
+
+    with db_session.begin():
+        after_rollback(db_session, lambda: ran.append("committed"))
+    after_rollback(db_session, lambda: ran.append("no transaction"))
+    db_session.rollback()
+    assert ran == ["rolled back", "released"]
@@ -0,0 +1,56 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.api.errors import ConcurrencyError
+from src.db import retry
+from src.db.retry import RetryPolicy, is_retryable, run_with_retries
+
+
+class _SerializationFailure(Exception):
+    sqlstate = "40001"
+
+
+def _locked() -> OperationalError:
+    return OperationalError("UPDATE products", {}, sqlite3.OperationalError("database is locked"))
+
+
+def test_retryable_errors_are_classified_per_dialect():
+    assert is_retryable(_locked(), "sqlite")
+    assert is_retryable(OperationalError("UPDATE", {}, _SerializationFailure()), "postgresql")
+    assert not is_retryable(_locked(), "postgresql")
+    assert not is_retryable(IntegrityError("INSERT", {}, sqlite3.IntegrityError("dup")), "sqlite")
+    assert not is_retryable(ValueError("boom"), "sqlite")
+
+
+def test_retries_with_backoff_then_raises_concurrency_error(db_session):
+    sleeps = []
+    now = [0.0]
+    policy = RetryPolicy(budget=0.3, base_delay=0.1, max_delay=0.1, clock=lambda: now[0])
+
+    def _sleep(delay):
+        sleeps.append(delay)
+        now[0] += 0.1
+
+    attempts = []
+
+    def _flaky(_session, succeed_after):
+        attempts.append(1)
+        if len(attempts) <= succeed_after:
+            raise _locked()
+        return "ok"
+
+    before = retry.RETRIES.value(endpoint="test")
+    assert run_with_retries(db_session, "test", _flaky, 2, policy=policy, sleep=_sleep) == "ok"
+    assert len(attempts) == 3
+    assert retry.RETRIES.value(endpoint="test") == before + 2
+    assert all(0 <= delay <= 0.1 for delay in sleeps)
+
+    attempts.clear()
+    now[0] = 0.0
+    exhausted = retry.EXHAUSTED.value(endpoint="test")
+    with pytest.raises(ConcurrencyError):
+        run_with_retries(db_session, "test", _flaky, 100, policy=policy, sleep=_sleep)
+    assert 2 <= len(attempts) <= 4
+    assert retry.EXHAUSTED.value(endpoint="test") == exhausted + 1
@@ -2,29 +2,95 @@ CREATE TABLE IF NOT EXISTS products (
   id TEXT PRIMARY KEY,
   sku TEXT UNIQUE NOT NULL,
   available_qty INTEGER NOT NULL,
-  low_stock_threshold INTEGER NOT NULL
+  low_stock_threshold INTEGER NOT NULL,
+  stock_shards INTEGER NOT NULL DEFAULT 0
 );
 
-CREATE TABLE IF NOT EXISTS inventory_logs (
-  id TEXT PRIMARY KEY,
+CREATE TABLE IF NOT EXISTS product_stock_shards (
   product_id TEXT NOT NULL,
-  operation TEXT NOT NULL,
-  quantity_delta INTEGER NOT NULL
+  shard_no INTEGER NOT NULL,
+  available_qty INTEGER NOT NULL,
+  PRIMARY KEY (product_id, shard_no)
 );
 
+-- operation: 1 = SALE, 2 = RESTOCK, 3 = RETURN. Monthly partitions are created by
+-- `python -m src.cli.archive_logs ensure`; the default partition catches the rest.
+CREATE TABLE IF NOT EXISTS inventory_logs (
+  id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+  product_id TEXT NOT NULL,
+  operation SMALLINT NOT NULL,
+  quantity_delta INTEGER NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS inventory_logs_default PARTITION OF inventory_logs DEFAULT;
+
 CREATE TABLE IF NOT EXISTS orders (
   id TEXT PRIMARY KEY,
   product_id TEXT NOT NULL,
+  sku TEXT,
   requested_qty INTEGER NOT NULL,
-  status TEXT NOT NULL
+  status TEXT NOT NULL,
+  expires_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
 CREATE TABLE IF NOT EXISTS alerts (
   id TEXT PRIMARY KEY,
   product_id TEXT NOT NULL,
   trigger_type TEXT NOT NULL,
-  stock_level INTEGER NOT NULL
+  stock_level INTEGER NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS alert_states (
+  product_id TEXT PRIMARY KEY,
+  last_alert_id TEXT NOT NULL,
+  stock_level INTEGER NOT NULL,
+  alerted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS stock_reservations (
+  id TEXT PRIMARY KEY,
+  product_id TEXT NOT NULL,
+  operation TEXT NOT NULL,
+  quantity_delta INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS stock_snapshots (
+  product_id TEXT PRIMARY KEY,
+  last_log_id BIGINT NOT NULL,
+  available_qty INTEGER NOT NULL,
+  taken_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  order_id TEXT NOT NULL,
+  operation TEXT NOT NULL,
+  request_hash TEXT,
+  result JSON NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (order_id, operation)
 );
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_created_at ON idempotency_keys (created_at);
+
+CREATE TABLE IF NOT EXISTS stock_events (
+  id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  product_id TEXT NOT NULL,
+  sku TEXT NOT NULL,
+  operation SMALLINT NOT NULL,
+  quantity_delta INTEGER NOT NULL,
+  available_qty INTEGER NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_orders_reserved_expires_at
+  ON orders (expires_at) WHERE status = 'RESERVED';
+CREATE INDEX IF NOT EXISTS ix_inventory_logs_product_id_created_at
+  ON inventory_logs (product_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_alerts_product_id_created_at ON alerts (product_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_stock_reservations_product_id ON stock_reservations (product_id);
 
 INSERT INTO products (id, sku, available_qty, low_stock_threshold)
 VALUES
@@ -0,0 +1,74 @@
+"""Scaling of the multiprocess repricing runner across 1, 2, 4 and 8 workers.
+
+Writes N generated carts to a temporary NDJSON file and reprices it with each worker
+count, reporting carts/s and speedup over one worker. Speedup is capped by the cores
+available (printed first).
+
+Usage (from src/versions/PDSD01): python -m backend.benchmarks.bulk_repricing [--carts N]
+                                      [--workers 1,2,4,8] [--chunk-size N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from backend.src.pricing.bulk import CHUNK_SIZE, reprice_file
+from backend.src.pricing.promotions import PromotionDefinition
+
+PROMOTIONS = [PromotionDefinition("PROMO10", 10), PromotionDefinition("FLASH5", 5)]
+PROMOTION_SETS = [[], ["PROMO10"], ["PROMO10", "FLASH5"]]
+CODES = [None, "SAVE100", "WELCOME", "EXPIRED", "UNKNOWN"]
+
+
+def _write_carts(path: str, count: int) -> None:
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as output:
+        for index in range(count):
+            cart = {
+                "cartId": f"cart-{index}",
+                "customerId": f"cust-{rng.randrange(10000)}",
+                "subtotal": rng.randrange(5000),
+                "couponCode": rng.choice(CODES),
+                "promotionIds": rng.choice(PROMOTION_SETS),
+                "usageCount": rng.randrange(2),
+            }
+            output.write(json.dumps(cart) + "\n")
+
+
+def _run(carts: int, worker_counts: list, chunk_size: int) -> list:
+    with tempfile.TemporaryDirectory(prefix="reprice_bench_") as directory:
+        source_path = os.path.join(directory, "carts.ndjson")
+        output_path = os.path.join(directory, "priced.ndjson")
+        _write_carts(source_path, carts)
+        results = []
+        for workers in worker_counts:
+            start = time.perf_counter()
+            with open(source_path, encoding="utf-8") as source, open(
+                output_path, "w", encoding="utf-8"
+            ) as output:
+                reprice_file(source, output, workers, PROMOTIONS, chunk_size=chunk_size)
+            results.append((workers, carts / (time.perf_counter() - start)))
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--carts", type=int, default=1_000_000)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    worker_counts = [int(count) for count in args.workers.split(",")]
+    print(f"cpus: {os.cpu_count()}")
+    results = _run(args.carts, worker_counts, args.chunk_size)
+    baseline = results[0][1]
+    for workers, rate in results:
+        print(f"{workers:>2} workers: {rate:>10,.0f} carts/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
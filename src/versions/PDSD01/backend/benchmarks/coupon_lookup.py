@@ -0,0 +1,59 @@
+"""Coupon lookup cost: the old per-call dict build versus the preloaded catalog.
+
+Times ``default_coupon_lookup`` as it was (three ``CouponDefinition``s and a
+``utcnow()`` per call), the catalog lookup that replaced it with exact and mixed-case
+codes, and a whole ``evaluate_pricing`` call with a coupon.
+
+Usage (from src/versions/PDSD01): python -m backend.benchmarks.coupon_lookup [--calls N]
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from datetime import datetime, timedelta
+from typing import Optional
+
+from backend.src.pricing.catalog import CouponDefinition, default_catalog
+from backend.src.pricing.evaluator import Cart, CartItem, evaluate_pricing
+
+
+def legacy_lookup(code: str) -> Optional[CouponDefinition]:
+    now = datetime.utcnow()
+    coupons = {
+        "SAVE100": CouponDefinition("SAVE100", 100, 500, now + timedelta(days=1), 1),
+        "EXPIRED": CouponDefinition("EXPIRED", 100, 0, now - timedelta(days=1), 1),
+        "WELCOME": CouponDefinition("WELCOME", 100, 0, now + timedelta(days=30), 1),
+    }
+    return coupons.get(code)
+
+
+def _run(calls: int) -> list:
+    cart = Cart(
+        cart_id="cart-bench",
+        customer_id="cust-1",
+        currency="THB",
+        items=[CartItem(product_id="sku-1", quantity=1, unit_price=1000)],
+        subtotal=1000,
+    )
+    cases = (
+        ("legacy dict per call", lambda: legacy_lookup("SAVE100")),
+        ("catalog, exact case", lambda: default_catalog.lookup("SAVE100")),
+        ("catalog, mixed case", lambda: default_catalog.lookup("Save100")),
+        ("evaluate_pricing + coupon", lambda: evaluate_pricing(cart, coupon_code="SAVE100")),
+    )
+    return [
+        (name, min(timeit.repeat(fn, number=calls, repeat=5)) / calls) for name, fn in cases
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    for name, seconds in _run(args.calls):
+        print(f"{name:>26}: {seconds * 1e9:8.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
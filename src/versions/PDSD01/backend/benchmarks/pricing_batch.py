@@ -0,0 +1,84 @@
+"""Carts priced per second: evaluate_pricing in a loop versus evaluate_pricing_batch.
+
+Generates saved carts with a mix of coupon codes and promotion sets, prices a sample of
+them one ``Cart`` at a time and all of them with the columnar batch API, and checks the
+sampled grand totals agree.
+
+Usage (from src/versions/PDSD01): python -m backend.benchmarks.pricing_batch [--carts N]
+                                                                          [--sample N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from backend.src.pricing.batch import evaluate_pricing_batch
+from backend.src.pricing.evaluator import Cart, CartItem, evaluate_pricing
+from backend.src.pricing.promotions import PromotionDefinition
+
+PROMOTION_SETS = [
+    [],
+    [PromotionDefinition("PROMO10", 10)],
+    [PromotionDefinition("PROMO10", 10), PromotionDefinition("FLASH5", 5)],
+]
+CODES = np.array(["", "SAVE100", "WELCOME", "EXPIRED", "UNKNOWN"], dtype=object)
+
+
+def _carts(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(0, 5000, count),
+        CODES[rng.integers(0, len(CODES), count)],
+        rng.integers(-1, len(PROMOTION_SETS), count),
+    )
+
+
+def _scalar(subtotals, codes, set_ids, now) -> list:
+    totals = []
+    for subtotal, code, set_id in zip(subtotals.tolist(), codes.tolist(), set_ids.tolist()):
+        cart = Cart(
+            cart_id="saved",
+            customer_id="cust",
+            currency="THB",
+            items=[CartItem(product_id="sku", quantity=1, unit_price=subtotal)],
+            subtotal=subtotal,
+        )
+        promotions = PROMOTION_SETS[set_id] if set_id >= 0 else None
+        totals.append(evaluate_pricing(cart, code, promotions, now).grand_total)
+    return totals
+
+
+def _run(carts: int, sample: int) -> dict:
+    subtotals, codes, set_ids = _carts(carts)
+    now = datetime.utcnow()
+    sample = min(sample, carts)
+
+    start = time.perf_counter()
+    scalar_totals = _scalar(subtotals[:sample], codes[:sample], set_ids[:sample], now)
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = evaluate_pricing_batch(subtotals, codes, PROMOTION_SETS, set_ids, now)
+    batch_seconds = time.perf_counter() - start
+
+    assert batch.grand_total[:sample].tolist() == scalar_totals
+    return {"scalar": sample / scalar_seconds, "batch": carts / batch_seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--carts", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=100_000, help="carts priced one by one")
+    args = parser.parse_args()
+
+    rates = _run(args.carts, args.sample)
+    print(f"scalar loop: {rates['scalar']:>12,.0f} carts/s")
+    speedup = rates["batch"] / rates["scalar"]
+    print(f"batch:       {rates['batch']:>12,.0f} carts/s ({speedup:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
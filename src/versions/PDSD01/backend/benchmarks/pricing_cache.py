@@ -0,0 +1,77 @@
+"""Pricing request cost with and without the result cache.
+
+Times ``evaluate_request`` for a fixed mix of ``--distinct`` carts, with the cache off,
+cold (every request a miss) and warm (every request a hit), and prints the hit rate
+the warm run saw.
+
+Usage (from src/versions/PDSD01): python -m backend.benchmarks.pricing_cache
+                                      [--distinct N] [--requests N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from backend.src import server
+from backend.src.services.pricing_cache import PricingCache
+
+
+def _requests(distinct: int) -> list:
+    return [
+        {
+            "cart": {
+                "cartId": f"cart-{index}",
+                "customerId": f"cust-{index}",
+                "currency": "THB",
+                "items": [
+                    {"productId": "sku-1", "quantity": 1 + index % 3, "unitPrice": 500},
+                    {"productId": "sku-2", "quantity": 1, "unitPrice": 250},
+                ],
+            },
+            "couponCode": "SAVE100" if index % 2 else "WELCOME",
+            "promotions": [{"promoId": "P10", "percent": 10}],
+        }
+        for index in range(distinct)
+    ]
+
+
+def _time(bodies: list, requests: int) -> float:
+    start = time.perf_counter()
+    for index in range(requests):
+        server.evaluate_request(bodies[index % len(bodies)])
+    return (time.perf_counter() - start) / requests
+
+
+def _run(distinct: int, requests: int) -> list:
+    bodies = _requests(distinct)
+    rows = []
+    server.result_cache = PricingCache(max_entries=0)
+    rows.append(("cache off", _time(bodies, requests)))
+    # Cold: too small to hold the working set, so every request misses.
+    server.result_cache = PricingCache(max_entries=1)
+    rows.append(("cache cold", _time(bodies, requests)))
+    server.result_cache = PricingCache(max_entries=distinct)
+    _time(bodies, distinct)
+    warm = server.result_cache
+    hits_before, misses_before = warm.hits, warm.misses
+    rows.append(("cache warm", _time(bodies, requests)))
+    hit_rate = (warm.hits - hits_before) / (
+        warm.hits - hits_before + warm.misses - misses_before
+    )
+    return rows, hit_rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--distinct", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args()
+
+    rows, hit_rate = _run(args.distinct, args.requests)
+    for name, seconds in rows:
+        print(f"{name:>10}: {seconds * 1e6:8.2f} us/request")
+    print(f"warm hit rate: {hit_rate:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Open-loop load test of the pricing service: latency percentiles at a fixed request rate.
+
+Starts ``python -m backend.src.server`` in a subprocess, then sends POST
+``/pricing/evaluate`` (or ``/pricing/evaluate/batch`` with ``--batch-size``) at
+``--rate`` requests/s over ``--connections`` keep-alive connections. Requests are issued
+on a fixed schedule and latency is measured from the scheduled send time, so a stalled
+server shows up as queueing delay instead of quietly lowering the offered load.
+
+Usage (from src/versions/PDSD01): python -m backend.benchmarks.pricing_server
+                                      [--rate 1000] [--duration 10] [--connections 32]
+                                      [--batch-size N] [--url http://host:port]
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+REQUEST = {
+    "cart": {
+        "cartId": "cart-bench",
+        "customerId": "cust-1",
+        "currency": "THB",
+        "items": [{"productId": "sku-1", "quantity": 2, "unitPrice": 500}],
+    },
+    "couponCode": "SAVE100",
+    "promotions": [{"promoId": "PROMO10", "percent": 10}],
+}
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server() -> tuple:
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.src.server"],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PORT": str(port)},
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            conn.getresponse().read()
+            conn.close()
+            return process, "127.0.0.1", port
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("pricing server did not start")
+
+
+def _worker(host, port, schedule, body, path, latencies, errors, lock) -> None:
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    headers = {"Content-Type": "application/json"}
+    for scheduled in schedule:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            ok = resp.status == 200
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            ok = False
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(elapsed)
+    conn.close()
+
+
+def _run(host, port, rate: float, duration: float, connections: int, batch_size: int) -> dict:
+    if batch_size:
+        path = "/pricing/evaluate/batch"
+        body = json.dumps({"requests": [REQUEST] * batch_size}).encode()
+    else:
+        path, body = "/pricing/evaluate", json.dumps(REQUEST).encode()
+    total = int(rate * duration)
+    start = time.perf_counter() + 0.2
+    schedule = [start + index / rate for index in range(total)]
+    latencies: List[float] = []
+    errors: List[float] = []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(host, port, schedule[index::connections], body, path, latencies, errors, lock),
+        )
+        for index in range(connections)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "errors": len(errors),
+        "achieved_rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=1000.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=0, help="carts per batch request")
+    parser.add_argument("--url", default=None, help="use a running server instead")
+    args = parser.parse_args()
+
+    process: Optional[subprocess.Popen] = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        process, host, port = _start_server()
+    try:
+        result = _run(host, port, args.rate, args.duration, args.connections, args.batch_size)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(
+        f"{result['requests']} requests at {args.rate:.0f}/s offered, "
+        f"{result['achieved_rps']:.0f}/s achieved, {result['errors']} errors"
+    )
+    print(
+        f"latency p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+        f"p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
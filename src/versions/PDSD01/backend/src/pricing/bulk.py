@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple
+
+from .batch import evaluate_pricing_batch
+from .catalog import CouponCatalog, default_catalog
+from .promotions import PromotionDefinition
+
+CHUNK_SIZE = 5000
+
+_pricer: Optional["ChunkPricer"] = None
+
+
+class ChunkPricer:
+    """Prices NDJSON chunks of carts with the batch path; one per worker process.
+
+    Input lines carry ``cartId``, ``subtotal`` and optionally ``couponCode``,
+    ``promotionIds`` and ``usageCount``. Output lines carry ``cartId``, ``grandTotal``,
+    ``promotionDiscount``, ``couponDiscount`` and ``messages``.
+    """
+
+    def __init__(
+        self,
+        promotions: Iterable[PromotionDefinition],
+        coupon_records: Optional[List[Mapping[str, Any]]],
+        evaluation_time: datetime,
+    ):
+        self.promotions = {promo.promo_id: promo for promo in promotions}
+        self.catalog = default_catalog if coupon_records is None else CouponCatalog(coupon_records)
+        self.evaluation_time = evaluation_time
+
+    def _promotion_set(self, promo_ids: Tuple[str, ...]) -> List[PromotionDefinition]:
+        try:
+            return [self.promotions[promo_id] for promo_id in promo_ids]
+        except KeyError as exc:
+            raise ValueError(f"Unknown promotion {exc.args[0]!r}") from None
+
+    def price(self, chunk: str) -> Tuple[int, str]:
+        carts = [json.loads(line) for line in chunk.splitlines()]
+        set_index: Dict[Tuple[str, ...], int] = {}
+        set_ids = [
+            set_index.setdefault(tuple(cart.get("promotionIds") or ()), len(set_index))
+            for cart in carts
+        ]
+        result = evaluate_pricing_batch(
+            [cart["subtotal"] for cart in carts],
+            coupon_codes=[cart.get("couponCode") for cart in carts],
+            promotion_sets=[self._promotion_set(promo_ids) for promo_ids in set_index],
+            promotion_set_ids=set_ids,
+            evaluation_time=self.evaluation_time,
+            usage_counts=[cart.get("usageCount", 0) for cart in carts],
+            coupon_lookup=self.catalog.lookup,
+        )
+        columns = zip(
+            result.grand_total.tolist(),
+            result.promotion_discount.tolist(),
+            result.coupon_discount.tolist(),
+        )
+        lines = [
+            json.dumps(
+                {
+                    "cartId": cart.get("cartId"),
+                    "grandTotal": grand_total,
+                    "promotionDiscount": promotion_discount,
+                    "couponDiscount": coupon_discount,
+                    "messages": result.messages(index),
+                }
+            )
+            + "\n"
+            for index, (cart, (grand_total, promotion_discount, coupon_discount)) in enumerate(
+                zip(carts, columns)
+            )
+        ]
+        return len(lines), "".join(lines)
+
+
+def _init_worker(
+    promotions: List[PromotionDefinition],
+    coupon_records: Optional[List[Mapping[str, Any]]],
+    evaluation_time: datetime,
+) -> None:
+    global _pricer
+    _pricer = ChunkPricer(promotions, coupon_records, evaluation_time)
+
+
+def _price_chunk(chunk: str) -> Tuple[int, str]:
+    return _pricer.price(chunk)
+
+
+def read_chunks(source: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    lines: List[str] = []
+    for line in source:
+        if line.strip():
+            lines.append(line if line.endswith("\n") else line + "\n")
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def reprice_file(
+    source: TextIO,
+    output: TextIO,
+    workers: int,
+    promotions: Iterable[PromotionDefinition] = (),
+    coupon_records: Optional[List[Mapping[str, Any]]] = None,
+    evaluation_time: Optional[datetime] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """Price every cart in ``source`` across ``workers`` processes; returns the cart count.
+
+    Workers get the promotions, coupon records and evaluation time once, when they start,
+    so only raw input and output text crosses process boundaries. Chunks are submitted
+    in input order and written in the same order, with at most two chunks per worker in
+    flight so memory stays flat however large the input is. ``coupon_records`` of
+    ``None`` means the default catalog.
+    """
+    initargs = (list(promotions), coupon_records, evaluation_time or datetime.utcnow())
+    pending: Deque[Future] = deque()
+    priced = 0
+
+    def _write_oldest() -> None:
+        nonlocal priced
+        count, text = pending.popleft().result()
+        output.write(text)
+        priced += count
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+        for chunk in read_chunks(source, chunk_size):
+            pending.append(pool.submit(_price_chunk, chunk))
+            if len(pending) >= workers * 2:
+                _write_oldest()
+        while pending:
+            _write_oldest()
+    return priced
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional
+
+COUPON_QUERY = (
+    "SELECT code, discount_value, minimum_spend, expires_at, usage_limit_per_customer "
+    "FROM coupons"
+)
+
+# Demo coupons used when no catalog file is configured. The old per-call lookup put
+# SAVE100 and WELCOME a day or more ahead of every call and EXPIRED a day behind, so the
+# first two never expire and EXPIRED always has.
+DEFAULT_COUPONS = (
+    {"code": "SAVE100", "discount_value": 100, "minimum_spend": 500, "expires_at": None},
+    {
+        "code": "EXPIRED",
+        "discount_value": 100,
+        "minimum_spend": 0,
+        "expires_at": "2000-01-01T00:00:00",
+    },
+    {"code": "WELCOME", "discount_value": 100, "minimum_spend": 0, "expires_at": None},
+)
+
+
+@dataclass(frozen=True)
+class CouponDefinition:
+    code: str
+    discount_value: int
+    minimum_spend: int
+    expires_at: Optional[datetime]
+    usage_limit_per_customer: Optional[int]
+
+
+def _expires_at(record: Mapping[str, Any]) -> Optional[datetime]:
+    value = record.get("expires_at")
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    # Pricing compares against naive UTC times.
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def coupon_from_record(record: Mapping[str, Any]) -> CouponDefinition:
+    if not record.get("code"):
+        raise ValueError("Coupon record has no code")
+    limit = record.get("usage_limit_per_customer", 1)
+    return CouponDefinition(
+        code=str(record["code"]),
+        discount_value=int(record["discount_value"]),
+        minimum_spend=int(record.get("minimum_spend") or 0),
+        expires_at=_expires_at(record),
+        usage_limit_per_customer=None if limit is None else int(limit),
+    )
+
+
+def _records(data: Any) -> list:
+    # Files hold either a list of coupons or {"coupons": [...]}.
+    if isinstance(data, Mapping):
+        data = data.get("coupons")
+    if not isinstance(data, list):
+        raise ValueError("Coupon catalog must be a list of coupons or {'coupons': [...]}")
+    return data
+
+
+def read_json(path: str | Path) -> list:
+    return _records(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def read_yaml(path: str | Path) -> list:
+    try:
+        import yaml
+    except ImportError as exc:
+        raise RuntimeError("PyYAML is required to load YAML coupon catalogs") from exc
+    return _records(yaml.safe_load(Path(path).read_text(encoding="utf-8")))
+
+
+def read_file(path: str | Path) -> list:
+    if Path(path).suffix.lower() in (".yaml", ".yml"):
+        return read_yaml(path)
+    return read_json(path)
+
+
+def read_rows(connection: Any, query: str = COUPON_QUERY) -> list:
+    """Coupon records from any DB-API connection, one per row of ``query``."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query)
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+class CouponCatalog:
+    """Coupon definitions indexed by case-folded code.
+
+    Lookups read a single immutable mapping without locking. ``reload`` builds the next
+    mapping off to the side and swaps it in with one assignment, so a reader sees either
+    the whole old catalog or the whole new one; a record that fails to parse leaves the
+    current catalog in place. Reloads run one at a time, so a slow reload can never
+    install its catalog over one that finished after it started.
+    """
+
+    def __init__(self, records: Iterable[Mapping[str, Any]] = ()):
+        self._coupons: Mapping[str, CouponDefinition] = MappingProxyType({})
+        self._reload_lock = threading.Lock()
+        self.version = 0
+        self.reload(records)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "CouponCatalog":
+        return cls(read_file(path))
+
+    @classmethod
+    def from_rows(cls, connection: Any, query: str = COUPON_QUERY) -> "CouponCatalog":
+        return cls(read_rows(connection, query))
+
+    def lookup(self, code: str) -> Optional[CouponDefinition]:
+        return self._coupons.get(code.casefold())
+
+    def reload(self, records: Iterable[Mapping[str, Any]]) -> None:
+        # Building under the lock keeps two concurrent reloads from installing out of
+        # order; lookups never take it.
+        with self._reload_lock:
+            coupons = {}
+            for record in records:
+                coupon = coupon_from_record(record)
+                key = coupon.code.casefold()
+                if key in coupons:
+                    raise ValueError(f"Duplicate coupon code {coupon.code!r}")
+                coupons[key] = coupon
+            # The mapping is swapped before the version moves, so anything read under a
+            # new version number always comes from the new mapping.
+            self._coupons = MappingProxyType(coupons)
+            self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._coupons)
+
+    def __contains__(self, code: str) -> bool:
+        return code.casefold() in self._coupons
+
+
+def load_default_catalog() -> CouponCatalog:
+    path = os.getenv("COUPON_CATALOG")
+    if path:
+        return CouponCatalog.from_file(path)
+    return CouponCatalog(DEFAULT_COUPONS)
+
+
+default_catalog = load_default_catalog()
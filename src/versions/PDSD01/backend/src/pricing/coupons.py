@@ -1,21 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Callable, Optional
 
+from .catalog import CouponDefinition, default_catalog
 from .messages import COUPON_APPLIED, COUPON_EXPIRED, MINIMUM_SPEND_NOT_MET, USAGE_LIMIT_REACHED
 
 
-@dataclass(frozen=True)
-class CouponDefinition:
-    code: str
-    discount_value: int
-    minimum_spend: int
-    expires_at: Optional[datetime]
-    usage_limit_per_customer: Optional[int]
-
-
 def validate_minimum_spend(subtotal: int, minimum_spend: int) -> bool:
     return subtotal >= minimum_spend
 
@@ -25,31 +16,7 @@ def is_expired(expires_at: Optional[datetime], now: datetime) -> bool:
 
 
 def default_coupon_lookup(code: str) -> Optional[CouponDefinition]:
-    now = datetime.utcnow()
-    coupons = {
-        "SAVE100": CouponDefinition(
-            code="SAVE100",
-            discount_value=100,
-            minimum_spend=500,
-            expires_at=now + timedelta(days=1),
-            usage_limit_per_customer=1,
-        ),
-        "EXPIRED": CouponDefinition(
-            code="EXPIRED",
-            discount_value=100,
-            minimum_spend=0,
-            expires_at=now - timedelta(days=1),
-            usage_limit_per_customer=1,
-        ),
-        "WELCOME": CouponDefinition(
-            code="WELCOME",
-            discount_value=100,
-            minimum_spend=0,
-            expires_at=now + timedelta(days=30),
-            usage_limit_per_customer=1,
-        ),
-    }
-    return coupons.get(code)
+    return default_catalog.lookup(code)
 
 
 def apply_coupon(
@@ -59,7 +26,15 @@ def apply_coupon(
     usage_count: Optional[Callable[[str], int]] = None,
     coupon_lookup: Callable[[str], Optional[CouponDefinition]] = default_coupon_lookup,
 ) -> tuple[Optional[int], str]:
-    coupon = coupon_lookup(coupon_code)
+    return apply_coupon_definition(subtotal, coupon_lookup(coupon_code), now, usage_count)
+
+
+def apply_coupon_definition(
+    subtotal: int,
+    coupon: Optional[CouponDefinition],
+    now: datetime,
+    usage_count: Optional[Callable[[str], int]] = None,
+) -> tuple[Optional[int], str]:
     if coupon is None:
         return None, MINIMUM_SPEND_NOT_MET
     if is_expired(coupon.expires_at, now):
@@ -67,6 +42,8 @@ def apply_coupon(
     if not validate_minimum_spend(subtotal, coupon.minimum_spend):
         return None, MINIMUM_SPEND_NOT_MET
     if coupon.usage_limit_per_customer is not None and usage_count is not None:
-        if usage_count(coupon_code) >= coupon.usage_limit_per_customer:
+        # Lookups ignore case, so usage is counted under the catalog's spelling; the
+        # customer's spelling would start a fresh count.
+        if usage_count(coupon.code) >= coupon.usage_limit_per_customer:
             return None, USAGE_LIMIT_REACHED
     return coupon.discount_value, COUPON_APPLIED
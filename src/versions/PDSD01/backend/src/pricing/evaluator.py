@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Callable, List, Optional
 
 from .calculations import clamp_total
-from .coupons import apply_coupon
+from .coupons import apply_coupon_definition, default_coupon_lookup
 from .promotions import PromotionDefinition, calculate_percentage_discount
 from .rules import FIXED_ORDER, PERCENTAGE_ORDER, order_discounts
 
@@ -63,9 +63,10 @@ def evaluate_pricing(
                 )
             )
     if coupon_code:
-        discount_value, message = apply_coupon(
+        coupon = default_coupon_lookup(coupon_code)
+        discount_value, message = apply_coupon_definition(
             cart.subtotal,
-            coupon_code,
+            coupon,
             now,
             usage_count=usage_count,
         )
@@ -73,7 +74,7 @@ def evaluate_pricing(
             line_items.append(
                 DiscountLineItem(
                     type="coupon",
-                    source_id=coupon_code,
+                    source_id=coupon.code,
                     amount=discount_value,
                     order=discount_order_for("coupon"),
                 )
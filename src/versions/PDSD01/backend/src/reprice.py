@@ -0,0 +1,54 @@
+"""Reprice an NDJSON file of saved carts across worker processes.
+
+Usage (from src/versions/PDSD01): python -m backend.src.reprice CARTS OUTPUT [--workers N]
+                                      [--promotions FILE] [--coupons FILE] [--chunk-size N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from .pricing.bulk import CHUNK_SIZE, reprice_file
+from .pricing.catalog import read_file
+from .pricing.promotions import PromotionDefinition
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("carts", help="NDJSON input, one cart per line")
+    parser.add_argument("output", help="NDJSON output, one result per input cart")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--promotions", help='JSON list of {"promoId", "percent"}')
+    parser.add_argument("--coupons", help="JSON or YAML coupon catalog; default catalog if unset")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    promotions = []
+    if args.promotions:
+        with open(args.promotions, encoding="utf-8") as source:
+            promotions = [
+                PromotionDefinition(promo_id=promo["promoId"], percent=promo["percent"])
+                for promo in json.load(source)
+            ]
+    coupon_records = read_file(args.coupons) if args.coupons else None
+
+    start = time.perf_counter()
+    with open(args.carts, encoding="utf-8") as source, open(
+        args.output, "w", encoding="utf-8"
+    ) as output:
+        priced = reprice_file(
+            source, output, args.workers, promotions, coupon_records, chunk_size=args.chunk_size
+        )
+    elapsed = time.perf_counter() - start
+    print(
+        f"priced {priced} carts with {args.workers} workers in {elapsed:.1f}s "
+        f"({priced / elapsed:.0f} carts/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,103 @@
+"""Pricing HTTP service.
+
+``POST /pricing/evaluate`` prices one cart and ``POST /pricing/evaluate/batch`` prices
+up to ``MAX_BATCH`` carts in one round trip. Each request body is
+``{"cart": {...}, "couponCode": ..., "promotions": [...], "evaluationTime": ...}``;
+see ``services/pricing_dto`` for the field names. Connections are kept alive (HTTP/1.1)
+and every connection gets its own thread. Identical requests within ``PRICING_CACHE_TTL``
+seconds are answered from a result cache; ``GET /pricing/cache`` reports its hit rate.
+
+Usage (from src/versions/PDSD01): python -m backend.src.server   (PORT, default 8000)
+"""
 from __future__ import annotations
 
 import json
 import os
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Mapping, Tuple
+
+from .pricing.evaluator import evaluate_pricing
+from .pricing.usage import usage_count_for_coupon
+from .services.pricing_cache import PricingCache, cart_fingerprint
+from .services.pricing_dto import (
+    cart_from_dict,
+    evaluation_time_from,
+    pricing_result_to_dict,
+    promotions_from_list,
+)
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH = 500
+# One stderr line per request costs more than pricing the cart; opt in when debugging.
+ACCESS_LOG = os.getenv("ACCESS_LOG", "false").lower() == "true"
+# PRICING_CACHE_SIZE=0 turns the result cache off.
+result_cache = PricingCache(
+    max_entries=int(os.getenv("PRICING_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("PRICING_CACHE_TTL", "30")),
+)
+
+
+class BadRequest(Exception):
+    pass
+
+
+def evaluate_request(data: Mapping[str, Any]) -> dict:
+    if not isinstance(data, Mapping) or not isinstance(data.get("cart"), Mapping):
+        raise BadRequest("Invalid pricing request: cart must be an object")
+    coupon_code = data.get("couponCode")
+    if coupon_code is not None and not isinstance(coupon_code, str):
+        raise BadRequest("Invalid pricing request: couponCode must be a string or null")
+    try:
+        cart = cart_from_dict(data["cart"])
+        promotions = promotions_from_list(data.get("promotions"))
+        evaluation_time = evaluation_time_from(data.get("evaluationTime"))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise BadRequest(f"Invalid pricing request: {exc!r}") from None
+
+    def _price(now):
+        result = evaluate_pricing(
+            cart,
+            coupon_code=coupon_code,
+            promotions=promotions,
+            evaluation_time=now,
+            usage_count=lambda code: usage_count_for_coupon(cart.customer_id, code),
+        )
+        return pricing_result_to_dict(result)
+
+    key = cart_fingerprint(cart, coupon_code, promotions, evaluation_time)
+    return result_cache.get_or_compute(key, coupon_code, _price, evaluation_time)
+
+
+def evaluate_batch(data: Mapping[str, Any]) -> dict:
+    requests = data.get("requests")
+    if not isinstance(requests, list):
+        raise BadRequest("Batch body must be {\"requests\": [...]}")
+    if len(requests) > MAX_BATCH:
+        raise BadRequest(f"At most {MAX_BATCH} requests per batch")
+    results = []
+    for index, request in enumerate(requests):
+        try:
+            results.append(evaluate_request(request))
+        except BadRequest as exc:
+            raise BadRequest(f"requests[{index}]: {exc}") from None
+    return {"results": results}
+
+
+ROUTES = {
+    "/pricing/evaluate": evaluate_request,
+    "/pricing/evaluate/batch": evaluate_batch,
+}
 
 
 class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer each response so headers and body leave in one segment (the base handler
+    # flushes after every request), and skip Nagle; otherwise keep-alive clients wait out
+    # a delayed ACK on every request.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
     def _send_json(self, status: int, payload: dict) -> None:
         body = json.dumps(payload).encode("utf-8")
         self.send_response(status)
@@ -14,25 +106,64 @@ class Handler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(body)
 
+    def _read_json(self) -> Tuple[int, Any]:
+        try:
+            length = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            self.close_connection = True
+            return 411, {"error": "Content-Length required"}
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return 413, {"error": "Request body too large"}
+        try:
+            return 200, json.loads(self.rfile.read(length))
+        except ValueError:
+            return 400, {"error": "Request body is not valid JSON"}
+
     def do_GET(self) -> None:
         if self.path == "/health":
             return self._send_json(200, {"status": "ok"})
-        if self.path == "/pricing/evaluate":
-            return self._send_json(
-                200,
-                {
-                    "discountLineItems": [],
-                    "grandTotal": 0,
-                    "messages": ["Pricing stub running"],
-                },
-            )
+        if self.path == "/pricing/cache":
+            return self._send_json(200, result_cache.stats())
         return self._send_json(404, {"error": "not found"})
 
+    def do_POST(self) -> None:
+        route = ROUTES.get(self.path)
+        if route is None:
+            # The unread body would be parsed as the next request; drop the connection.
+            self.close_connection = True
+            return self._send_json(404, {"error": "not found"})
+        status, data = self._read_json()
+        if status != 200:
+            return self._send_json(status, data)
+        if not isinstance(data, dict):
+            return self._send_json(400, {"error": "Request body must be a JSON object"})
+        try:
+            payload = route(data)
+        except BadRequest as exc:
+            return self._send_json(400, {"error": str(exc)})
+        except Exception:
+            self.log_error("Pricing failed for %s:\n%s", self.path, traceback.format_exc())
+            return self._send_json(500, {"error": "internal error"})
+        return self._send_json(200, payload)
+
+    def log_request(self, code: Any = "-", size: Any = "-") -> None:
+        if ACCESS_LOG:
+            super().log_request(code, size)
+
+
+class PricingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(host: str = "", port: int = 8000) -> PricingServer:
+    return PricingServer((host, port), Handler)
+
 
 def main() -> None:
     port = int(os.getenv("PORT", "8000"))
-    server = HTTPServer(("", port), Handler)
-    server.serve_forever()
+    make_server("", port).serve_forever()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..pricing import coupons
+from ..pricing.evaluator import Cart
+from ..pricing.promotions import PromotionDefinition
+
+
+def cart_fingerprint(
+    cart: Cart,
+    coupon_code: Optional[str],
+    promotions: List[PromotionDefinition],
+    evaluation_time: Optional[datetime],
+) -> str:
+    """Stable hash of everything a pricing result depends on.
+
+    The customer is included because coupon usage limits are per customer; the cart id is
+    not, since it never reaches the result. Promotions are hashed by their definitions, so
+    editing a promotion changes the key, and the coupon catalog contributes its identity
+    and version, so a reload leaves every older entry unreachable. A pinned
+    ``evaluation_time`` is part of the key; live requests (``None``) are bounded by expiry
+    instead (see ``PricingCache.get_or_compute``).
+    """
+    catalog = coupons.default_catalog
+    payload = [
+        cart.customer_id,
+        cart.currency,
+        cart.subtotal,
+        sorted((item.product_id, item.quantity, item.unit_price) for item in cart.items),
+        coupon_code,
+        [(promo.promo_id, promo.percent) for promo in promotions],
+        [id(catalog), catalog.version],
+        None if evaluation_time is None else evaluation_time.isoformat(),
+    ]
+    encoded = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class PricingCache:
+    """LRU of pricing responses with a TTL, plus hit and miss counters.
+
+    An entry priced against the live clock is never served past the expiry of the
+    coupon it evaluated, so a coupon cannot keep applying after it expires. Usage counts
+    are not tracked, so a coupon redeemed elsewhere can still show as applicable for up
+    to ``ttl`` seconds; use a short TTL and price checkout itself uncached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lifetime(self, coupon_code: Optional[str], now: datetime) -> float:
+        lifetime = self.ttl
+        coupon = coupons.default_catalog.lookup(coupon_code) if coupon_code else None
+        if coupon is not None and coupon.expires_at is not None and coupon.expires_at >= now:
+            lifetime = min(lifetime, (coupon.expires_at - now).total_seconds())
+        return lifetime
+
+    def get_or_compute(
+        self,
+        key: str,
+        coupon_code: Optional[str],
+        compute: Callable[[datetime], dict],
+        evaluation_time: Optional[datetime] = None,
+    ) -> dict:
+        """Cached response for ``key``, or ``compute(now)`` stored for next time.
+
+        ``compute`` receives the evaluation time to price at: the pinned one, or the live
+        clock read once here so the expiry bound and the pricing agree.
+        """
+        if self.max_entries <= 0:
+            return compute(evaluation_time or datetime.utcnow())
+        clock_now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > clock_now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        now = evaluation_time or datetime.utcnow()
+        result = compute(now)
+        lifetime = self.ttl if evaluation_time is not None else self._lifetime(coupon_code, now)
+        if lifetime > 0:
+            with self._lock:
+                self._entries[key] = (clock_now + lifetime, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl,
+            }
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional
 
-from ..pricing.evaluator import DiscountLineItem, PricingResult
+from ..pricing.evaluator import Cart, CartItem, DiscountLineItem, PricingResult
+from ..pricing.promotions import PromotionDefinition
 
 
 def pricing_result_to_dict(result: PricingResult) -> Dict[str, object]:
@@ -20,3 +22,41 @@ def _line_item_to_dict(item: DiscountLineItem) -> Dict[str, object]:
         "amount": item.amount,
         "order": item.order,
     }
+
+
+def cart_from_dict(data: Mapping[str, Any]) -> Cart:
+    items = [
+        CartItem(
+            product_id=str(item["productId"]),
+            quantity=int(item["quantity"]),
+            unit_price=int(item["unitPrice"]),
+        )
+        for item in data.get("items") or []
+    ]
+    subtotal = data.get("subtotal")
+    if subtotal is None:
+        subtotal = sum(item.quantity * item.unit_price for item in items)
+    return Cart(
+        cart_id=str(data.get("cartId", "")),
+        customer_id=str(data.get("customerId", "")),
+        currency=str(data.get("currency", "THB")),
+        items=items,
+        subtotal=int(subtotal),
+    )
+
+
+def promotions_from_list(data: Optional[List[Mapping[str, Any]]]) -> List[PromotionDefinition]:
+    return [
+        PromotionDefinition(promo_id=str(promo["promoId"]), percent=float(promo["percent"]))
+        for promo in data or []
+    ]
+
+
+def evaluation_time_from(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    # Pricing compares against naive UTC times.
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
@@ -0,0 +1,47 @@
+import io
+import json
+from datetime import datetime
+
+from backend.src.pricing.bulk import reprice_file
+from backend.src.pricing.catalog import CouponCatalog
+from backend.src.pricing.evaluator import Cart, evaluate_pricing
+from backend.src.pricing.promotions import PromotionDefinition
+
+NOW = datetime(2026, 5, 1, 12, 0)
+PROMOTIONS = [PromotionDefinition("PROMO10", 10), PromotionDefinition("FLASH5", 5)]
+COUPONS = [
+    {"code": "SAVE100", "discount_value": 100, "minimum_spend": 500},
+    {"code": "EXPIRED", "discount_value": 100, "expires_at": "2026-01-01T00:00:00"},
+]
+
+
+def test_carts_are_priced_across_workers_in_input_order(monkeypatch):
+    monkeypatch.setattr("backend.src.pricing.coupons.default_catalog", CouponCatalog(COUPONS))
+    carts = [
+        {
+            "cartId": f"cart-{index}",
+            "subtotal": index * 37 % 1500,
+            "couponCode": ["SAVE100", None, "EXPIRED", "save100"][index % 4],
+            "promotionIds": [[], ["PROMO10"], ["PROMO10", "FLASH5"]][index % 3],
+        }
+        for index in range(250)
+    ]
+    source = io.StringIO("".join(json.dumps(cart) + "\n" for cart in carts) + "\n")
+    output = io.StringIO()
+
+    priced = reprice_file(source, output, 2, PROMOTIONS, COUPONS, NOW, chunk_size=16)
+
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert priced == len(results) == len(carts)
+    assert [result["cartId"] for result in results] == [cart["cartId"] for cart in carts]
+    by_id = {promo.promo_id: promo for promo in PROMOTIONS}
+    for cart, result in zip(carts, results):
+        expected = evaluate_pricing(
+            Cart(cart["cartId"], "cust", "THB", [], cart["subtotal"]),
+            coupon_code=cart["couponCode"],
+            promotions=[by_id[promo_id] for promo_id in cart["promotionIds"]],
+            evaluation_time=NOW,
+            usage_count=lambda _: 0,
+        )
+        assert result["grandTotal"] == expected.grand_total
+        assert result["messages"] == expected.messages
@@ -0,0 +1,96 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from backend.src.server import MAX_BATCH, make_server
+
+CART = {
+    "cartId": "cart-1",
+    "customerId": "cust-1",
+    "currency": "THB",
+    "items": [{"productId": "sku-1", "quantity": 2, "unitPrice": 500}],
+}
+
+
+@pytest.fixture()
+def connection():
+    server = make_server("127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        yield conn
+    finally:
+        conn.close()
+        server.shutdown()
+        server.server_close()
+
+
+def _post(conn, path, payload):
+    headers = {"Content-Type": "application/json"}
+    conn.request("POST", path, body=json.dumps(payload), headers=headers)
+    resp = conn.getresponse()
+    return resp.status, json.loads(resp.read())
+
+
+def test_evaluate_and_batch_share_one_keep_alive_connection(connection):
+    status, single = _post(
+        connection,
+        "/pricing/evaluate",
+        {"cart": CART, "couponCode": "SAVE100", "promotions": [{"promoId": "P10", "percent": 10}]},
+    )
+    sock = connection.sock
+    status_batch, batch = _post(
+        connection,
+        "/pricing/evaluate/batch",
+        {"requests": [{"cart": CART, "couponCode": "EXPIRED"}, {"cart": {**CART, "subtotal": 50}}]},
+    )
+
+    assert status == status_batch == 200
+    assert connection.sock is sock
+    assert single["grandTotal"] == 800
+    assert [item["sourceId"] for item in single["discountLineItems"]] == ["P10", "SAVE100"]
+    assert [result["grandTotal"] for result in batch["results"]] == [1000, 50]
+    assert batch["results"][0]["messages"] == ["Coupon expired"]
+
+
+def test_invalid_requests_get_400(connection):
+    assert _post(connection, "/pricing/evaluate", {"couponCode": "SAVE100"})[0] == 400
+    status, body = _post(connection, "/pricing/evaluate/batch", {"requests": [{"cart": CART}, {}]})
+    assert status == 400
+    assert body["error"].startswith("requests[1]")
+    too_many = {"requests": [{"cart": CART}] * (MAX_BATCH + 1)}
+    assert _post(connection, "/pricing/evaluate/batch", too_many)[0] == 400
+
+    assert _post(connection, "/pricing/evaluate", {"cart": []})[0] == 400
+    status, body = _post(connection, "/pricing/evaluate", {"cart": CART, "couponCode": 5})
+    assert status == 400
+    assert "couponCode" in body["error"]
+    status, body = _post(
+        connection, "/pricing/evaluate/batch", {"requests": [{"cart": CART}, {"cart": []}]}
+    )
+    assert status == 400
+    assert body["error"].startswith("requests[1]")
+
+    connection.request("POST", "/pricing/evaluate", body=b"{not json")
+    resp = connection.getresponse()
+    assert resp.status == 400
+    resp.read()
+
+
+def test_repeated_requests_are_served_from_the_result_cache(connection):
+    body = {"cart": {**CART, "customerId": "cust-cache"}, "couponCode": "WELCOME"}
+    connection.request("GET", "/pricing/cache")
+    before = json.loads(connection.getresponse().read())
+
+    first = _post(connection, "/pricing/evaluate", body)
+    second = _post(connection, "/pricing/evaluate", body)
+    connection.request("GET", "/pricing/cache")
+    after = json.loads(connection.getresponse().read())
+
+    assert first == second == (200, first[1])
+    assert first[1]["grandTotal"] == 900
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
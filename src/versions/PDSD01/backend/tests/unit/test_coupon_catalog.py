@@ -0,0 +1,140 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.src.pricing import catalog
+from backend.src.pricing.catalog import CouponCatalog
+from backend.src.pricing.coupons import is_expired
+
+RECORDS = [
+    {
+        "code": "SPRING50",
+        "discount_value": 50,
+        "minimum_spend": 200,
+        "expires_at": "2030-01-01T00:00:00+07:00",
+        "usage_limit_per_customer": None,
+    },
+    {"code": "vip", "discount_value": 300},
+]
+
+
+def test_lookup_is_case_insensitive_and_parses_records():
+    coupons = CouponCatalog(RECORDS)
+
+    spring = coupons.lookup("spring50")
+    assert spring is coupons.lookup("SPRING50")
+    assert spring.code == "SPRING50"
+    assert spring.expires_at == datetime(2029, 12, 31, 17, 0)
+    assert spring.usage_limit_per_customer is None
+    vip = coupons.lookup("VIP")
+    assert (vip.minimum_spend, vip.expires_at, vip.usage_limit_per_customer) == (0, None, 1)
+    assert coupons.lookup("UNKNOWN") is None
+
+
+def test_json_yaml_and_db_sources_load_the_same_catalog(tmp_path):
+    json_path = tmp_path / "coupons.json"
+    json_path.write_text(json.dumps({"coupons": RECORDS}))
+    yaml = pytest.importorskip("yaml")
+    yaml_path = tmp_path / "coupons.yaml"
+    yaml_path.write_text(yaml.safe_dump(RECORDS))
+    connection = sqlite3.connect(":memory:")
+    connection.execute(
+        "CREATE TABLE coupons (code TEXT, discount_value INTEGER, minimum_spend INTEGER, "
+        "expires_at TEXT, usage_limit_per_customer INTEGER)"
+    )
+    connection.execute(
+        "INSERT INTO coupons VALUES ('SPRING50', 50, 200, '2030-01-01T00:00:00+07:00', NULL), "
+        "('vip', 300, NULL, NULL, 1)"
+    )
+
+    loaded = [
+        CouponCatalog.from_file(json_path),
+        CouponCatalog.from_file(yaml_path),
+        CouponCatalog.from_rows(connection),
+    ]
+
+    expected = CouponCatalog(RECORDS)
+    for coupons in loaded:
+        assert [coupons.lookup(code) for code in ("SPRING50", "VIP")] == [
+            expected.lookup(code) for code in ("SPRING50", "VIP")
+        ]
+
+
+def test_reload_swaps_the_whole_catalog_or_nothing():
+    coupons = CouponCatalog(RECORDS)
+    version = coupons.version
+
+    duplicate = [{"code": "NEW", "discount_value": 10}, {"code": "new", "discount_value": 5}]
+    with pytest.raises(ValueError):
+        coupons.reload(duplicate)
+    assert coupons.version == version
+    assert "SPRING50" in coupons
+
+    # VIP is in both catalogs, so a reader must never miss it while they swap.
+    missed = []
+    stop = threading.Event()
+
+    def _read():
+        while not stop.is_set():
+            if coupons.lookup("vip") is None:
+                missed.append(coupons.version)
+
+    reader = threading.Thread(target=_read)
+    reader.start()
+    replacement = [{"code": "NEW", "discount_value": 10}, {"code": "VIP", "discount_value": 1}]
+    for _ in range(200):
+        coupons.reload(replacement)
+        coupons.reload(RECORDS)
+    stop.set()
+    reader.join()
+
+    assert missed == []
+    assert coupons.version == version + 400
+    assert coupons.lookup("NEW") is None
+
+
+def test_default_catalog_can_come_from_a_file(tmp_path, monkeypatch):
+    path = tmp_path / "coupons.json"
+    path.write_text(json.dumps(RECORDS))
+    monkeypatch.setenv("COUPON_CATALOG", str(path))
+
+    assert len(catalog.load_default_catalog()) == 2
+
+
+def test_demo_coupons_do_not_expire_while_the_server_runs():
+    coupons = CouponCatalog(catalog.DEFAULT_COUPONS)
+    days_later = datetime.utcnow() + timedelta(days=2)
+
+    assert not is_expired(coupons.lookup("SAVE100").expires_at, days_later)
+    assert not is_expired(coupons.lookup("WELCOME").expires_at, days_later)
+    assert is_expired(coupons.lookup("EXPIRED").expires_at, datetime.utcnow())
+
+
+def test_concurrent_reloads_install_in_the_order_they_run(monkeypatch):
+    coupons = CouponCatalog(RECORDS)
+    parsing_old = threading.Event()
+    release = threading.Event()
+    parse = catalog.coupon_from_record
+
+    def _slow_parse(record):
+        if record["code"] == "OLD":
+            parsing_old.set()
+            release.wait(5)
+        return parse(record)
+
+    monkeypatch.setattr(catalog, "coupon_from_record", _slow_parse)
+    old = threading.Thread(target=coupons.reload, args=([{"code": "OLD", "discount_value": 1}],))
+    old.start()
+    assert parsing_old.wait(5)
+    new = threading.Thread(target=coupons.reload, args=([{"code": "NEW", "discount_value": 2}],))
+    new.start()
+    new.join(0.1)
+    assert new.is_alive()
+
+    release.set()
+    old.join()
+    new.join()
+    assert "NEW" in coupons and "OLD" not in coupons
@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from backend.src.pricing.coupons import apply_coupon
+from backend.src.pricing.evaluator import Cart, evaluate_pricing
 from backend.src.pricing.messages import USAGE_LIMIT_REACHED
 
 
@@ -14,3 +15,21 @@ def test_usage_limit_reached():
     )
     assert discount is None
     assert message == USAGE_LIMIT_REACHED
+
+
+def test_usage_limit_counts_the_catalog_spelling_of_the_code():
+    used = {"SAVE100": 1}
+    cart = Cart("cart-1", "cust-1", "THB", [], 1000)
+
+    def usage_count(code):
+        return used.get(code, 0)
+
+    result = evaluate_pricing(cart, coupon_code="save100", usage_count=usage_count)
+
+    assert result.messages == [USAGE_LIMIT_REACHED]
+    assert result.grand_total == 1000
+
+    used.clear()
+    result = evaluate_pricing(cart, coupon_code="save100", usage_count=usage_count)
+    assert [item.source_id for item in result.discount_line_items] == ["SAVE100"]
+    assert result.grand_total == 900
@@ -0,0 +1,97 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.src.pricing.batch import MESSAGES, evaluate_pricing_batch
+from backend.src.pricing.catalog import CouponCatalog
+from backend.src.pricing.evaluator import Cart, CartItem, evaluate_pricing
+from backend.src.pricing.promotions import PromotionDefinition
+
+NOW = datetime(2026, 5, 1, 12, 0)
+CATALOG = CouponCatalog(
+    [
+        {"code": "SAVE100", "discount_value": 100, "minimum_spend": 500},
+        {"code": "BIG", "discount_value": 5000, "usage_limit_per_customer": None},
+        {"code": "ZERO", "discount_value": 0},
+        {"code": "OLD", "discount_value": 100, "expires_at": NOW - timedelta(seconds=1)},
+        {"code": "TWICE", "discount_value": 30, "usage_limit_per_customer": 2},
+    ]
+)
+PROMOTION_SETS = [
+    [],
+    [PromotionDefinition("P10", 10)],
+    [PromotionDefinition("P12.5", 12.5), PromotionDefinition("P7.3", 7.3)],
+    [
+        PromotionDefinition("P50", 50),
+        PromotionDefinition("P33", 33.33),
+        PromotionDefinition("P5", 5),
+    ],
+]
+CODES = [None, "", "SAVE100", "save100", "BIG", "ZERO", "OLD", "TWICE", "NOPE"]
+
+
+def _scalar(subtotal, code, set_id, usage):
+    cart = Cart(
+        cart_id="c",
+        customer_id="cust",
+        currency="THB",
+        items=[CartItem(product_id="sku", quantity=1, unit_price=subtotal)],
+        subtotal=subtotal,
+    )
+    return evaluate_pricing(
+        cart,
+        coupon_code=code,
+        promotions=PROMOTION_SETS[set_id] if set_id >= 0 else None,
+        evaluation_time=NOW,
+        usage_count=lambda _: usage,
+    )
+
+
+def test_batch_matches_scalar_pricing(monkeypatch):
+    monkeypatch.setattr("backend.src.pricing.coupons.default_catalog", CATALOG)
+    rng = random.Random(7)
+    size = 3000
+    # Odd subtotals around 5, 15, 25... make half-way percentages that must round to even.
+    subtotals = [
+        rng.choice([rng.randrange(0, 3000), rng.randrange(0, 20) * 10 + 5]) for _ in range(size)
+    ]
+    codes = [rng.choice(CODES) for _ in range(size)]
+    set_ids = [rng.randrange(-1, len(PROMOTION_SETS)) for _ in range(size)]
+    usage = [rng.randrange(0, 4) for _ in range(size)]
+
+    batch = evaluate_pricing_batch(
+        subtotals,
+        coupon_codes=codes,
+        promotion_sets=PROMOTION_SETS,
+        promotion_set_ids=set_ids,
+        evaluation_time=NOW,
+        usage_counts=usage,
+    )
+
+    for index in range(size):
+        expected = _scalar(subtotals[index], codes[index], set_ids[index], usage[index])
+        by_type = {"promotion": 0, "coupon": 0}
+        for item in expected.discount_line_items:
+            by_type[item.type] += item.amount
+        assert int(batch.grand_total[index]) == expected.grand_total, index
+        assert int(batch.promotion_discount[index]) == by_type["promotion"], index
+        assert int(batch.coupon_discount[index]) == by_type["coupon"], index
+        assert batch.messages(index) == expected.messages, index
+
+
+def test_batch_without_coupons_or_promotions_returns_subtotals():
+    batch = evaluate_pricing_batch(np.array([0, 10, 250]))
+
+    assert batch.grand_total.tolist() == [0, 10, 250]
+    assert batch.message_codes.tolist() == [0, 0, 0]
+    assert MESSAGES[0] is None
+
+
+@pytest.mark.parametrize("subtotal, expected", [(5, 5), (15, 13), (25, 23)])
+def test_half_way_percentages_round_like_round_currency(subtotal, expected):
+    promos = [[PromotionDefinition("P10", 10)]]
+    batch = evaluate_pricing_batch([subtotal], promotion_sets=promos, promotion_set_ids=[0])
+
+    assert int(batch.grand_total[0]) == expected
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.src.pricing import coupons
+from backend.src.pricing.catalog import CouponCatalog
+from backend.src.pricing.evaluator import Cart, CartItem
+from backend.src.pricing.promotions import PromotionDefinition
+from backend.src.services.pricing_cache import PricingCache, cart_fingerprint
+
+NOW = datetime(2030, 1, 1, 12, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch):
+    catalog = CouponCatalog(
+        [
+            {"code": "SAVE100", "discount_value": 100, "expires_at": "2030-01-01T12:00:10"},
+            {"code": "WELCOME", "discount_value": 100},
+        ]
+    )
+    monkeypatch.setattr(coupons, "default_catalog", catalog)
+    return catalog
+
+
+def _cart(customer_id="cust-1", items=None):
+    items = items or [CartItem("sku-1", 2, 500), CartItem("sku-2", 1, 200)]
+    subtotal = sum(item.quantity * item.unit_price for item in items)
+    return Cart("cart-1", customer_id, "THB", items, subtotal)
+
+
+def test_fingerprint_ignores_item_order_but_not_inputs_that_change_the_price(catalog):
+    promos = [PromotionDefinition("P10", 10)]
+    key = cart_fingerprint(_cart(), "SAVE100", promos, None)
+
+    reordered = _cart(items=[CartItem("sku-2", 1, 200), CartItem("sku-1", 2, 500)])
+    assert cart_fingerprint(reordered, "SAVE100", promos, None) == key
+    assert cart_fingerprint(_cart("cust-2"), "SAVE100", promos, None) != key
+    assert cart_fingerprint(_cart(), "WELCOME", promos, None) != key
+    assert cart_fingerprint(_cart(), "SAVE100", [PromotionDefinition("P10", 20)], None) != key
+    assert cart_fingerprint(_cart(), "SAVE100", promos, NOW) != key
+
+    catalog.reload([{"code": "SAVE100", "discount_value": 200}])
+    assert cart_fingerprint(_cart(), "SAVE100", promos, None) != key
+
+
+def test_hits_misses_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = PricingCache(max_entries=2, ttl=5, clock=clock)
+    calls = []
+
+    def compute(now):
+        calls.append(now)
+        return {"grandTotal": len(calls)}
+
+    assert cache.get_or_compute("a", None, compute, NOW) == {"grandTotal": 1}
+    assert cache.get_or_compute("a", None, compute, NOW) == {"grandTotal": 1}
+    cache.get_or_compute("b", None, compute, NOW)
+    cache.get_or_compute("a", None, compute, NOW)
+    cache.get_or_compute("c", None, compute, NOW)  # evicts "b", the least recently used
+    cache.get_or_compute("b", None, compute, NOW)
+    assert len(calls) == 4
+
+    clock.now = 5
+    cache.get_or_compute("b", None, compute, NOW)
+    assert len(calls) == 5
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 5, 2)
+    assert stats["hitRate"] == pytest.approx(2 / 7)
+
+
+def test_live_entries_expire_with_their_coupon():
+    clock = FakeClock()
+    cache = PricingCache(ttl=60, clock=clock)
+    now = datetime.utcnow()
+    coupons.default_catalog.reload(
+        [{"code": "SAVE100", "discount_value": 100, "expires_at": now + timedelta(seconds=10)}]
+    )
+    calls = []
+
+    def compute(evaluated_at):
+        calls.append(evaluated_at)
+        return {}
+
+    cache.get_or_compute("live", "SAVE100", compute)
+    clock.now = 9
+    cache.get_or_compute("live", "SAVE100", compute)
+    assert len(calls) == 1
+    clock.now = 11
+    cache.get_or_compute("live", "SAVE100", compute)
+    assert len(calls) == 2
+
+
+def test_zero_size_disables_caching():
+    cache = PricingCache(max_entries=0)
+    results = [cache.get_or_compute("a", None, lambda now: {}, NOW) for _ in range(2)]
+    assert results[0] is not results[1]
+    assert cache.stats()["entries"] == 0
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from .database import Base, SessionLocal, engine
+from .database import Base, SessionLocal, engine, pool_metrics
 from .models import Cart, CartItem, Product, SavedItem
 from .schemas import (
     CartItemIn,
@@ -63,6 +64,11 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(pool_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/products", response_model=ProductOut)
 def upsert_product(payload: ProductIn, db: Session = Depends(get_db)) -> ProductOut:
     product = db.get(Product, payload.sku)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+CHECKOUT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """Checkout latency histogram plus live pool gauges for a single engine."""
+
+    def __init__(self, name: str, buckets: tuple[float, ...] = CHECKOUT_BUCKETS) -> None:
+        self.name = name
+        self.buckets = buckets
+        self._bucket_counts = [0] * (len(buckets) + 1)
+        self._latency_sum = 0.0
+        self.checkout_timeouts = 0
+        self._engine: Engine | None = None
+        self._lock = threading.Lock()
+
+    def observe_checkout(self, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._latency_sum += seconds
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def bind(self, engine: Engine) -> None:
+        self._engine = engine
+
+    def _gauges(self) -> dict[str, Callable[[], int]]:
+        pool = self._engine.pool if self._engine is not None else None
+        if pool is None:
+            return {}
+        return {
+            "db_pool_in_use": pool.checkedout,
+            "db_pool_overflow": lambda: max(0, pool.overflow()),
+            "db_pool_size": pool.size,
+        }
+
+    def render(self) -> str:
+        label = f'pool="{self.name}"'
+        with self._lock:
+            counts = list(self._bucket_counts)
+            latency_sum = self._latency_sum
+            timeouts = self.checkout_timeouts
+        lines = ["# TYPE db_pool_checkout_seconds histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(f'db_pool_checkout_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'db_pool_checkout_seconds_bucket{{{label},le="+Inf"}} {cumulative}')
+        lines.append(f"db_pool_checkout_seconds_sum{{{label}}} {latency_sum}")
+        lines.append(f"db_pool_checkout_seconds_count{{{label}}} {cumulative}")
+        lines.append("# TYPE db_pool_checkout_timeouts_total counter")
+        lines.append(f"db_pool_checkout_timeouts_total{{{label}}} {timeouts}")
+        for metric, read in self._gauges().items():
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{{{label}}} {read()}")
+        return "\n".join(lines) + "\n"
+
+
+def instrumented_pool_class(metrics: PoolMetrics, base: type[Pool] = QueuePool) -> type[Pool]:
+    # Pool events fire only after a connection is handed out, so the wait is timed
+    # around connect(). Pool.recreate() reuses self.__class__, so dispose() keeps it.
+    class InstrumentedPool(base):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                metrics.record_timeout()
+                raise
+            finally:
+                metrics.observe_checkout(time.perf_counter() - start)
+
+    return InstrumentedPool